@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Compare the time taken to clone modules with `Operation.clone`, against a
+reference implementation cloning each operation with `Operation.create`.
+
+The modules are parsed from the programs generated by `bench/generators.py`.
+
+    python bench/clone.py --size 10000
+    python bench/clone.py --json --repeat 10
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from common import make_arg_parser
+from generators import MIXES, get_context
+from xdsl.ir import Block, Operation, Region, SSAValue
+from xdsl.parser import XDSLParser
+
+
+def reference_clone(op: Operation, value_mapper: dict[SSAValue, SSAValue],
+                    block_mapper: dict[Block, Block]) -> Operation:
+    """Clone an operation one operation at a time, using `create`."""
+    operands = [value_mapper.get(operand, operand) for operand in op.operands]
+    successors = [
+        block_mapper.get(successor, successor) for successor in op.successors
+    ]
+    new_op = op.create(operands=operands,
+                       result_types=[res.typ for res in op.results],
+                       attributes=op.attributes.copy(),
+                       successors=successors,
+                       regions=[Region() for _ in op.regions])
+    value_mapper.update(zip(op.results, new_op.results))
+    for region, new_region in zip(op.regions, new_op.regions):
+        for block in region.blocks:
+            new_block = Block()
+            block_mapper[block] = new_block
+            for idx, arg in enumerate(block.args):
+                value_mapper[arg] = new_block.insert_arg(arg.typ, idx)
+            for nested_op in block.ops:
+                new_block.add_op(
+                    reference_clone(nested_op, value_mapper, block_mapper))
+            new_region.add_block(new_block)
+    return new_op
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Compare the time taken to clone modules.",
+        5000,
+        "approximate number of operations per mix",
+        "number of clones, the best time is kept")
+    arg_parser.add_argument("--mix",
+                            choices=list(MIXES),
+                            action="append",
+                            help="dialect mixes to measure (default: all)")
+    args = arg_parser.parse_args()
+
+    ctx = get_context()
+    results: dict[str, dict[str, float]] = {}
+    for name in args.mix or list(MIXES):
+        module = XDSLParser(ctx, MIXES[name](args.size)).parse_module()
+        assert module.is_structurally_equivalent(module.clone())
+        clone_time = min(
+            timeit.repeat(module.clone, number=1, repeat=args.repeat))
+        reference_time = min(
+            timeit.repeat(lambda: reference_clone(module, {}, {}),
+                          number=1,
+                          repeat=args.repeat))
+        results[name] = {
+            "clone_s": round(clone_time, 4),
+            "reference_s": round(reference_time, 4),
+            "speedup": round(reference_time / clone_time, 2),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mix':<10}{'clone (s)':>12}{'reference (s)':>16}"
+              f"{'speedup':>10}")
+        for name, result in results.items():
+            print(f"{name:<10}{result['clone_s']:>12}"
+                  f"{result['reference_s']:>16}{result['speedup']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
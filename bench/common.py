@@ -0,0 +1,28 @@
+"""
+Helpers shared by the benchmark scripts.
+"""
+
+from __future__ import annotations
+
+import argparse
+
+
+def make_arg_parser(description: str,
+                    size: int | None,
+                    size_help: str,
+                    repeat_help: str | None = None) -> argparse.ArgumentParser:
+    """
+    Create the argument parser of a benchmark, with its `--size`, `--json`
+    and, if `repeat_help` is given, `--repeat` options.
+    """
+    arg_parser = argparse.ArgumentParser(description=description)
+    arg_parser.add_argument("--size", type=int, default=size, help=size_help)
+    if repeat_help is not None:
+        arg_parser.add_argument("--repeat",
+                                type=int,
+                                default=5,
+                                help=repeat_help)
+    arg_parser.add_argument("--json",
+                            action="store_true",
+                            help="print the results as JSON")
+    return arg_parser
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of parsing dense attributes, in elements per second.
+
+Large `dense<...>` and `array<...>` attributes are parsed from their literal
+form, and `dense<...>` attributes from their hex form, with random elements.
+
+    python bench/dense.py --size 100000
+    python bench/dense.py --json --repeat 10
+"""
+
+from __future__ import annotations
+
+import json
+import random
+import struct
+import sys
+import timeit
+
+from common import make_arg_parser
+from xdsl.dialects.builtin import Builtin
+from xdsl.ir import MLContext
+from xdsl.parser import MLIRParser
+
+FORMATS = {"i32": "i", "f32": "f"}
+
+
+def generate_elements(element_type: str, size: int) -> list[int] | list[float]:
+    if element_type == "f32":
+        return [
+            struct.unpack("f", struct.pack("f", random.uniform(-1, 1)))[0]
+            for _ in range(size)
+        ]
+    return [random.randint(-1000, 1000) for _ in range(size)]
+
+
+def generate_attributes(element_type: str, size: int) -> dict[str, str]:
+    """Get the attribute of each form, with the same random elements."""
+    elements = generate_elements(element_type, size)
+    literal = ", ".join(map(str, elements))
+    blob = struct.pack(f"<{size}{FORMATS[element_type]}", *elements).hex()
+    tensor_type = f"tensor<{size}x{element_type}>"
+    return {
+        "dense": f"dense<[{literal}]> : {tensor_type}",
+        "dense_hex": f'dense<"0x{blob.upper()}"> : {tensor_type}',
+        "array": f"array<{element_type}: {literal}>",
+    }
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Measure the throughput of parsing dense attributes.",
+        20000,
+        "number of elements per attribute",
+        "number of runs, the best time is kept")
+    args = arg_parser.parse_args()
+
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    random.seed(0)
+
+    results: dict[str, dict[str, float]] = {}
+    for element_type in FORMATS:
+        attributes = generate_attributes(element_type, args.size)
+        for form, text in attributes.items():
+            time = min(
+                timeit.repeat(
+                    lambda: MLIRParser(ctx, text).parse_attribute(),
+                    number=1,
+                    repeat=args.repeat))
+            results[f"{form}<{element_type}>"] = {
+                "time_s": time,
+                "elements_per_s": round(args.size / time),
+            }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'attribute':<18}{'time (s)':>12}{'elements/s':>14}")
+        for name, result in results.items():
+            print(f"{name:<18}{result['time_s']:>12.4f}"
+                  f"{result['elements_per_s']:>14}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,184 @@
+"""
+Deterministic generators of large programs, used as the inputs of the
+benchmarks.
+
+Each generator takes an approximate number of operations, and returns a
+program in the xDSL format. The MLIR form of a program is obtained by parsing
+and printing it. Generators using random values are seeded, so that a given
+size always produces the same program.
+"""
+
+from __future__ import annotations
+
+import random
+from typing import Callable
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin
+from xdsl.dialects.func import Func
+from xdsl.dialects.memref import MemRef
+from xdsl.dialects.scf import Scf
+from xdsl.ir import MLContext
+
+
+def arith_chain(size: int) -> str:
+    """A single function with a long chain of integer arithmetic."""
+    lines = ['%0 : !i32 = arith.constant() ["value" = 1 : !i32]']
+    for i in range(1, size):
+        op = "arith.addi" if i % 2 else "arith.muli"
+        lines.append(f"%{i} : !i32 = {op}(%{i - 1} : !i32, %0 : !i32)")
+    return _wrap_in_func("arith_chain", lines)
+
+
+def memref_accesses(size: int) -> str:
+    """Loads, arithmetic and stores on a small memref."""
+    typ = "!memref<[16 : !index], !i32>"
+    lines = [
+        f'%m : {typ} = memref.alloc() ["alignment" = 0 : !i64, '
+        '"operand_segment_sizes" = array<!i32: 0, 0>]',
+        '%i : !index = arith.constant() ["value" = 0 : !index]',
+    ]
+    for i in range(size // 3):
+        lines.append(f"%l{i} : !i32 = memref.load(%m : {typ}, %i : !index)")
+        lines.append(
+            f"%a{i} : !i32 = arith.addi(%l{i} : !i32, %l{i} : !i32)")
+        lines.append(f"memref.store(%a{i} : !i32, %m : {typ}, %i : !index)")
+    return _wrap_in_func("memref_accesses", lines)
+
+
+def scf_nest(size: int) -> str:
+    """Small scf.for loops, each containing a few operations."""
+    lines = [
+        '%lb : !index = arith.constant() ["value" = 0 : !index]',
+        '%ub : !index = arith.constant() ["value" = 8 : !index]',
+        '%st : !index = arith.constant() ["value" = 1 : !index]',
+    ]
+    for i in range(size // 4):
+        lines += [
+            "scf.for(%lb : !index, %ub : !index, %st : !index) {",
+            f"^{i}(%iv{i} : !index):",
+            f"  %x{i} : !index = arith.addi(%iv{i} : !index, %st : !index)",
+            f"  %y{i} : !index = arith.muli(%x{i} : !index, %x{i} : !index)",
+            "  scf.yield()",
+            "}",
+        ]
+    return _wrap_in_func("scf_nest", lines)
+
+
+def many_functions(size: int) -> str:
+    """Many small functions calling each other."""
+    funcs: list[str] = []
+    for i in range(size // 3):
+        funcs.append(
+            f'  func.func() ["sym_name" = "f{i}", '
+            '"function_type" = !fun<[!i32], [!i32]>, '
+            '"sym_visibility" = "private"] {\n'
+            "  ^0(%0 : !i32):\n"
+            f'    %1 : !i32 = func.call(%0 : !i32) ["callee" = @f{i}]\n'
+            "    func.return(%1 : !i32)\n"
+            "  }")
+    return "builtin.module() {\n" + "\n".join(funcs) + "\n}\n"
+
+
+def wide_block(size: int) -> str:
+    """A single block of independent operations, each with its own value."""
+    lines: list[str] = []
+    for i in range(size // 2):
+        lines.append(f'%c{i} : !i64 = arith.constant() ["value" = {i} : !i64]')
+        lines.append(f"%s{i} : !i64 = arith.addi(%c{i} : !i64, %c{i} : !i64)")
+    return _wrap_in_func("wide_block", lines)
+
+
+def deep_nest(size: int, depth: int = 32) -> str:
+    """Nests of `depth` alternating scf.for loops and scf.if conditionals."""
+    lines = [
+        '%lb : !index = arith.constant() ["value" = 0 : !index]',
+        '%ub : !index = arith.constant() ["value" = 4 : !index]',
+        '%st : !index = arith.constant() ["value" = 1 : !index]',
+        '%cond : !i1 = arith.constant() ["value" = 1 : !i1]',
+    ]
+    for nest in range(max(1, size // (3 * depth))):
+        closing: list[str] = []
+        for level in range(depth):
+            indent = "  " * level
+            name = f"{nest}_{level}"
+            if level % 2 == 0:
+                lines += [
+                    f"{indent}scf.for(%lb : !index, %ub : !index, "
+                    "%st : !index) {",
+                    f"{indent}^b{name}(%iv{name} : !index):",
+                    f"{indent}  %x{name} : !index = "
+                    f"arith.addi(%iv{name} : !index, %st : !index)",
+                ]
+                closing.append(f"{indent}  scf.yield()\n{indent}}}")
+            else:
+                lines += [
+                    f"{indent}scf.if(%cond : !i1) {{",
+                    f"{indent}  %x{name} : !index = "
+                    "arith.muli(%ub : !index, %st : !index)",
+                ]
+                closing.append(f"{indent}  scf.yield()\n{indent}}} {{\n"
+                               f"{indent}  scf.yield()\n{indent}}}")
+        lines += reversed(closing)
+    return _wrap_in_func("deep_nest", lines)
+
+
+def dense_constants(size: int, num_elements: int = 1024) -> str:
+    """
+    Constants holding large dense tensors of random integers and floats, with
+    about `16 * size` elements in total.
+    """
+    rng = random.Random(size)
+    lines: list[str] = []
+    for i in range(max(1, size * 16 // num_elements)):
+        if i % 2:
+            typ = f"!tensor<[{num_elements} : !index], !f32>"
+            values = ", ".join(
+                str(rng.randint(-1 << 20, 1 << 20) / 1024)
+                for _ in range(num_elements))
+        else:
+            typ = f"!tensor<[{num_elements} : !index], !i32>"
+            values = ", ".join(
+                str(rng.randint(-1 << 20, 1 << 20))
+                for _ in range(num_elements))
+        lines.append(f'%d{i} : {typ} = arith.constant() '
+                     f'["value" = dense<[{values}]> : {typ}]')
+    return _wrap_in_func("dense_constants", lines)
+
+
+def _wrap_in_func(name: str, lines: list[str]) -> str:
+    body = "\n".join("    " + line for line in lines)
+    return ("builtin.module() {\n"
+            f'  func.func() ["sym_name" = "{name}", '
+            '"function_type" = !fun<[], []>, "sym_visibility" = "private"] {\n'
+            f"{body}\n"
+            "    func.return()\n"
+            "  }\n"
+            "}\n")
+
+
+MIXES: dict[str, Callable[[int], str]] = {
+    "arith": arith_chain,
+    "memref": memref_accesses,
+    "scf": scf_nest,
+    "func": many_functions,
+}
+"""Representative dialect mixes, with small operations."""
+
+CORPUS: dict[str, Callable[[int], str]] = {
+    "arith_chain": arith_chain,
+    "memref_accesses": memref_accesses,
+    "scf_loops": scf_nest,
+    "many_functions": many_functions,
+    "wide_block": wide_block,
+    "deep_nest": deep_nest,
+    "dense_constants": dense_constants,
+}
+"""The programs of the throughput benchmarks."""
+
+
+def get_context() -> MLContext:
+    ctx = MLContext()
+    for dialect in [Builtin, Func, Arith, MemRef, Scf]:
+        ctx.register_dialect(dialect)
+    return ctx
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Report the memory used by the in-memory IR, in bytes per operation, for a few
+representative dialect mixes.
+
+The IR is parsed from generated programs, and the memory it retains is
+measured with `tracemalloc`. Use `--max-bytes-per-op` to turn the benchmark
+into a regression check.
+
+    python bench/ir_memory.py --size 10000
+    python bench/ir_memory.py --json --max-bytes-per-op 2000
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import tracemalloc
+
+from common import make_arg_parser
+from generators import MIXES, get_context
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.ir import MLContext, Operation
+from xdsl.parser import XDSLParser
+
+
+def _count_ops(module: Operation) -> int:
+    return sum(1 for _ in module.walk())
+
+
+def measure(program: str, ctx: MLContext) -> tuple[int, int]:
+    """
+    Parse a program, and return the number of operations it contains and the
+    number of bytes retained by the parsed module.
+    """
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    module = XDSLParser(ctx, program).parse_module()
+    gc.collect()
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert isinstance(module, ModuleOp)
+    return _count_ops(module), after - before
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Report the memory used by the in-memory IR.",
+        5000,
+        "approximate number of operations per mix")
+    arg_parser.add_argument("--mix",
+                            choices=list(MIXES),
+                            action="append",
+                            help="dialect mixes to measure (default: all)")
+    arg_parser.add_argument("--max-bytes-per-op",
+                            type=float,
+                            default=None,
+                            help="fail if a mix uses more bytes per operation")
+    args = arg_parser.parse_args()
+
+    ctx = get_context()
+    results: dict[str, dict[str, float]] = {}
+    for name in args.mix or list(MIXES):
+        num_ops, num_bytes = measure(MIXES[name](args.size), ctx)
+        results[name] = {
+            "ops": num_ops,
+            "bytes": num_bytes,
+            "bytes_per_op": round(num_bytes / num_ops, 1),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mix':<10}{'ops':>10}{'bytes/op':>12}")
+        for name, result in results.items():
+            print(f"{name:<10}{result['ops']:>10}"
+                  f"{result['bytes_per_op']:>12}")
+
+    if args.max_bytes_per_op is not None:
+        too_large = [
+            name for name, result in results.items()
+            if result["bytes_per_op"] > args.max_bytes_per_op
+        ]
+        if too_large:
+            print(f"Memory regression in: {', '.join(too_large)}",
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Measure the startup time of `xdsl-opt`, in fresh interpreters.
+
+The time to import `xdsl.xdsl_opt_main` is reported, as well as the time of
+a full `xdsl-opt` run on an empty module and on a small module using the
+operations of each dialect mix of `bench/generators.py`.
+
+    python bench/startup.py
+    python bench/startup.py --json --repeat 10
+"""
+
+from __future__ import annotations
+
+import json
+import subprocess
+import sys
+import time
+
+from common import make_arg_parser
+from generators import MIXES
+
+IMPORT_SCRIPT = "import xdsl.xdsl_opt_main"
+
+RUN_SCRIPT = "from xdsl.xdsl_opt_main import xDSLOptMain; xDSLOptMain().run()"
+
+
+def time_process(script: str, stdin: str, repeat: int) -> float:
+    """Get the best wall-clock time of a Python process running a script."""
+    times: list[float] = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", script],
+                       input=stdin,
+                       text=True,
+                       stdout=subprocess.DEVNULL,
+                       check=True)
+        times.append(time.perf_counter() - start)
+    return min(times)
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Measure the startup time of xdsl-opt.",
+        100,
+        "approximate number of operations per mix",
+        "number of runs, the best time is kept")
+    args = arg_parser.parse_args()
+
+    results: dict[str, float] = {
+        "python": round(time_process("pass", "", args.repeat), 4),
+        "import": round(time_process(IMPORT_SCRIPT, "", args.repeat), 4),
+        "empty": round(
+            time_process(RUN_SCRIPT, "builtin.module() {}", args.repeat), 4),
+    }
+    for name, generate in MIXES.items():
+        results[name] = round(
+            time_process(RUN_SCRIPT, generate(args.size), args.repeat), 4)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'run':<10}{'time (s)':>12}")
+        for name, result in results.items():
+            print(f"{name:<10}{result:>12}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of parsing, printing and verifying large programs, in
+operations per second, and the peak memory used by each stage.
+
+The programs are the corpus of `bench/generators.py`, in the xDSL format, in
+the MLIR format and in the bytecode format obtained by printing them. Reading
+the bytecode format includes loading the bodies of all functions. Results can
+be stored as a baseline with `--save-baseline`, and later runs compared to it
+with `--baseline`, failing when a stage is slower or uses more memory than
+the baseline by more than `--tolerance`. Baselines are only comparable on the
+same machine, with the same `--size`.
+
+    python bench/throughput.py --size 10000
+    python bench/throughput.py --json --program deep_nest
+    python bench/throughput.py --size 1000 --save-baseline bench/baseline.json
+    python bench/throughput.py --baseline bench/baseline.json
+"""
+
+from __future__ import annotations
+
+import gc
+import json
+import sys
+import timeit
+import tracemalloc
+from io import BytesIO, StringIO
+from typing import Any, Callable
+
+from common import make_arg_parser
+from generators import CORPUS, get_context
+from xdsl.bytecode import read_bytecode, write_bytecode
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.ir import MLContext
+from xdsl.parser import MLIRParser, XDSLParser
+from xdsl.printer import Printer
+
+
+def print_module(module: ModuleOp, target: Printer.Target) -> str:
+    stream = StringIO()
+    Printer(stream=stream, target=target).print_op(module)
+    return stream.getvalue()
+
+
+def write_module(module: ModuleOp) -> bytes:
+    stream = BytesIO()
+    write_bytecode(module, stream)
+    return stream.getvalue()
+
+
+def read_module(ctx: MLContext, data: bytes) -> ModuleOp:
+    module = read_bytecode(ctx, data)
+    for _ in module.walk():
+        pass
+    return module
+
+
+def get_stages(program: str,
+               ctx: MLContext) -> tuple[int, dict[str, Callable[[], Any]]]:
+    """
+    Get the number of operations of a program, and the stages measured on
+    it.
+    """
+    module = XDSLParser(ctx, program).parse_module()
+    mlir_program = print_module(module, Printer.Target.MLIR)
+    bytecode = write_module(module)
+    num_ops = sum(1 for _ in module.walk())
+    return num_ops, {
+        "parse_xdsl":
+        lambda: XDSLParser(ctx, program).parse_module(),
+        "parse_mlir":
+        lambda: MLIRParser(ctx, mlir_program).parse_module(),
+        "print_xdsl":
+        lambda: print_module(module, Printer.Target.XDSL),
+        "print_mlir":
+        lambda: print_module(module, Printer.Target.MLIR),
+        "write_bc":
+        lambda: write_module(module),
+        "read_bc":
+        lambda: read_module(ctx, bytecode),
+        "verify":
+        lambda: module.verify(),
+    }
+
+
+def measure_peak_memory(stage: Callable[[], Any]) -> int:
+    """Get the peak number of bytes allocated while running a stage."""
+    gc.collect()
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    before, _ = tracemalloc.get_traced_memory()
+    result = stage()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return peak - before
+
+
+def measure(program: str, ctx: MLContext,
+            repeat: int) -> dict[str, dict[str, float]]:
+    num_ops, stages = get_stages(program, ctx)
+    results: dict[str, dict[str, float]] = {}
+    for name, stage in stages.items():
+        time = min(timeit.repeat(stage, number=1, repeat=repeat))
+        results[name] = {
+            "ops": num_ops,
+            "time_s": time,
+            "ops_per_s": round(num_ops / time),
+            "peak_bytes": measure_peak_memory(stage),
+        }
+    return results
+
+
+def find_regressions(results: dict[str, dict[str, dict[str, float]]],
+                     baseline: dict[str, dict[str, dict[str, float]]],
+                     tolerance: float) -> list[str]:
+    """Get the stages that are slower or use more memory than the baseline."""
+    regressions: list[str] = []
+    for program, stages in results.items():
+        for stage, result in stages.items():
+            base = baseline.get(program, {}).get(stage)
+            if base is None:
+                continue
+            if result["ops_per_s"] < base["ops_per_s"] * (1 - tolerance):
+                regressions.append(
+                    f"{program}/{stage}: {result['ops_per_s']} ops/s, "
+                    f"baseline {base['ops_per_s']} ops/s")
+            if result["peak_bytes"] > base["peak_bytes"] * (1 + tolerance):
+                regressions.append(
+                    f"{program}/{stage}: {result['peak_bytes']} peak bytes, "
+                    f"baseline {base['peak_bytes']} peak bytes")
+    return regressions
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Measure the throughput of parsing, printing and verifying.",
+        None,
+        "approximate number of operations per program (default: the size "
+        "of the baseline, or 5000)",
+        "number of runs, the best time is kept")
+    arg_parser.add_argument("--program",
+                            choices=list(CORPUS),
+                            action="append",
+                            help="programs to measure (default: all)")
+    arg_parser.add_argument("--save-baseline",
+                            metavar="FILE",
+                            help="store the results as a baseline")
+    arg_parser.add_argument("--baseline",
+                            metavar="FILE",
+                            help="fail if the results regress from a baseline")
+    arg_parser.add_argument("--tolerance",
+                            type=float,
+                            default=0.2,
+                            help="relative slowdown or memory increase "
+                            "tolerated from the baseline")
+    args = arg_parser.parse_args()
+
+    baseline: dict[str, Any] | None = None
+    if args.baseline is not None:
+        with open(args.baseline) as baseline_file:
+            baseline = json.load(baseline_file)
+    size = args.size
+    if size is None:
+        size = 5000 if baseline is None else baseline["size"]
+    if baseline is not None and baseline["size"] != size:
+        print(f"The baseline was measured with --size {baseline['size']}",
+              file=sys.stderr)
+        return 1
+
+    ctx = get_context()
+    results: dict[str, dict[str, dict[str, float]]] = {}
+    for name in args.program or list(CORPUS):
+        results[name] = measure(CORPUS[name](size), ctx, args.repeat)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'program':<18}{'stage':<12}{'ops':>8}{'ops/s':>12}"
+              f"{'peak (KiB)':>13}")
+        for name, stages in results.items():
+            for stage, result in stages.items():
+                print(f"{name:<18}{stage:<12}{result['ops']:>8}"
+                      f"{result['ops_per_s']:>12}"
+                      f"{result['peak_bytes'] // 1024:>13}")
+
+    if args.save_baseline is not None:
+        with open(args.save_baseline, "w") as baseline_file:
+            json.dump({"size": size, "results": results},
+                      baseline_file,
+                      indent=2)
+            baseline_file.write("\n")
+
+    if baseline is not None:
+        regressions = find_regressions(results, baseline["results"],
+                                       args.tolerance)
+        if regressions:
+            print("Regressions from the baseline:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  {regression}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
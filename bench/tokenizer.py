@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of the lexer and tokenizer, in tokens per second.
+
+The inputs are the programs generated by `bench/generators.py`. The typed
+tokens of `Lexer` and the break-delimited tokens of `Tokenizer.next_token`
+are compared to a reference tokenizer scanning for each break string.
+
+    python bench/tokenizer.py --size 20000
+    python bench/tokenizer.py --json --repeat 10
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from common import make_arg_parser
+from generators import MIXES
+from xdsl.parser import Tokenizer
+from xdsl.utils.lexer import Input, Lexer
+
+
+def count_lexer_tokens(input: Input) -> int:
+    return sum(1 for _ in Lexer(input))
+
+
+def count_tokenizer_tokens(input: Input) -> int:
+    tokenizer = Tokenizer(input)
+    count = 0
+    while not tokenizer.is_eof():
+        tokenizer.next_token()
+        count += 1
+    return count
+
+
+BREAK_ON = ('.', '%', ' ', '(', ')', '[', ']', '{', '}', '<', '>', ':', '=',
+            '@', '?', '|', '->', '-', '//', '\n', '\t', '#', '"', "'", ',', '!')
+"""The strings the tokenizer breaks on, scanned for by the reference."""
+
+
+def find_reference_token_end(content: str, pos: int) -> int:
+    """Find the end of the token starting at `pos`, one break at a time."""
+    for part in BREAK_ON:
+        if content.startswith(part, pos):
+            return pos + len(part)
+    return min((idx for idx in (content.find(part, pos) for part in BREAK_ON)
+                if idx >= 0),
+               default=len(content))
+
+
+def count_reference_tokens(input: Input) -> int:
+    """Split the input as `Tokenizer.next_token`, one break at a time."""
+    content = input.content
+    pos = 0
+    count = 0
+    while True:
+        while pos < len(content) and content[pos].isspace():
+            pos += 1
+        if content.startswith("//", pos):
+            pos = content.find("\n", pos) + 1 or len(content)
+            continue
+        if pos >= len(content):
+            return count
+        pos = find_reference_token_end(content, pos)
+        count += 1
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Measure the throughput of the lexer and tokenizer.",
+        5000,
+        "approximate number of operations per mix",
+        "number of runs, the best time is kept")
+    arg_parser.add_argument("--mix",
+                            choices=list(MIXES),
+                            action="append",
+                            help="dialect mixes to measure (default: all)")
+    args = arg_parser.parse_args()
+
+    results: dict[str, dict[str, float]] = {}
+    for name in args.mix or list(MIXES):
+        input = Input(MIXES[name](args.size), name)
+        result: dict[str, float] = {}
+        for kind, count_tokens in (("lexer", count_lexer_tokens),
+                                   ("tokenizer", count_tokenizer_tokens),
+                                   ("reference", count_reference_tokens)):
+            num_tokens = count_tokens(input)
+            time = min(
+                timeit.repeat(lambda: count_tokens(input),
+                              number=1,
+                              repeat=args.repeat))
+            result[f"{kind}_tokens_per_s"] = round(num_tokens / time)
+        results[name] = result
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mix':<10}{'lexer (tok/s)':>16}{'tokenizer (tok/s)':>20}"
+              f"{'reference (tok/s)':>20}")
+        for name, result in results.items():
+            print(f"{name:<10}{result['lexer_tokens_per_s']:>16}"
+                  f"{result['tokenizer_tokens_per_s']:>20}"
+                  f"{result['reference_tokens_per_s']:>20}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Compare the time taken to verify modules with the compiled IRDL verifiers,
+against the generic verifiers interpreting the IRDL definitions.
+
+The modules are parsed from the programs generated by `bench/generators.py`.
+
+    python bench/verify.py --size 10000
+    python bench/verify.py --json --mix arith --mix memref
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import timeit
+
+from common import make_arg_parser
+from generators import MIXES, get_context
+from xdsl.ir import Operation
+from xdsl.parser import XDSLParser
+
+
+def generic_verify(op: Operation) -> None:
+    """Verify an operation like `Operation.verify`, with generic verifiers."""
+    op.verify_()
+    op_def = type(op).irdl_definition
+    if op_def is not None:
+        op_def.verify_generic(op)
+    for region in op.regions:
+        for block in region.blocks:
+            for nested_op in block.ops:
+                generic_verify(nested_op)
+
+
+def main() -> int:
+    arg_parser = make_arg_parser(
+        "Compare the time taken to verify modules.",
+        5000,
+        "approximate number of operations per mix",
+        "number of verifications, the best time is kept")
+    arg_parser.add_argument("--mix",
+                            choices=list(MIXES),
+                            action="append",
+                            help="dialect mixes to measure (default: all)")
+    args = arg_parser.parse_args()
+
+    ctx = get_context()
+    results: dict[str, dict[str, float]] = {}
+    for name in args.mix or list(MIXES):
+        module = XDSLParser(ctx, MIXES[name](args.size)).parse_module()
+        num_ops = sum(1 for _ in module.walk())
+        compiled_time = min(
+            timeit.repeat(module.verify, number=1, repeat=args.repeat))
+        generic_time = min(
+            timeit.repeat(lambda: generic_verify(module),
+                          number=1,
+                          repeat=args.repeat))
+        results[name] = {
+            "ops_per_s": round(num_ops / compiled_time),
+            "generic_ops_per_s": round(num_ops / generic_time),
+            "speedup": round(generic_time / compiled_time, 2),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+    else:
+        print(f"{'mix':<10}{'ops/s':>12}{'generic ops/s':>16}{'speedup':>10}")
+        for name, result in results.items():
+            print(f"{name:<10}{result['ops_per_s']:>12}"
+                  f"{result['generic_ops_per_s']:>16}{result['speedup']:>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -38,6 +38,19 @@ def test_DenseIntOrFPElementsAttr_fp_type_conversion():
     assert value4 == 5.0
 
 
+def test_DenseIntOrFPElementsAttr_shared_elements():
+    attr = DenseIntOrFPElementsAttr.tensor_from_list([1.0, 0.0, -0.0, 1.0, 0.0],
+                                                     f32)
+    one, zero, neg_zero, one_again, zero_again = attr.data.data
+
+    # Equal elements share their attribute, but 0.0 and -0.0 do not
+    assert one is one_again
+    assert zero is zero_again
+    assert zero is not neg_zero
+    assert zero.value.data == 0.0 and neg_zero.value.data == -0.0
+    assert str(neg_zero.value.data) == "-0.0"
+
+
 def test_DenseArrayBase_verifier_failure():
     # Check that a malformed attribute raises a verify error
 
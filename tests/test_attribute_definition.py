@@ -3,6 +3,7 @@ Test the definition of attributes and their constraints.
 """
 
 from __future__ import annotations
+import pickle
 from dataclasses import dataclass
 from io import StringIO
 from typing import Any, TypeVar, cast, Annotated, Generic, TypeAlias
@@ -10,9 +11,10 @@ from typing import Any, TypeVar, cast, Annotated, Generic, TypeAlias
 import pytest
 
 from xdsl.ir import Attribute, Data, ParametrizedAttribute
-from xdsl.irdl import (AttrConstraint, GenericData, ParameterDef,
-                       irdl_attr_definition, irdl_to_attr_constraint, AnyAttr,
-                       BaseAttr, ParamAttrDef)
+from xdsl.irdl import (AllOf, AnyOf, AttrConstraint, EqAttrConstraint,
+                       GenericData, ParameterDef, irdl_attr_definition,
+                       irdl_to_attr_constraint, AnyAttr, BaseAttr,
+                       ParamAttrDef)
 from xdsl.parser import BaseParser
 from xdsl.printer import Printer
 from xdsl.utils.exceptions import PyRDLAttrDefinitionError, VerifyException
@@ -314,7 +316,7 @@ class ParamConstrAttr(ParametrizedAttribute):
 
 def test_param_attr_constraint():
     """Test the verifier of an attribute with a parametric constraint."""
-    attr = ParamConstrAttr([ParamWrapperAttr([IntData(42)])])
+    attr = ParamConstrAttr([ParamWrapperAttr[IntData]([IntData(42)])])
     stream = StringIO()
     p = Printer(stream=stream)
     p.print_attribute(attr)
@@ -327,7 +329,7 @@ def test_param_attr_constraint_fail():
     a parametric constraint can fail.
     """
     with pytest.raises(Exception) as e:
-        ParamConstrAttr([ParamWrapperAttr([BoolData(True)])])
+        ParamConstrAttr([ParamWrapperAttr[BoolData]([BoolData(True)])])
     assert e.value.args[0] == "!bool<True> should be of base attribute int"
 
 
@@ -346,7 +348,8 @@ def test_nested_generic_constraint():
     Test the verifier of an attribute with a generic
     constraint used in a parametric constraint.
     """
-    attr = NestedParamWrapperAttr[IntData]([ParamWrapperAttr([IntData(42)])])
+    attr = NestedParamWrapperAttr[IntData](
+        [ParamWrapperAttr[IntData]([IntData(42)])])
     stream = StringIO()
     p = Printer(stream=stream)
     p.print_attribute(attr)
@@ -360,7 +363,8 @@ def test_nested_generic_constraint_fail():
     a parametric constraint can fail.
     """
     with pytest.raises(Exception) as e:
-        NestedParamWrapperAttr([ParamWrapperAttr([BoolData(True)])])
+        NestedParamWrapperAttr[IntData](
+            [ParamWrapperAttr[BoolData]([BoolData(True)])])
     assert e.value.args[0] == "!bool<True> should be of base attribute int"
 
 
@@ -376,8 +380,10 @@ def test_nested_param_attr_constraint():
     """
     Test the verifier of a nested parametric constraint.
     """
-    attr = NestedParamConstrAttr(
-        [NestedParamWrapperAttr([ParamWrapperAttr([IntData(42)])])])
+    attr = NestedParamConstrAttr([
+        NestedParamWrapperAttr[IntData](
+            [ParamWrapperAttr[IntData]([IntData(42)])])
+    ])
     stream = StringIO()
     p = Printer(stream=stream)
     p.print_attribute(attr)
@@ -390,8 +396,10 @@ def test_nested_param_attr_constraint_fail():
     Test that the verifier of a nested parametric constraint can fail.
     """
     with pytest.raises(Exception) as e:
-        NestedParamConstrAttr(
-            [NestedParamWrapperAttr([ParamWrapperAttr([IntData(-42)])])])
+        NestedParamConstrAttr([
+            NestedParamWrapperAttr[IntData](
+                [ParamWrapperAttr[IntData]([IntData(-42)])])
+        ])
     assert e.value.args[0] == "Expected positive integer, got -42."
 
 
@@ -656,3 +664,131 @@ def test_custom_constructor():
 
     assert OveriddenInitAttr.new([IntData(42)]) == OveriddenInitAttr(42)
     assert OveriddenInitAttr.new([StringData("17")]) == OveriddenInitAttr("17")
+
+
+################################################################################
+# Attribute uniquing
+################################################################################
+
+
+verified_attributes: list[Attribute] = []
+
+
+@irdl_attr_definition
+class CountingVerifyAttr(ParametrizedAttribute):
+    """An attribute recording each time it is verified."""
+    name = "test.counting_verify"
+
+    param: ParameterDef[IntData]
+
+    def verify(self) -> None:
+        verified_attributes.append(self)
+
+
+def test_uniqued_parametrized_attribute():
+    """Test that structurally equal attributes are the same object."""
+    attr = BoolOrIntParamAttr([IntData(42)])
+    assert attr is BoolOrIntParamAttr([IntData(42)])
+    assert attr is BoolOrIntParamAttr.new([IntData(42)])
+    assert attr is not BoolOrIntParamAttr([IntData(43)])
+    assert attr.parameters == (IntData(42), )
+
+
+def test_uniqued_data():
+    """Test that data attributes are uniqued with their data type."""
+    assert IntData(42) is IntData(42)
+    assert IntData.new(42) is IntData(42)
+    assert IntData(1) is not BoolData(True)
+
+
+@irdl_attr_definition
+class FloatTupleData(Data[tuple[float, ...]]):
+    """An attribute holding a tuple of floats."""
+    name = "test.float_tuple"
+
+    @staticmethod
+    def parse_parameter(parser: BaseParser) -> tuple[float, ...]:
+        raise NotImplementedError()
+
+    def print_parameter(self, printer: Printer):
+        printer.print_string(str(self.data))
+
+    def verify(self) -> None:
+        if not all(isinstance(x, float) for x in self.data):
+            raise VerifyException("FloatTupleData should hold floats.")
+
+
+def test_uniqued_data_float_sign():
+    """Test that 0.0 and -0.0 are not uniqued together, even in tuples."""
+    assert FloatTupleData((0.0, 1.0)) is FloatTupleData((0.0, 1.0))
+    assert FloatTupleData((0.0, 1.0)) is not FloatTupleData((-0.0, 1.0))
+    assert FloatTupleData((0.0, 1.0)) != FloatTupleData((-0.0, 1.0))
+
+
+def test_attribute_hash():
+    """Test that attributes can be used as dictionary keys."""
+    attrs = {IntData(42): 0, BoolOrIntParamAttr([IntData(42)]): 1}
+    assert attrs[IntData(42)] == 0
+    assert attrs[BoolOrIntParamAttr([IntData(42)])] == 1
+
+
+def test_unhashable_data_not_uniqued():
+    """Test that attributes holding unhashable data are not uniqued."""
+    attr = IntListData([0, 1])
+    assert attr is not IntListData([0, 1])
+    assert attr == IntListData([0, 1])
+    with pytest.raises(TypeError):
+        hash(attr)
+
+
+def test_verify_once_per_unique_attribute():
+    """Test that uniqued attributes are only verified on creation."""
+    verified_attributes.clear()
+    attr = CountingVerifyAttr([IntData(7)])
+    assert CountingVerifyAttr([IntData(7)]) is attr
+    assert verified_attributes == [attr]
+
+
+def test_failed_verification_not_uniqued():
+    """Test that attributes failing verification are not uniqued."""
+    with pytest.raises(VerifyException):
+        BoolOrIntParamAttr([StringData("")])
+    with pytest.raises(VerifyException):
+        BoolOrIntParamAttr([StringData("")])
+
+
+def test_pickled_attribute_is_uniqued():
+    """Test that unpickled attributes are uniqued."""
+    attr = BoolOrIntParamAttr([IntData(42)])
+    assert pickle.loads(pickle.dumps(attr)) is attr
+
+
+################################################################################
+# Non-raising constraint checks
+################################################################################
+
+
+@pytest.mark.parametrize("constraint", [
+    AnyAttr(),
+    BaseAttr(IntData),
+    EqAttrConstraint(IntData(42)),
+    AnyOf([BoolData, IntData]),
+    AllOf([BaseAttr(IntData), PositiveIntConstr()]),
+    irdl_to_attr_constraint(ParamWrapperAttr[IntData]),
+    PositiveIntConstr(),
+])
+@pytest.mark.parametrize("attr", [
+    IntData(42),
+    IntData(-1),
+    BoolData(True),
+    ParamWrapperAttr[IntData]([IntData(42)]),
+    ParamWrapperAttr[BoolData]([BoolData(True)]),
+])
+def test_constraint_matches(constraint: AttrConstraint, attr: Attribute):
+    """Test that `matches` succeeds exactly when `verify` does."""
+    try:
+        constraint.verify(attr)
+        verifies = True
+    except VerifyException:
+        verifies = False
+    assert constraint.matches(attr) == verifies
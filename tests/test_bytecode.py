@@ -0,0 +1,204 @@
+import math
+from io import BytesIO, StringIO
+
+import pytest
+
+from xdsl.bytecode import MAGIC, read_bytecode, write_bytecode
+from xdsl.dialects.arith import (Arith, Constant, FastMathFlag,
+                                 FastMathFlags, FastMathFlagsAttr)
+from xdsl.dialects.builtin import (ArrayAttr, Builtin, DenseArrayBase,
+                                   DenseIntOrFPElementsAttr, DictionaryAttr,
+                                   FloatAttr, ModuleOp, TensorType, UnitAttr,
+                                   f32, f64, i32)
+from xdsl.dialects.cf import Branch, Cf
+from xdsl.dialects.func import Func, FuncOp, Return
+from xdsl.ir import Attribute, Block, MLContext, Operation, Region
+from xdsl.parser import XDSLParser
+from xdsl.printer import Printer
+from xdsl.utils.exceptions import BytecodeError
+
+
+def _context() -> MLContext:
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Arith)
+    ctx.register_dialect(Cf)
+    ctx.register_dialect(Func)
+    return ctx
+
+
+def _function(idx: int) -> str:
+    return f"""
+  func.func() ["sym_name" = "f{idx}", "function_type" = !fun<[!i32], [!i32]>, "sym_visibility" = "private"] {{
+  ^0(%a : !i32):
+    %b : !i32 = arith.addi(%a : !i32, %a : !i32)
+    cf.br(%b : !i32)(^2)
+  ^1(%unused : !i32):
+    func.return(%unused : !i32)
+  ^2(%c : !i32):
+    %d : !i32 = arith.constant() ["value" = {idx} : !i32]
+    %e : !f32 = arith.constant() ["value" = -0.0 : !f32]
+    %f : !tensor<[2 : !index, 2 : !index], !i32> = arith.constant() ["value" = !dense<!tensor<[2 : !index, 2 : !index], !i32>, [1 : !i32, -2 : !i32, 3 : !i32, 4 : !i32]>]
+    func.return(%c : !i32)
+  }}"""
+
+
+def _program(num_functions: int) -> str:
+    functions = "".join(_function(idx) for idx in range(num_functions))
+    return f'builtin.module() ["sym_name" = "m"] {{{functions}\n}}\n'
+
+
+def _print(op: Operation) -> str:
+    stream = StringIO()
+    Printer(stream=stream).print_op(op)
+    return stream.getvalue()
+
+
+def _write(module: ModuleOp) -> bytes:
+    output = BytesIO()
+    write_bytecode(module, output)
+    return output.getvalue()
+
+
+@pytest.mark.parametrize("num_functions", [0, 1, 3])
+def test_bytecode_round_trip(num_functions: int):
+    ctx = _context()
+    module = XDSLParser(ctx, _program(num_functions)).parse_module()
+    data = _write(module)
+    assert data.startswith(MAGIC)
+    result = read_bytecode(ctx, data)
+    assert _print(result) == _print(module)
+    result.verify()
+    assert _write(result) == data
+
+
+def test_bytecode_lazy_functions():
+    ctx = _context()
+    data = _write(XDSLParser(ctx, _program(3)).parse_module())
+    module = read_bytecode(ctx, data)
+    functions = [op for op in module.ops if isinstance(op, FuncOp)]
+    assert len(functions) == len(module.ops)
+    assert [function.sym_name.data
+            for function in functions] == ["f0", "f1", "f2"]
+    assert all(function.body.lazy_body is not None  # type: ignore
+               for function in functions)
+
+    # Only the accessed function is decoded
+    assert len(functions[1].body.blocks) == 3
+    assert [function.body.lazy_body is not None  # type: ignore
+            for function in functions] == [True, False, True]
+    functions[1].verify()
+
+
+def test_bytecode_top_level_values():
+    # Regions using top-level values are decoded with the module
+    program = """builtin.module() {
+  %0 : !i32 = arith.constant() ["value" = 0 : !i32]
+  func.func() ["sym_name" = "f", "function_type" = !fun<[], []>, "sym_visibility" = "private"] {
+    %1 : !i32 = arith.addi(%0 : !i32, %0 : !i32)
+    func.return()
+  }
+}
+"""
+    ctx = _context()
+    module = XDSLParser(ctx, program).parse_module()
+    assert _print(read_bytecode(ctx, _write(module))) == _print(module)
+
+
+def test_bytecode_unregistered_ops():
+    program = """builtin.module() {
+  %0 : !i32 = "test.op"() ["attr" = 1 : !i32] {
+    "test.terminator"()
+  }
+}
+"""
+    ctx = _context()
+    module = XDSLParser(ctx, program,
+                        allow_unregistered_ops=True).parse_module()
+    data = _write(module)
+    result = read_bytecode(ctx, data, allow_unregistered_ops=True)
+    assert _print(result) == _print(module)
+    with pytest.raises(BytecodeError) as e:
+        read_bytecode(ctx, data)
+    assert str(e.value) == "Unknown operation test.op"
+
+
+@pytest.mark.parametrize("attribute", [
+    DictionaryAttr({"some_unit_attr": UnitAttr()}),
+    FloatAttr(float("inf"), f64),
+    FloatAttr(float("-inf"), f32),
+    FloatAttr(-0.0, f64),
+    DenseIntOrFPElementsAttr.tensor_from_list([1e300, 0.1, -0.0, 0.0], f64),
+    DenseIntOrFPElementsAttr.tensor_from_list([-(2**40), 0, 7], i32),
+    DenseIntOrFPElementsAttr([
+        TensorType.from_type_and_list(f64, [2]),
+        ArrayAttr([FloatAttr(1.0, f64), FloatAttr(1.0, f32)])
+    ]),
+    DenseArrayBase.create_dense_int_or_index(i32, [1, -2]),
+    FastMathFlagsAttr(FastMathFlags({FastMathFlag.NO_NANS})),
+    FastMathFlagsAttr(FastMathFlags(set())),
+])
+def test_bytecode_attributes(attribute: Attribute):
+    ctx = _context()
+    module = ModuleOp.from_region_or_ops([])
+    module.attributes["attr"] = attribute
+    result = read_bytecode(ctx, _write(module))
+    assert result.attributes["attr"] == attribute
+
+
+def test_bytecode_nan():
+    ctx = _context()
+    module = ModuleOp.from_region_or_ops([])
+    module.attributes["attr"] = FloatAttr(float("nan"), f64)
+    module.attributes["dense"] = DenseIntOrFPElementsAttr.tensor_from_list(
+        [float("nan"), 1.0], f64)
+    result = read_bytecode(ctx, _write(module))
+    attr = result.attributes["attr"]
+    assert isinstance(attr, FloatAttr)
+    assert math.isnan(attr.value.data)
+    dense = result.attributes["dense"]
+    assert isinstance(dense, DenseIntOrFPElementsAttr)
+    assert [element.value.data for element in dense.data.data
+            ][1:] == [1.0]
+    assert math.isnan(dense.data.data[0].value.data)
+
+
+def test_bytecode_forward_references():
+    # ^1 uses a value defined in ^2, which comes before it in dominance order
+    constant = Constant.from_int_and_width(1, 32)
+    block1 = Block.from_ops([Return.get(constant)])
+    block2 = Block.from_ops([constant, Branch.get(block1)])
+    block0 = Block.from_ops([Branch.get(block2)])
+    function = FuncOp.from_region("f", [], [i32],
+                                  Region.from_block_list([block0, block1,
+                                                          block2]))
+    module = ModuleOp.from_region_or_ops([function])
+    module.verify()
+
+    ctx = _context()
+    data = _write(module)
+    result = read_bytecode(ctx, data)
+    assert _print(result) == _print(module)
+    result.verify()
+    assert _write(result) == data
+
+
+def test_bytecode_errors():
+    ctx = _context()
+    data = _write(XDSLParser(ctx, _program(1)).parse_module())
+    with pytest.raises(BytecodeError) as e:
+        read_bytecode(ctx, b"builtin.module() {}")
+    assert str(e.value) == "Not an xDSL bytecode file"
+    with pytest.raises(BytecodeError) as e:
+        read_bytecode(ctx, MAGIC + b"\x7f" + data[len(MAGIC) + 1:])
+    assert str(e.value) == ("Unsupported bytecode version 127, expected "
+                            "version 2")
+    with pytest.raises(BytecodeError) as e:
+        read_bytecode(ctx, data[:len(data) // 2])
+    assert str(e.value) == "Truncated bytecode file"
+
+    # Function bodies are only checked when they are decoded
+    module = read_bytecode(ctx, data[:-1])
+    with pytest.raises(BytecodeError) as e:
+        module.verify()
+    assert str(e.value) == "Truncated bytecode file"
@@ -0,0 +1,122 @@
+from xdsl.analysis import AnalysisManager
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import IntegerType, i1, i32
+from xdsl.dialects.cf import Branch, ConditionalBranch
+from xdsl.dominance import DominanceInfo, PostDominanceInfo
+from xdsl.ir import Block, Region
+
+
+def _diamond_with_loop() -> tuple[Region, list[Block]]:
+    """
+    Create the following CFG, with an unreachable block `dead`:
+        entry -> then, else
+        then -> merge
+        else -> loop
+        loop -> loop, merge
+        dead -> merge
+    """
+    entry, then, else_, loop, merge, dead = (Block() for _ in range(6))
+    cond = Constant.from_int_and_width(1, IntegerType(1))
+    entry.add_ops([cond, ConditionalBranch.get(cond, then, [], else_, [])])
+    then.add_op(Branch.get(merge))
+    else_.add_op(Branch.get(loop))
+    loop_cond = Constant.from_int_and_width(0, i1)
+    loop.add_ops(
+        [loop_cond,
+         ConditionalBranch.get(loop_cond, loop, [], merge, [])])
+    merge.add_op(Constant.from_int_and_width(0, i32))
+    dead.add_op(Branch.get(merge))
+    blocks = [entry, then, else_, loop, merge, dead]
+    return Region.from_block_list(blocks), blocks
+
+
+def test_dominance():
+    region, (entry, then, else_, loop, merge, dead) = _diamond_with_loop()
+    dom = DominanceInfo(region)
+
+    assert dom.get_immediate_dominator(entry) is None
+    assert dom.get_immediate_dominator(then) is entry
+    assert dom.get_immediate_dominator(else_) is entry
+    assert dom.get_immediate_dominator(loop) is else_
+    assert dom.get_immediate_dominator(merge) is entry
+
+    for block in (entry, then, else_, loop, merge):
+        assert dom.is_reachable(block)
+        assert dom.dominates(entry, block)
+        assert dom.dominates(block, block)
+        assert not dom.properly_dominates(block, block)
+    assert dom.dominates(else_, loop)
+    assert not dom.dominates(then, merge)
+    assert not dom.dominates(loop, merge)
+    assert not dom.dominates(loop, else_)
+
+    # Unreachable blocks only dominate themselves
+    assert not dom.is_reachable(dead)
+    assert dom.get_immediate_dominator(dead) is None
+    assert dom.dominates(dead, dead)
+    assert not dom.dominates(entry, dead)
+    assert not dom.dominates(dead, merge)
+
+
+def test_post_dominance():
+    region, (entry, then, else_, loop, merge, dead) = _diamond_with_loop()
+    post_dom = PostDominanceInfo(region)
+
+    assert post_dom.get_immediate_dominator(merge) is None
+    assert post_dom.get_immediate_dominator(loop) is merge
+    assert post_dom.get_immediate_dominator(else_) is loop
+    assert post_dom.get_immediate_dominator(entry) is merge
+    for block in (entry, then, else_, loop, dead):
+        assert post_dom.properly_post_dominates(merge, block)
+    assert post_dom.post_dominates(loop, else_)
+    assert not post_dom.post_dominates(loop, entry)
+    assert not post_dom.post_dominates(then, entry)
+
+
+def test_op_and_value_dominance():
+    region, (entry, then, _, _, merge, _) = _diamond_with_loop()
+    dom = DominanceInfo(region)
+    cond = entry.ops[0]
+    arg = merge.insert_arg(i32, 0)
+    add = Addi.get(arg, arg)
+    merge.add_op(add)
+
+    assert dom.op_properly_dominates(cond, entry.ops[1])
+    assert not dom.op_properly_dominates(entry.ops[1], cond)
+    assert not dom.op_properly_dominates(cond, cond)
+    assert dom.op_properly_dominates(cond, add)
+    assert not dom.op_properly_dominates(then.ops[0], add)
+
+    assert dom.value_dominates(cond.results[0], add)
+    assert dom.value_dominates(arg, add)
+    assert not dom.value_dominates(arg, cond)
+
+
+def test_analysis_manager_invalidation():
+    region, (entry, then, else_, loop, merge, dead) = _diamond_with_loop()
+    am = AnalysisManager()
+    dom = am.get(DominanceInfo, region)
+    assert am.get(DominanceInfo, region) is dom
+    assert am.is_cached(DominanceInfo, region)
+
+    # Adding an operation before a terminator does not change the CFG
+    merge.insert_op(Constant.from_int_and_width(1, i32), 0)
+    assert am.get(DominanceInfo, region) is dom
+
+    # Replacing a terminator invalidates the analysis
+    terminator = then.ops[0]
+    then.erase_op(terminator)
+    assert not am.is_cached(DominanceInfo, region)
+    then.add_op(Branch.get(else_))
+    new_dom = am.get(DominanceInfo, region)
+    assert new_dom is not dom
+    assert new_dom.get_immediate_dominator(else_) is entry
+    assert new_dom.get_immediate_dominator(merge) is loop
+
+    # Removing a block invalidates the analysis
+    region.detach_block(dead)
+    assert not am.is_cached(DominanceInfo, region)
+    am.get(DominanceInfo, region)
+    assert am.is_cached(DominanceInfo, region)
+    am.invalidate(region)
+    assert not am.is_cached(DominanceInfo, region)
@@ -1,11 +1,13 @@
 from typing import cast
 import pytest
 
-from xdsl.ir import MLContext, Operation, Block, Region, ErasedSSAValue, SSAValue
+from xdsl.ir import (MLContext, Operation, Block, Region, ErasedSSAValue,
+                     OpIndex, SSAValue)
 from xdsl.dialects.arith import Addi, Subi, Constant
 from xdsl.dialects.builtin import IntegerType, i32, IntegerAttr, ModuleOp
 from xdsl.dialects.scf import If
 from xdsl.parser import XDSLParser
+from xdsl.rewriter import Rewriter
 from xdsl.dialects.builtin import Builtin
 from xdsl.dialects.func import Func
 from xdsl.dialects.arith import Arith
@@ -139,6 +141,271 @@ def test_op_clone_with_regions():
     assert if2.false_region.op is not if_.false_region.op
 
 
+def test_op_clone_remaps_values_and_successors():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Func)
+    ctx.register_dialect(Arith)
+    ctx.register_dialect(Cf)
+
+    func = XDSLParser(ctx, program_successors_args).parse_op()
+    func_clone = func.clone()
+    assert func.is_structurally_equivalent(func_clone)
+
+    entry, exit_block = func_clone.regions[0].blocks
+    branch = entry.last_op
+    assert branch is not None
+    # Successors referring to later blocks are remapped
+    assert list(branch.successors) == [exit_block]
+    assert branch.operands == (entry.first_op.results[0], )
+    assert exit_block.first_op.operands == exit_block.args
+
+    # Cloned blocks keep their operations linked and ordered
+    assert entry.ops == [entry.first_op, branch]
+    assert entry.first_op.is_before_in_block(branch)
+    assert branch.parent is entry and entry.parent is func_clone.regions[0]
+
+
+def test_region_clone_into():
+    a = Constant.from_int_and_width(1, i32)
+    b = Addi.get(a, a)
+    region = Region.from_operation_list([a, b])
+    dest = Region.from_operation_list([])
+
+    region.clone_into(dest)
+    assert len(dest.blocks) == 2
+    a2, b2 = dest.blocks[1].ops
+    assert b2.operands == (a2.results[0], a2.results[0])
+    assert len(a2.results[0].uses) == 2
+    assert len(a.results[0].uses) == 2
+
+
+def test_block_linked_list_insertion():
+    a = Constant.from_int_and_width(1, i32)
+    b = Constant.from_int_and_width(2, i32)
+    c = Constant.from_int_and_width(3, i32)
+    d = Constant.from_int_and_width(4, i32)
+
+    block = Block.from_ops([b])
+    block.insert_op_before(a, b)
+    block.insert_op_after(d, b)
+    block.insert_op_after(c, b)
+
+    assert block.ops == [a, b, c, d]
+    assert list(reversed(block.ops)) == [d, c, b, a]
+    assert block.first_op is a
+    assert block.last_op is d
+    assert a.prev_op is None
+    assert a.next_op is b
+    assert d.next_op is None
+    assert c.prev_op is b
+    assert block.ops[2] is c
+    assert block.ops[-1] is d
+    assert block.ops[1:3] == [b, c]
+    assert [block.get_operation_index(op) for op in block.ops] == [0, 1, 2, 3]
+
+
+def test_block_linked_list_detach():
+    a = Constant.from_int_and_width(1, i32)
+    b = Constant.from_int_and_width(2, i32)
+    c = Constant.from_int_and_width(3, i32)
+
+    block = Block.from_ops([a, b, c])
+    block.detach_op(b)
+    assert block.ops == [a, c]
+    assert a.next_op is c
+    assert c.prev_op is a
+    assert b.parent is None and b.prev_op is None and b.next_op is None
+
+    block.detach_op(0)
+    block.detach_op(c)
+    assert block.is_empty
+    assert block.ops == []
+    assert len(block.ops) == 0
+    assert block.first_op is None and block.last_op is None
+
+    block.insert_op([a, b, c], 0)
+    assert block.ops == [a, b, c]
+
+
+def test_is_before_in_block():
+    ops = [Constant.from_int_and_width(i, i32) for i in range(4)]
+    block = Block.from_ops(ops)
+
+    assert ops[0].is_before_in_block(ops[3])
+    assert not ops[3].is_before_in_block(ops[0])
+
+    # Repeatedly insert at the same position to exhaust the gaps between
+    # order indices, forcing a renumbering.
+    inserted: list[Operation] = []
+    for i in range(10):
+        new_op = Constant.from_int_and_width(i, i32)
+        block.insert_op_after(new_op, ops[1])
+        inserted.append(new_op)
+
+    assert ops[1].is_before_in_block(inserted[0])
+    assert inserted[0].is_before_in_block(ops[2])
+    assert inserted[-1].is_before_in_block(inserted[0])
+
+    other_block = Block.from_ops([Constant.from_int_and_width(0, i32)])
+    with pytest.raises(ValueError):
+        ops[0].is_before_in_block(other_block.ops[0])
+
+
+def test_ir_nodes_are_slotted():
+    a = Constant.from_int_and_width(1, i32)
+    block = Block.from_ops([a])
+    region = Region.from_block_list([block])
+
+    for node in [a, a.results[0], block, region]:
+        assert not hasattr(node, "__dict__")
+
+    # Operations without regions or successors share empty containers
+    assert a.regions == ()
+    assert a.successors == ()
+
+    module = ModuleOp.from_region_or_ops(region)
+    assert list(module.regions) == [region]
+
+
+def _walk_test_module() -> tuple[ModuleOp, list[Operation]]:
+    """
+    Create a module containing a nested module, and return it with its
+    operations in pre-order.
+    """
+    a, b, c, d = [Constant.from_int_and_width(i, i32) for i in range(4)]
+    inner = ModuleOp.from_region_or_ops([b, c])
+    module = ModuleOp.from_region_or_ops([a, inner, d])
+    return module, [module, a, inner, b, c, d]
+
+
+def test_walk():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+
+    assert list(module.walk()) == [module, a, inner, b, c, d]
+    assert list(module.walk(reverse=True)) == [module, d, inner, c, b, a]
+    assert list(module.walk(post_order=True)) == [a, b, c, inner, d, module]
+    assert list(module.walk(reverse=True,
+                            post_order=True)) == [d, c, b, inner, a, module]
+    assert list(module.body.walk()) == [a, inner, b, c, d]
+    assert list(module.body.blocks[0].walk()) == [a, inner, b, c, d]
+
+
+def test_walk_filter():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+
+    assert list(module.walk(op_type=Constant)) == [a, b, c, d]
+    assert list(module.walk(op_type=ModuleOp)) == [module, inner]
+    assert list(module.walk(
+        skip_regions=lambda op: op is inner)) == [module, a, inner, d]
+
+
+def test_walk_callback():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+
+    walked: list[Operation] = []
+    with pytest.deprecated_call():
+        assert module.walk(walked.append) is None
+    assert walked == [module, a, inner, b, c, d]
+
+    walked = []
+    with pytest.deprecated_call():
+        module.body.walk(walked.append)
+    assert walked == [a, inner, b, c, d]
+
+
+def test_walk_erase():
+    for post_order in [False, True]:
+        module, (_, a, inner, b, c, d) = _walk_test_module()
+        walked: list[Operation] = []
+        for op in module.walk(op_type=Constant, post_order=post_order):
+            walked.append(op)
+            op.detach()
+            op.erase()
+        assert walked == [a, b, c, d]
+        assert list(module.walk()) == [module, inner]
+
+    # The regions of an erased operation are not walked
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+    walked = []
+    for op in module.walk():
+        walked.append(op)
+        if op is inner:
+            inner.detach()
+            inner.erase()
+    assert walked == [module, a, inner, d]
+
+
+def test_walk_deep_nesting():
+    depth = 5000
+    module = ModuleOp.from_region_or_ops([])
+    for _ in range(depth):
+        module = ModuleOp.from_region_or_ops([module])
+    assert sum(1 for _ in module.walk()) == depth + 1
+    assert sum(1 for _ in module.clone().walk()) == depth + 1
+    assert module.structural_hash() == module.clone().structural_hash()
+
+
+def test_op_index():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+    index = OpIndex.of(module)
+    assert OpIndex.of(module) is index
+
+    assert index.get(Constant) == [a, b, c, d]
+    assert index.get(ModuleOp) == [module, inner]
+    assert index.get_by_name("arith.constant") == [a, b, c, d]
+    assert index.get(Operation) == [module, a, inner, b, c, d]
+
+    # Attached operations, and the operations they contain, are indexed, and
+    # returned in program order
+    e = Constant.from_int_and_width(4, i32)
+    nested = ModuleOp.from_region_or_ops([e])
+    module.body.blocks[0].insert_op(nested, 0)
+    assert index.get(Constant) == [e, a, b, c, d]
+    assert index.get(ModuleOp) == [module, nested, inner]
+
+    # Detached operations, and the operations they contain, are not
+    inner.detach()
+    assert index.get(Constant) == [e, a, d]
+    module.body.blocks[0].erase_op(a)
+    assert index.get(Constant) == [e, d]
+
+
+def test_op_index_block_moves():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+    index = OpIndex.of(module)
+
+    block = inner.body.detach_block(0)
+    assert index.get(Constant) == [a, d]
+    inner.body.add_block(block)
+    assert index.get(Constant) == [a, b, c, d]
+
+    region = Region()
+    inner.body.move_blocks(region)
+    assert index.get(Constant) == [a, d]
+
+    # Blocks moved into the indexed operation are indexed in program order
+    region.move_blocks(inner.body)
+    assert index.get(Constant) == [a, b, c, d]
+    inner.body.blocks[0].detach_op(b)
+    inner.body.blocks[0].add_op(b)
+    assert index.get(Constant) == [a, c, b, d]
+
+
+def test_op_index_scoped():
+    module, (_, a, inner, b, c, d) = _walk_test_module()
+    with OpIndex.scoped(module) as index:
+        assert index.get(Constant) == [a, b, c, d]
+    # The index created for the block is dropped
+    assert OpIndex.of(module) is not index
+
+    # An existing index is kept
+    index = OpIndex.of(module)
+    with OpIndex.scoped(module) as scoped_index:
+        assert scoped_index is index
+    assert OpIndex.of(module) is index
+
+
 ##################### Testing is_structurally_equal #####################
 
 program_region = \
@@ -184,6 +451,16 @@ program_func = \
   }
 }
 """
+program_successors_args = \
+"""
+    func.func() ["sym_name" = "forward_br", "function_type" = !fun<[], []>, "sym_visibility" = "private"] {
+    ^0:
+        %0 : !i32 = arith.constant() ["value" = 1 : !i32]
+        cf.br(%0 : !i32) (^1)
+    ^1(%1 : !i32):
+        func.return(%1 : !i32)
+    }
+"""
 program_successors = \
 """
     func.func() ["sym_name" = "unconditional_br", "function_type" = !fun<[], []>, "sym_visibility" = "private"] {
@@ -225,6 +502,113 @@ def test_is_structurally_equivalent(args: list[str], expected_result: bool):
     rhs: Operation = parser.parse_op()
 
     assert lhs.is_structurally_equivalent(rhs) == expected_result
+    if expected_result:
+        assert lhs.structural_hash() == rhs.structural_hash()
+
+
+def test_structural_hash_after_modification():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Func)
+    ctx.register_dialect(Arith)
+
+    module = XDSLParser(ctx, program_func).parse_op()
+    func = module.regions[0].blocks[0].ops[0]
+    body = func.regions[0].blocks[0]
+    add = body.first_op
+    assert isinstance(add, Addi)
+    initial_hash = module.structural_hash()
+
+    add.operands = [add.operands[1], add.operands[0]]
+    assert module.structural_hash() != initial_hash
+    add.operands = [add.operands[1], add.operands[0]]
+    assert module.structural_hash() == initial_hash
+
+    cst = Constant.from_int_and_width(1, i32)
+    body.insert_op_before(cst, add)
+    assert module.structural_hash() != initial_hash
+    cst.detach()
+    assert module.structural_hash() == initial_hash
+
+    add.attributes["foo"] = IntegerAttr.from_int_and_width(1, 32)
+    assert module.structural_hash() != initial_hash
+
+
+def test_is_structurally_equivalent_after_modification():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Arith)
+
+    program = """builtin.module() {
+  %0 : !i32 = arith.constant() ["value" = 1 : !i32]
+}"""
+    lhs = XDSLParser(ctx, program).parse_op()
+    rhs = XDSLParser(ctx, program).parse_op()
+    lhs_cst = lhs.regions[0].blocks[0].ops[0]
+    rhs_cst = rhs.regions[0].blocks[0].ops[0]
+
+    lhs_cst.attributes["value"] = IntegerAttr.from_int_and_width(2, 32)
+    rhs_cst.attributes["value"] = IntegerAttr.from_int_and_width(3, 32)
+    assert not lhs.is_structurally_equivalent(rhs)
+    rhs_cst.attributes["value"] = IntegerAttr.from_int_and_width(2, 32)
+    assert lhs.is_structurally_equivalent(rhs)
+    assert lhs.structural_hash() == rhs.structural_hash()
+
+
+def test_is_structurally_equivalent_after_structure_modification():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Func)
+    ctx.register_dialect(Arith)
+
+    module = XDSLParser(ctx, program_func).parse_op()
+    initial = module.clone()
+    body = module.regions[0].blocks[0].ops[0].regions[0].blocks[0]
+    add = body.first_op
+    assert isinstance(add, Addi)
+
+    def check_equivalence(equivalent_to_initial: bool):
+        # The clone is compared to the module after the module was compared,
+        # and possibly modified since then
+        assert module.is_structurally_equivalent(
+            initial) == equivalent_to_initial
+        assert module.is_structurally_equivalent(module.clone())
+
+    check_equivalence(True)
+    add.operands = [add.operands[1], add.operands[0]]
+    check_equivalence(False)
+    add.replace_operand(0, add.operands[1])
+    check_equivalence(False)
+    add.replace_operand(1, body.args[1])
+    check_equivalence(True)
+
+    cst = Constant.from_int_and_width(1, i32)
+    body.insert_op_before(cst, add)
+    check_equivalence(False)
+    cst.detach()
+    check_equivalence(True)
+
+    arg = body.insert_arg(i32, 2)
+    check_equivalence(False)
+    body.erase_arg(arg)
+    check_equivalence(True)
+
+    block = module.regions[0].detach_block(0)
+    check_equivalence(False)
+    module.regions[0].add_block(block)
+    check_equivalence(True)
+
+
+def test_structural_hash_uses_value_positions():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Func)
+    ctx.register_dialect(Arith)
+
+    lhs = XDSLParser(ctx, program_add).parse_op()
+    rhs = XDSLParser(ctx, program_add_2).parse_op()
+    assert lhs.structural_hash() == lhs.clone().structural_hash()
+    assert lhs.structural_hash() != rhs.structural_hash()
 
 
 def test_is_structurally_equivalent_incompatible_ir_nodes():
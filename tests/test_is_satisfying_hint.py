@@ -1,5 +1,7 @@
 from typing import Any, Generic, TypeAlias, TypeVar
 
+import pytest
+
 from xdsl.ir import Attribute, ParametrizedAttribute
 from xdsl.irdl import ParameterDef, irdl_attr_definition
 from xdsl.utils.hints import isa
@@ -250,3 +252,37 @@ def test_parametrized_attribute():
     assert isa(attr, MyParamAttr[IntAttr])
     assert isa(attr, MyParamAttr[IntAttr | FloatData])
     assert not isa(attr, MyParamAttr[FloatData])
+
+
+################################################################################
+# Caching
+################################################################################
+
+
+def test_isa_checker_cache():
+    """Test that the cached check of a hint gives the same results."""
+    hint = MyParamAttr[IntAttr | FloatData]
+    for _ in range(2):
+        assert isa(MyParamAttr[IntAttr]([IntAttr(0)]), hint)
+        assert not isa(MyParamAttr[IntAttr]([IndexType()]), hint)
+        assert isa([], list[hint])
+        assert not isa([IntAttr(0)], list[hint])
+
+
+def test_isa_checker_cache_many_hints():
+    """Test hints checked again after their cached checks were evicted."""
+    classes: list[type] = [type(f"Class{idx}", (), {}) for idx in range(600)]
+    for _ in range(2):
+        for cls, other_cls in zip(classes, classes[1:]):
+            assert isa([cls()], list[cls])
+            assert not isa([other_cls()], list[cls])
+
+
+def test_unsupported_hint():
+    """Test that unsupported hints are reported when checked."""
+    hint = set[int]
+    assert isa([], list[hint])
+    with pytest.raises(ValueError):
+        isa({0}, hint)
+    with pytest.raises(ValueError):
+        isa([{0}], list[hint])
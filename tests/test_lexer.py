@@ -0,0 +1,156 @@
+from io import StringIO
+from pathlib import Path
+
+import pytest
+
+from xdsl.ir import MLContext
+from xdsl.parser import Tokenizer, XDSLParser
+from xdsl.utils.exceptions import ParseError
+from xdsl.utils.lexer import Input, Lexer, Span, TokenKind
+
+
+@pytest.mark.parametrize("text,kind", [
+    ("%0", TokenKind.VALUE_ID),
+    ("%arg.1-x", TokenKind.VALUE_ID),
+    ("^bb0", TokenKind.BLOCK_ID),
+    ("@main", TokenKind.SYMBOL_REF),
+    ('@"sym bol"', TokenKind.SYMBOL_REF),
+    ("!i32", TokenKind.TYPE_ID),
+    ("#map", TokenKind.ATTRIBUTE_ID),
+    ("1.5e-3", TokenKind.FLOAT_LIT),
+    ("42", TokenKind.INTEGER_LIT),
+    ("0x1F", TokenKind.INTEGER_LIT),
+    ('"a \\"quoted\\" string"', TokenKind.STRING_LIT),
+    ('"a\\n"', TokenKind.STRING_LIT),
+    ("arith.constant", TokenKind.BARE_IDENT),
+    ("->", TokenKind.ARROW),
+    ("::", TokenKind.PUNCTUATION),
+    ("{", TokenKind.PUNCTUATION),
+])
+def test_lex_token(text: str, kind: TokenKind):
+    lexer = Lexer(Input(f"  {text} // comment\n", "<test>"))
+    token = lexer.lex()
+    assert token.kind == kind
+    assert token.text == text
+    assert lexer.lex().kind == TokenKind.EOF
+
+
+def test_lex_program():
+    text = '%0 : !i32 = arith.constant() ["value" = 1 : !i32]'
+    tokens = [(token.kind, token.text)
+              for token in Lexer(Input(text, "<test>"))]
+    assert tokens == [
+        (TokenKind.VALUE_ID, "%0"),
+        (TokenKind.PUNCTUATION, ":"),
+        (TokenKind.TYPE_ID, "!i32"),
+        (TokenKind.PUNCTUATION, "="),
+        (TokenKind.BARE_IDENT, "arith.constant"),
+        (TokenKind.PUNCTUATION, "("),
+        (TokenKind.PUNCTUATION, ")"),
+        (TokenKind.PUNCTUATION, "["),
+        (TokenKind.STRING_LIT, '"value"'),
+        (TokenKind.PUNCTUATION, "="),
+        (TokenKind.INTEGER_LIT, "1"),
+        (TokenKind.PUNCTUATION, ":"),
+        (TokenKind.TYPE_ID, "!i32"),
+        (TokenKind.PUNCTUATION, "]"),
+    ]
+
+
+def test_lex_unexpected_character():
+    with pytest.raises(ParseError):
+        Lexer(Input("`", "<test>")).lex()
+
+
+def test_tokenizer_next_token():
+    tokenizer = Tokenizer(
+        Input("%res = a/b.c -> d-e // comment\n  //\nf", "<test>"))
+    tokens: list[str] = []
+    while not tokenizer.is_eof():
+        tokens.append(tokenizer.next_token().text)
+    assert tokens == [
+        "%", "res", "=", "a/b", ".", "c", "->", "d", "-", "e", "f"
+    ]
+
+
+def test_tokenizer_trailing_comment():
+    tokenizer = Tokenizer(Input("a // comment", "<test>"))
+    assert tokenizer.next_token().text == "a"
+    assert tokenizer.is_eof()
+
+
+def test_tokenizer_lex():
+    tokenizer = Tokenizer(Input("^bb0(%x", "<test>"))
+    assert tokenizer.lex(peek=True).kind == TokenKind.BLOCK_ID
+    assert tokenizer.lex().text == "^bb0"
+    assert tokenizer.lex().text == "("
+    assert tokenizer.lex().kind == TokenKind.VALUE_ID
+    assert tokenizer.lex().kind == TokenKind.EOF
+
+
+def test_tokenizer_next_token_of_kind():
+    tokenizer = Tokenizer(Input("  %x ^bb0", "<test>"))
+    assert tokenizer.next_token_of_kind(TokenKind.BLOCK_ID) is None
+    value_id = tokenizer.next_token_of_kind(TokenKind.VALUE_ID, peek=True)
+    assert value_id is not None and value_id.text == "%x"
+    assert tokenizer.pos == 0
+    assert tokenizer.next_token_of_kind(TokenKind.VALUE_ID) == value_id
+    block_id = tokenizer.next_token_of_kind(TokenKind.BLOCK_ID)
+    assert block_id is not None and block_id.text == "^bb0"
+    assert tokenizer.next_token_of_kind(TokenKind.BLOCK_ID) is None
+
+
+@pytest.mark.parametrize("text,parsed", [
+    ("%x.1", "%x.1"),
+    ("%", None),
+    ("x", None),
+    ("ab.c", "ab.c"),
+    ('"a\\"b"', '"a\\"b"'),
+    ('"a\\qb"', None),
+])
+def test_parser_typed_tokens(text: str, parsed: str | None):
+    parser = XDSLParser(MLContext(), text)
+    for try_parse in (parser.try_parse_value_id, parser.try_parse_bare_id,
+                      parser.try_parse_string_literal):
+        if (span := try_parse()) is not None:
+            assert span.text == parsed
+            return
+    assert parsed is None
+
+
+@pytest.mark.parametrize("offset,line_col", [(0, (1, 0)), (2, (1, 2)),
+                                             (3, (2, 0)), (4, (3, 0)),
+                                             (5, (3, 1)), (7, (4, 1)),
+                                             (8, (-1, -1))])
+def test_get_line_col(offset: int, line_col: tuple[int, int]):
+    input = Input("ab\n\nc\nd", "<test>")
+    assert input.line_starts == [0, 3, 4, 6]
+    assert Span(offset, offset, input).get_line_col() == line_col
+
+
+@pytest.mark.parametrize("start,end,expected", [
+    (0, 1, (["ab"], 0, 1)),
+    (2, 2, (["ab"], 0, 1)),
+    (1, 4, (["ab", "", "c"], 0, 1)),
+    (4, 7, (["c", "d"], 4, 3)),
+    (6, 9, (["d"], 6, 4)),
+    (9, 9, None),
+])
+def test_get_lines_containing(start: int, end: int,
+                              expected: tuple[list[str], int, int] | None):
+    input = Input("ab\n\nc\nd", "<test>")
+    assert input.get_lines_containing(Span(start, end, input)) == expected
+
+
+def test_input_from_file(tmp_path: Path):
+    path = tmp_path / "input.xdsl"
+    path.write_bytes("builtin.module() {\r\n  // é\r\n}\r\n".encode())
+    with open(path) as file:
+        input = Input.from_file(file, str(path))
+    assert input.content == "builtin.module() {\n  // é\n}\n"
+    assert input.name == str(path)
+
+
+@pytest.mark.parametrize("content", ["", "builtin.module() {}"])
+def test_input_from_stream(content: str):
+    assert Input.from_file(StringIO(content), "<test>").content == content
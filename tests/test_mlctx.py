@@ -1,6 +1,6 @@
 import pytest
 
-from xdsl.ir import MLContext, ParametrizedAttribute
+from xdsl.ir import Dialect, MLContext, ParametrizedAttribute
 from xdsl.irdl import irdl_op_definition, irdl_attr_definition, Operation
 
 
@@ -49,3 +49,49 @@ def test_get_exceptions():
 
     with pytest.raises(Exception):
         _ = ctx.get_attr("dummy_attr2")
+
+
+@irdl_op_definition
+class LazyOp(Operation):
+    name = "lazy.op"
+
+
+@irdl_attr_definition
+class LazyAttr(ParametrizedAttribute):
+    name = "lazy_attr"
+
+
+def test_lazy_dialect_registration():
+    loaded: list[str] = []
+
+    def load_lazy() -> Dialect:
+        loaded.append("lazy")
+        return Dialect([LazyOp], [])
+
+    def load_other() -> Dialect:
+        loaded.append("other")
+        return Dialect([DummyOp], [LazyAttr])
+
+    ctx = MLContext()
+    ctx.register_lazy_dialect("other", load_other)
+    ctx.register_lazy_dialect("lazy", load_lazy)
+    assert loaded == []
+
+    # The dialect with the operation prefix is loaded first
+    assert ctx.get_op("lazy.op") == LazyOp
+    assert loaded == ["lazy"]
+
+    # Names without a dialect prefix load the dialects until they are found
+    assert ctx.get_attr("lazy_attr") == LazyAttr
+    assert loaded == ["lazy", "other"]
+
+    assert ctx.get_op("dummy") == DummyOp
+    assert ctx.get_optional_op("dummy2") is None
+    assert loaded == ["lazy", "other"]
+
+
+def test_lazy_dialect_registration_exception():
+    ctx = MLContext()
+    ctx.register_lazy_dialect("lazy", lambda: Dialect([LazyOp], []))
+    with pytest.raises(Exception):
+        ctx.register_lazy_dialect("lazy", lambda: Dialect([LazyOp], []))
@@ -0,0 +1,101 @@
+import os
+import sys
+from io import StringIO
+from pathlib import Path
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin, ModuleOp
+from xdsl.dialects.func import Func
+from xdsl.ir import MLContext, Operation
+from xdsl.module_cache import ModuleCache
+from xdsl.parser import XDSLParser
+from xdsl.printer import Printer
+
+
+def _context() -> MLContext:
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Arith)
+    ctx.register_dialect(Func)
+    return ctx
+
+
+def _program(value: int) -> str:
+    return f"""builtin.module() {{
+  %0 : !i32 = arith.constant() ["value" = {value} : !i32]
+}}
+"""
+
+
+def _print(op: Operation) -> str:
+    stream = StringIO()
+    Printer(stream=stream).print_op(op)
+    return stream.getvalue()
+
+
+def test_get_key():
+    assert ModuleCache.get_key("a", b"b") == ModuleCache.get_key(b"a", "b")
+    assert ModuleCache.get_key("ab", "") != ModuleCache.get_key("a", "b")
+
+
+def test_module_cache(tmp_path: Path):
+    ctx = _context()
+    cache = ModuleCache(str(tmp_path), 1 << 20)
+    module = XDSLParser(ctx, _program(0)).parse_module()
+    assert cache.load(ctx, "a") is None
+    cache.store("a", module)
+    loaded = cache.load(ctx, "a")
+    assert loaded is not None
+    assert _print(loaded) == _print(module)
+
+    # Invalid entries are ignored and removed
+    with open(tmp_path / "b.xdslbc", "wb") as file:
+        file.write(b"invalid")
+    assert cache.load(ctx, "b") is None
+    assert not os.path.exists(tmp_path / "b.xdslbc")
+
+
+def test_module_cache_invalid_body(tmp_path: Path):
+    ctx = _context()
+    cache = ModuleCache(str(tmp_path), 1 << 20)
+    program = """builtin.module() {
+  func.func() ["sym_name" = "f", "function_type" = !fun<[], []>, "sym_visibility" = "private"] {
+    func.return()
+  }
+}
+"""
+    cache.store("a", XDSLParser(ctx, program).parse_module())
+    with open(tmp_path / "a.xdslbc", "rb+") as file:
+        file.truncate(os.path.getsize(tmp_path / "a.xdslbc") - 1)
+
+    # Function bodies are decoded when the entry is loaded
+    assert cache.load(ctx, "a") is None
+    assert not os.path.exists(tmp_path / "a.xdslbc")
+
+
+def test_module_cache_deep_nesting(tmp_path: Path):
+    ctx = _context()
+    cache = ModuleCache(str(tmp_path), 1 << 20)
+    module = ModuleOp.from_region_or_ops([])
+    for _ in range(sys.getrecursionlimit()):
+        module = ModuleOp.from_region_or_ops([module])
+
+    # Modules exceeding the recursion limit when written are not stored
+    cache.store("a", module)
+    assert cache.load(ctx, "a") is None
+    assert not os.listdir(tmp_path)
+
+
+def test_module_cache_eviction(tmp_path: Path):
+    ctx = _context()
+    cache = ModuleCache(str(tmp_path), 1 << 20)
+    for idx, key in enumerate(["a", "b"]):
+        cache.store(key, XDSLParser(ctx, _program(idx)).parse_module())
+        os.utime(tmp_path / f"{key}.xdslbc", (idx, idx))
+    entry_size = os.path.getsize(tmp_path / "a.xdslbc")
+
+    # Loading "a" makes "b" the least recently used module
+    assert cache.load(ctx, "a") is not None
+    cache.max_size = 2 * entry_size
+    cache.store("c", XDSLParser(ctx, _program(2)).parse_module())
+    assert sorted(os.listdir(tmp_path)) == ["a.xdslbc", "c.xdslbc"]
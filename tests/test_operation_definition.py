@@ -1,9 +1,15 @@
 from __future__ import annotations
+
+from typing import Annotated
+
 import pytest
-from xdsl.dialects.builtin import IntAttr, StringAttr
+from xdsl.dialects.builtin import (DenseArrayBase, IndexType, IntAttr,
+                                   IntegerType, StringAttr, i32, i64)
 
-from xdsl.ir import Attribute, OpResult, Operation, Region
-from xdsl.irdl import (Operand, irdl_op_definition, OperandDef, ResultDef,
+from xdsl.ir import Attribute, Block, OpResult, Operation, Region
+from xdsl.irdl import (AnyOf, AttrSizedOperandSegments, OptOperand, OptOpAttr,
+                       SingleBlockRegion, VarOperand, VarOpResult, Operand,
+                       irdl_op_definition, OperandDef, ResultDef,
                        AttributeDef, AnyAttr, OpDef, RegionDef, OpAttr)
 from xdsl.utils.exceptions import PyRDLOpDefinitionError, VerifyException
 
@@ -32,6 +38,27 @@ def test_get_definition():
         regions=[("region", RegionDef())])
 
 
+def test_op_definition_is_slotted():
+    """Check that operation definitions do not carry an instance __dict__"""
+    op = OpDefTestOp.create()
+    assert not hasattr(op, "__dict__")
+    with pytest.raises(AttributeError):
+        op.undefined_field = 0  # type: ignore
+
+
+@irdl_op_definition
+class SuperCallTestOp(Operation):
+    name = "test.super_call"
+
+    def verify_(self) -> None:
+        return super().verify_()
+
+
+def test_op_definition_super_call():
+    """Check that zero-argument super() works in operation definitions"""
+    SuperCallTestOp.create().verify()
+
+
 class InvalidTypedFieldTestOp(Operation):
     name = "test.invalid_typed_field"
 
@@ -67,3 +94,174 @@ def test_attr_verify():
     with pytest.raises(VerifyException) as e:
         op.verify()
     assert e.value.args[0] == "!int<1> should be of base attribute string"
+
+
+@irdl_op_definition
+class CompiledVerifierOp(Operation):
+    name: str = "test.compiled_verifier"
+
+    lhs: Annotated[Operand, AnyOf([IntegerType, IndexType])]
+    args: Annotated[VarOperand, i32]
+    rhs: Annotated[Operand, IndexType]
+    res: Annotated[VarOpResult, IntegerType]
+    region: SingleBlockRegion
+    attr: OpAttr[IntAttr]
+    opt_attr: OptOpAttr[StringAttr]
+
+
+@irdl_op_definition
+class CompiledSegmentsVerifierOp(Operation):
+    name: str = "test.compiled_segments_verifier"
+
+    lhs: Annotated[VarOperand, i32]
+    rhs: Annotated[VarOperand, i64]
+
+    irdl_options = [AttrSizedOperandSegments()]
+
+
+def _check_compiled_verifier(op: Operation):
+    """Check that the compiled and generic verifiers agree."""
+    op_def = type(op).irdl_definition
+    assert op_def is not None
+    try:
+        op_def.verify_generic(op)
+    except Exception as generic_error:
+        with pytest.raises(type(generic_error)) as e:
+            op_def.verify(op)
+        assert str(e.value) == str(generic_error)
+    else:
+        op_def.verify(op)
+
+
+@pytest.mark.parametrize("operand_types, result_types, num_blocks, attrs", [
+    ([i32, IndexType()], [], 1, {"attr": IntAttr(0)}),
+    ([IndexType(), i32, i32, IndexType()], [i32, i64], 1, {
+        "attr": IntAttr(0),
+        "opt_attr": StringAttr("a")
+    }),
+    ([i32], [], 1, {"attr": IntAttr(0)}),
+    ([i32, i32], [], 1, {"attr": IntAttr(0)}),
+    ([i32, i64, IndexType()], [], 1, {"attr": IntAttr(0)}),
+    ([i32, IndexType()], [IndexType()], 1, {"attr": IntAttr(0)}),
+    ([i32, IndexType()], [], 2, {"attr": IntAttr(0)}),
+    ([i32, IndexType()], [], 1, {}),
+    ([i32, IndexType()], [], 1, {"attr": StringAttr("a")}),
+    ([i32, IndexType()], [], 1, {
+        "attr": IntAttr(0),
+        "opt_attr": IntAttr(0)
+    }),
+])
+def test_compiled_verifier(operand_types: list[Attribute],
+                           result_types: list[Attribute], num_blocks: int,
+                           attrs: dict[str, Attribute]):
+    operands = [
+        OpResult(typ, None, idx)  # type: ignore
+        for idx, typ in enumerate(operand_types)
+    ]
+    region = Region.from_block_list([Block() for _ in range(num_blocks)])
+    op = CompiledVerifierOp.create(operands=operands,
+                                   result_types=result_types,
+                                   attributes=attrs,
+                                   regions=[region])
+    _check_compiled_verifier(op)
+
+
+@pytest.mark.parametrize("operand_types, segments", [
+    ([i32, i64, i64], [1, 2]),
+    ([i32, i64, i64], [2, 1]),
+    ([i32, i64], [1, 2]),
+    ([i32, i64], [1]),
+    ([i32, i64], None),
+])
+def test_compiled_segments_verifier(operand_types: list[Attribute],
+                                    segments: list[int] | None):
+    operands = [
+        OpResult(typ, None, idx)  # type: ignore
+        for idx, typ in enumerate(operand_types)
+    ]
+    attrs: dict[str, Attribute] = {}
+    if segments is not None:
+        attrs["operand_segment_sizes"] = DenseArrayBase.from_list(
+            i32, segments)
+    op = CompiledSegmentsVerifierOp.create(operands=operands,
+                                           attributes=attrs)
+    _check_compiled_verifier(op)
+
+
+def test_accessors_around_variadic():
+    operands = [
+        OpResult(typ, None, idx)  # type: ignore
+        for idx, typ in enumerate([i32, i32, i32, IndexType()])
+    ]
+    op = CompiledVerifierOp.create(operands=operands,
+                                   result_types=[i32, i64],
+                                   regions=[Region()])
+    assert op.lhs is operands[0]
+    assert op.args == tuple(operands[1:3])
+    assert op.rhs is operands[3]
+    assert op.res == op.results
+    assert isinstance(op.region, Region)
+
+    op.operands = [operands[0], operands[3]]
+    assert op.args == ()
+    assert op.rhs is operands[3]
+
+
+@irdl_op_definition
+class OptOperandOp(Operation):
+    name: str = "test.opt_operand"
+
+    lhs: Operand
+    opt: OptOperand
+    rhs: Operand
+
+
+def test_optional_accessor():
+    operands = [
+        OpResult(i32, None, idx)  # type: ignore
+        for idx in range(3)
+    ]
+    op = OptOperandOp.create(operands=operands)
+    assert (op.lhs, op.opt, op.rhs) == tuple(operands)
+    op.operands = [operands[0], operands[2]]
+    assert (op.lhs, op.opt, op.rhs) == (operands[0], None, operands[2])
+
+
+def test_segment_accessors():
+    operands = [
+        OpResult(typ, None, idx)  # type: ignore
+        for idx, typ in enumerate([i32, i64, i64])
+    ]
+    op = CompiledSegmentsVerifierOp.create(
+        operands=operands,
+        attributes={
+            "operand_segment_sizes": DenseArrayBase.from_list(i32, [1, 2])
+        })
+    assert op.lhs == (operands[0], )
+    assert op.rhs == tuple(operands[1:])
+
+    # The offsets follow the segment sizes attribute
+    op.attributes["operand_segment_sizes"] = DenseArrayBase.from_list(
+        i32, [2, 1])
+    assert op.lhs == tuple(operands[:2])
+    assert op.rhs == (operands[2], )
+
+    del op.attributes["operand_segment_sizes"]
+    with pytest.raises(VerifyException):
+        op.lhs
+
+
+def test_segment_accessors_many_segment_sizes():
+    operands = [
+        OpResult(i32, None, idx)  # type: ignore
+        for idx in range(100)
+    ]
+    op = CompiledSegmentsVerifierOp.create(operands=operands)
+    # More segment sizes attributes than the cached offsets are used, and
+    # then used again after their offsets were evicted
+    for _ in range(2):
+        for num_lhs in range(len(operands) + 1):
+            op.attributes["operand_segment_sizes"] = DenseArrayBase.from_list(
+                i32, [num_lhs, len(operands) - num_lhs])
+            assert op.lhs == tuple(operands[:num_lhs])
+            assert op.rhs == tuple(operands[num_lhs:])
@@ -0,0 +1,117 @@
+from io import StringIO
+
+import pytest
+
+from xdsl.dialects.arith import Arith
+from xdsl.dialects.builtin import Builtin, ModuleOp
+from xdsl.dialects.cf import Cf
+from xdsl.dialects.func import Func
+from xdsl.ir import MLContext, Operation
+from xdsl.parallel_parser import parse_module_parallel
+from xdsl.parser import BaseParser, MLIRParser, XDSLParser
+from xdsl.printer import Printer
+from xdsl.utils.exceptions import ParseError
+
+
+def _context() -> MLContext:
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Arith)
+    ctx.register_dialect(Cf)
+    ctx.register_dialect(Func)
+    return ctx
+
+
+def _function(idx: int) -> str:
+    return f"""
+  func.func() ["sym_name" = "f{idx}", "function_type" = !fun<[!i32], [!i32]>, "sym_visibility" = "private"] {{
+  ^0(%a : !i32):
+    %b : !i32 = arith.addi(%a : !i32, %a : !i32)
+    cf.br(%b : !i32)(^1)
+  ^1(%c : !i32):
+    // A comment with a }} bracket
+    %d : !i32 = arith.constant() ["value" = {idx} : !i32]
+    func.return(%c : !i32)
+  }}"""
+
+
+def _program(num_functions: int, attributes: str = "") -> str:
+    functions = "".join(_function(idx) for idx in range(num_functions))
+    return f"builtin.module(){attributes} {{{functions}\n}}\n"
+
+
+def _print(op: Operation) -> str:
+    stream = StringIO()
+    Printer(stream=stream).print_op(op)
+    return stream.getvalue()
+
+
+def _block_spans(module: ModuleOp) -> list[tuple[int, int] | None]:
+    return [(block.declared_at.start, block.declared_at.end)
+            if block.declared_at is not None else None
+            for op in module.walk() for region in op.regions
+            for block in region.blocks]
+
+
+def _check_parallel_parse(program: str,
+                          parser_type: type[BaseParser] = XDSLParser):
+    ctx = _context()
+    expected = parser_type(ctx, program).parse_module()
+    module = parse_module_parallel(ctx, program, parser_type, num_workers=2)
+    assert module.is_structurally_equivalent(expected)
+    assert _print(module) == _print(expected)
+    assert _block_spans(module) == _block_spans(expected)
+    module.verify()
+
+
+@pytest.mark.parametrize("num_functions", [0, 1, 2, 13])
+def test_parse_module_parallel(num_functions: int):
+    _check_parallel_parse(_program(num_functions))
+
+
+def test_parse_module_parallel_attributes():
+    _check_parallel_parse(_program(4, ' ["sym_name" = "m"]'))
+
+
+def test_parse_module_parallel_brackets_in_strings():
+    # Brackets in strings and comments do not delimit top-level operations
+    program = _program(4).replace('"f1"', '"f}1"', 1).replace(
+        '"f2"', '"f{2"', 1)
+    _check_parallel_parse(program)
+
+
+def test_parse_module_parallel_mlir():
+    ctx = _context()
+    module = XDSLParser(ctx, _program(4)).parse_module()
+    stream = StringIO()
+    Printer(stream=stream, target=Printer.Target.MLIR).print_op(module)
+    _check_parallel_parse(stream.getvalue(), MLIRParser)
+
+
+def test_parse_module_parallel_top_level_values():
+    # Top-level values can be used by the following operations, so the
+    # module is parsed sequentially
+    program = _program(4).replace(
+        "{\n", '{\n  %x : !i32 = arith.constant() ["value" = 0 : !i32]\n',
+        1)
+    _check_parallel_parse(program)
+
+
+@pytest.mark.parametrize("program", [
+    _program(4).replace("arith.addi", "arith.unknown", 1),
+    _program(4).replace("^1(%c", "^2(%c", 1),
+    _program(4)[:-3],
+    "func.func() {}",
+],
+                         ids=[
+                             "unknown_op", "missing_block", "missing_end",
+                             "not_module"
+                         ])
+def test_parse_module_parallel_error(program: str):
+    ctx = _context()
+    with pytest.raises(ParseError) as expected:
+        XDSLParser(ctx, program).parse_module()
+    with pytest.raises(ParseError) as error:
+        parse_module_parallel(ctx, program, num_workers=2)
+    assert str(error.value) == str(expected.value)
+
@@ -3,12 +3,15 @@ from io import StringIO
 import pytest
 
 from xdsl.dialects.builtin import (IntAttr, DictionaryAttr, StringAttr,
-                                   ArrayAttr, Builtin, SymbolRefAttr)
+                                   ArrayAttr, Builtin, SymbolRefAttr,
+                                   DenseArrayBase, DenseIntOrFPElementsAttr,
+                                   f32, i32)
 from xdsl.ir import (MLContext, Attribute, Operation, Region,
                      ParametrizedAttribute)
 from xdsl.irdl import irdl_attr_definition, irdl_op_definition
 from xdsl.parser import XDSLParser, MLIRParser
 from xdsl.printer import Printer
+from xdsl.utils.exceptions import ParseError
 
 
 @pytest.mark.parametrize("input,expected", [("0, 1, 1", [0, 1, 1]),
@@ -121,3 +124,160 @@ def test_parse_multi_region_xdsl():
     op = parser.parse_op()
 
     assert len(op.regions) == 2
+
+
+def test_memoized_attribute_parsing():
+    """
+    Test that attributes are not parsed again at the same position, while
+    parsing the same operation.
+    """
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    parser = XDSLParser(ctx, '[!i32, "foo"] !i64')
+
+    attr = parser.try_parse_attribute()
+    end = parser.tokenizer.pos
+
+    parser.tokenizer.pos = 0
+    parser.tokenizer.history = None
+    parser.try_parse_builtin_attr = None  # type: ignore
+    assert parser.try_parse_attribute() is attr
+    assert parser.tokenizer.pos == end
+
+
+@pytest.mark.parametrize("memoize", [True, False])
+def test_error_after_memoized_attribute(memoize: bool):
+    """
+    Test that an error following a memoized attribute reports the same
+    backtracking history as without memoization.
+    """
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    parser = XDSLParser(ctx, '!i32 foo')
+
+    with parser.tokenizer.backtracking("first alternative"):
+        parser.try_parse_attribute()
+        parser.raise_error("Expected bar")
+    assert parser.tokenizer.history is not None
+
+    if not memoize:
+        parser.memo.clear()
+    assert parser.try_parse_attribute() == i32
+    with pytest.raises(ParseError) as e:
+        parser.parse_characters("bar", "Expected bar")
+    assert e.value.history is None
+
+
+def test_lazy_backtracking_history():
+    """
+    Test that the errors of failed backtracking attempts are only formatted
+    when they are accessed.
+    """
+    parser = XDSLParser(MLContext(), "foo")
+    with parser.tokenizer.backtracking("assertion"):
+        parser.tokenizer.next_token()
+        raise AssertionError()
+
+    history = parser.tokenizer.history
+    assert history is not None
+    assert not isinstance(history._error, ParseError)  # type: ignore
+    assert "Generic assertion failure" in history.error.msg
+    assert history.error is history.error
+
+
+@pytest.mark.parametrize("parser_type,module", [
+    (XDSLParser, """
+    builtin.module() ["sym_name" = "m"] {
+      "test.multi_region" () {} {}
+      "test.multi_region" () {} {}
+    }
+    """),
+    (MLIRParser, """
+    "builtin.module"() ({
+      "test.multi_region" () ({}, {}) : () -> ()
+      "test.multi_region" () ({}, {}) : () -> ()
+    }) {"sym_name" = "m"} : () -> ()
+    """),
+])
+def test_parse_module_ops(parser_type: type[XDSLParser] | type[MLIRParser],
+                          module: str):
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_op(MultiRegionOp)
+    parser = parser_type(ctx, module)
+
+    ops = parser.parse_module_ops()
+    first = next(ops)
+    # The operations are yielded as soon as they are parsed
+    assert parser.tokenizer.pos <= module.rindex('"test.multi_region"')
+    assert isinstance(first, MultiRegionOp)
+    assert first.parent is None
+
+    rest = list(ops)
+    assert len(rest) == 1
+    assert isinstance(rest[0], MultiRegionOp)
+    assert parser.tokenizer.is_eof()
+
+
+def test_parse_module_ops_not_module():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_op(MultiRegionOp)
+    parser = XDSLParser(ctx, '"test.multi_region" () {} {}')
+    with pytest.raises(ParseError):
+        next(parser.parse_module_ops())
+
+
+@pytest.mark.parametrize("literal, type, expected", [
+    ("5", "tensor<i32>", [5]),
+    ("[1, -2, +3]", "tensor<3xi32>", [1, -2, 3]),
+    ("[[1, 2], [3, 4]]", "tensor<2x2xi32>", [1, 2, 3, 4]),
+    ("[[1, 2,], [3, 4],]", "tensor<2x2xi32>", [1, 2, 3, 4]),
+    ("[1.5, 2, -2.5e-1]", "tensor<3xf32>", [1.5, 2.0, -0.25]),
+    ("[0.0, -0.0]", "tensor<2xf64>", [0.0, -0.0]),
+    # Literals that are not only numbers are parsed one at a time
+    ("[1, // comment\n 2]", "tensor<2xi32>", [1, 2]),
+    ('"0x0100000002000000"', "tensor<2xi32>", [1, 2]),
+    ('"0xFFFFFFFF"', "tensor<4xi32>", [-1]),
+    ('"0xFF80"', "tensor<2xui8>", [255, 128]),
+    ('"0x0100000000000000"', "tensor<1xindex>", [1]),
+    ('"0x0000803F000000C0"', "tensor<2xf32>", [1.0, -2.0]),
+    ('"0x003C"', "tensor<1xf16>", [1.0]),
+])
+def test_parse_dense_attr(literal: str, type: str, expected: list[int]
+                          | list[float]):
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    attr = MLIRParser(ctx, f"dense<{literal}> : {type}").parse_attribute()
+
+    assert isinstance(attr, DenseIntOrFPElementsAttr)
+    assert attr == DenseIntOrFPElementsAttr.from_list(attr.type, expected)
+
+
+@pytest.mark.parametrize("literal, type", [
+    ("[1 2]", "tensor<2xi32>"),
+    ("[1, 2", "tensor<2xi32>"),
+    ("[,]", "tensor<1xi32>"),
+    ('"0x010000"', "tensor<1xi32>"),
+    ('"0x0100000002000000"', "tensor<3xi32>"),
+    ('"0xZZ"', "tensor<1xi8>"),
+    ('"1234"', "tensor<1xi8>"),
+    ('"0x01"', "tensor<1xi1>"),
+])
+def test_parse_dense_attr_error(literal: str, type: str):
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    with pytest.raises(ParseError):
+        MLIRParser(ctx, f"dense<{literal}> : {type}").parse_attribute()
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("array<i32>", DenseArrayBase.from_list(i32, [])),
+    ("array<i32: 1, -2, 3>", DenseArrayBase.from_list(i32, [1, -2, 3])),
+    ("array<f32: 1.5, -2.0>", DenseArrayBase.from_list(f32, [1.5, -2.0])),
+    ("array<i32: 1, // comment\n 2>", DenseArrayBase.from_list(i32, [1, 2])),
+])
+def test_parse_array_attr(text: str, expected: DenseArrayBase):
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    assert MLIRParser(ctx, text).parse_attribute() == expected
@@ -5,9 +5,9 @@ from io import StringIO
 from typing import List, Annotated
 
 from xdsl.dialects.arith import Arith, Addi, Constant
-from xdsl.dialects.builtin import Builtin, IntAttr, ModuleOp, IntegerType, UnitAttr, i32
+from xdsl.dialects.builtin import ArrayAttr, Builtin, IntAttr, ModuleOp, IntegerType, StringAttr, UnitAttr, i32
 from xdsl.dialects.func import Func
-from xdsl.ir import Attribute, MLContext, OpResult, ParametrizedAttribute, Block
+from xdsl.ir import Attribute, MLContext, MLIRType, OpResult, ParametrizedAttribute, Block
 from xdsl.irdl import (OptOpAttr, ParameterDef, irdl_attr_definition,
                        irdl_op_definition, Operation, Operand)
 from xdsl.parser import Parser, BaseParser, XDSLParser
@@ -682,3 +682,104 @@ def test_dictionary_attr():
     parsed = parser.parse_op()
 
     assert_print_op(parsed, prog, None)
+
+
+def test_print_buffered():
+    """Test that operations are written to the stream in large chunks."""
+
+    class CountingStream(StringIO):
+        num_writes: int = 0
+
+        def write(self, s: str) -> int:
+            self.num_writes += 1
+            return super().write(s)
+
+    lit = Constant.from_int_and_width(42, 32)
+    module = ModuleOp.from_region_or_ops(
+        [lit, *(Addi.get(lit, lit) for _ in range(10))])
+
+    stream = CountingStream()
+    printer = Printer(stream=stream)
+    printer.print_op(module)
+    assert stream.num_writes == 1
+
+    # Other fragments are written as they are printed
+    printer.print(" ", i32, "\n")
+
+    expected = StringIO()
+    Printer(stream=expected).print_op(module)
+    assert stream.getvalue() == expected.getvalue() + " !i32\n"
+    assert printer._current_column == 0  # type: ignore
+
+
+def test_print_type_cached():
+    """Test that each type is rendered once by a printer."""
+
+    num_renders = 0
+
+    @irdl_attr_definition
+    class CountingAttr(ParametrizedAttribute, MLIRType):
+        name = "counting"
+
+        def print_parameters(self, printer: Printer) -> None:
+            nonlocal num_renders
+            num_renders += 1
+            printer.print("<", i32, ">")
+
+    attr = CountingAttr()
+    stream = StringIO()
+    printer = Printer(stream=stream)
+    printer.print(attr, " ", attr, " ", ArrayAttr([attr, attr]))
+    assert stream.getvalue() == ("!counting<!i32> !counting<!i32> "
+                                 "[!counting<!i32>, !counting<!i32>]")
+    assert num_renders == 1
+
+    # Attributes are rendered again for each target
+    stream = StringIO()
+    Printer(stream=stream, target=Printer.Target.MLIR).print(attr)
+    assert stream.getvalue() == "!counting<i32>"
+    assert num_renders == 2
+
+
+def test_print_attribute_not_cached():
+    """Test that attributes other than types are rendered each time."""
+
+    num_renders = 0
+
+    @irdl_attr_definition
+    class CountingAttr(ParametrizedAttribute):
+        name = "counting"
+
+        def print_parameters(self, printer: Printer) -> None:
+            nonlocal num_renders
+            num_renders += 1
+            printer.print("<", i32, ">")
+
+    attr = CountingAttr()
+    stream = StringIO()
+    Printer(stream=stream).print(attr, " ", attr)
+    assert stream.getvalue() == "!counting<!i32> !counting<!i32>"
+    assert num_renders == 2
+
+
+def test_printer_subclass_overrides():
+    """Test that the methods overridden by a printer subclass are used."""
+
+    class UpperCasePrinter(Printer):
+
+        def print_string(self, text: str) -> None:
+            super().print_string(text.upper())
+
+        def _print_integer_type(self, attribute: IntegerType) -> None:
+            self.print_string("int")
+            self.print_string(str(attribute.width.data))
+
+    stream = StringIO()
+    UpperCasePrinter(stream=stream).print("abc ", i32, " ",
+                                          StringAttr("def"))
+    assert stream.getvalue() == 'ABC INT32 "DEF"'
+
+    # Other printers are not affected
+    stream = StringIO()
+    Printer(stream=stream).print("abc ", i32)
+    assert stream.getvalue() == "abc !i32"
@@ -27,3 +27,42 @@ def test_main():
     assert andi_op.results[0].uses == set()
 
     print("Done")
+
+
+def test_replace_operand_reuses_use():
+    ctx = MLContext()
+    ctx.register_dialect(Builtin)
+    ctx.register_dialect(Arith)
+
+    parser = Parser(ctx, test_prog)
+    module = parser.parse_op()
+    assert isinstance(module, ModuleOp)
+    constant_op = module.ops[0]
+    andi_op = module.ops[1]
+
+    new_constant = constant_op.clone()
+    uses_before = {use.index: use for use in constant_op.results[0].uses}
+
+    # The use of the replaced operand is moved to the new value
+    andi_op.replace_operand(1, new_constant.results[0])
+    assert all(use is uses_before[use.index]
+               for use in new_constant.results[0].uses)
+    assert all(use is uses_before[use.index]
+               for use in constant_op.results[0].uses)
+    assert constant_op.results[0].uses == {Use(andi_op, 0)}
+    assert new_constant.results[0].uses == {Use(andi_op, 1)}
+    assert Use(andi_op, 1) not in constant_op.results[0].uses
+
+    constant_op.results[0].replace_by(new_constant.results[0])
+    assert len(constant_op.results[0].uses) == 0
+    assert new_constant.results[0].uses == {Use(andi_op, 0), Use(andi_op, 1)}
+    assert andi_op.operands == (new_constant.results[0],
+                                new_constant.results[0])
+    assert all(use is uses_before[use.index]
+               for use in new_constant.results[0].uses)
+
+    andi_op.operands = [constant_op.results[0]]
+    assert constant_op.results[0].uses == {Use(andi_op, 0)}
+    assert len(new_constant.results[0].uses) == 0
+    assert [use.value for use in constant_op.results[0].uses
+            ] == [constant_op.results[0]]
@@ -0,0 +1,64 @@
+import pytest
+
+from xdsl.dialects.arith import Addi, Constant
+from xdsl.dialects.builtin import ModuleOp, i32, i64
+from xdsl.dialects.func import FuncOp, Return
+from xdsl.ir import Attribute, Block, Region
+from xdsl.utils.exceptions import VerifyException
+from xdsl.verifier import ParallelVerifier, verify_parallel
+
+
+def _function(name: str, arg_type: Attribute = i32) -> FuncOp:
+    block = Block.from_arg_types([arg_type])
+    add = Addi.get(block.args[0], block.args[0])
+    block.add_ops([add, Return.get(add)])
+    return FuncOp.from_region(name, [i32], [i32],
+                              Region.from_block_list([block]))
+
+
+def _module(invalid: list[int], num_functions: int = 16) -> ModuleOp:
+    functions = [
+        _function(f"f{i}", i64 if i in invalid else i32)
+        for i in range(num_functions)
+    ]
+    return ModuleOp.from_region_or_ops(
+        [Constant.from_int_and_width(0, i32), *functions])
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 4])
+def test_verify_parallel(num_workers: int):
+    verify_parallel(_module([]), num_workers)
+
+
+@pytest.mark.parametrize("num_workers", [1, 2, 4])
+def test_verify_parallel_error(num_workers: int):
+    module = _module([3, 11])
+    with pytest.raises(VerifyException) as serial_error:
+        module.verify()
+    with pytest.raises(VerifyException) as parallel_error:
+        verify_parallel(module, num_workers)
+    assert parallel_error.value.args == serial_error.value.args
+
+
+def test_verify_parallel_reports_first_error():
+    # The first error in program order is raised, even if it is not in a
+    # function
+    module = _module([5])
+    lhs = Constant.from_int_and_width(0, i32)
+    rhs = Constant.from_int_and_width(0, i64)
+    module.body.blocks[0].insert_op(Addi.get(lhs, rhs), 0)
+    module.body.blocks[0].insert_op(rhs, 0)
+    module.body.blocks[0].insert_op(lhs, 0)
+    with pytest.raises(VerifyException,
+                       match="expect all input and result types"):
+        verify_parallel(module, 2)
+
+
+def test_parallel_verifier_sees_modifications():
+    # A verifier is reused across verifications of a modified module
+    verifier = ParallelVerifier(2)
+    module = _module([])
+    verifier.verify(module)
+    module.body.blocks[0].add_op(_function("invalid", i64))
+    with pytest.raises(VerifyException):
+        verifier.verify(module)
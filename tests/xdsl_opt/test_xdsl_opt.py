@@ -10,8 +10,9 @@ from xdsl.xdsl_opt_main import xDSLOptMain
 
 def test_opt():
     opt = xDSLOptMain(args=[])
-    assert list(opt.available_frontends.keys()) == ['xdsl', 'mlir']
+    assert list(opt.available_frontends.keys()) == ['xdsl', 'mlir', 'xdslbc']
     assert list(opt.available_targets.keys()) == ['xdsl', 'irdl', 'mlir']
+    assert list(opt.available_binary_targets.keys()) == ['bytecode']
     assert list(opt.available_passes.keys()) == [
         'lower-mpi', 'convert-stencil-to-ll-mlir', 'convert-stencil-to-gpu'
     ]
@@ -104,3 +105,121 @@ def test_operation_deletion():
         expected = file.read()
 
     assert f.getvalue().strip() == expected.strip()
+
+
+@pytest.mark.parametrize("args", [['--parallel-verify'],
+                                  ['--parallel-verify', '2']])
+def test_parallel_verify(args):
+    filename = 'tests/xdsl_opt/constant_program.xdsl'
+    opt = xDSLOptMain(args=[filename, *args])
+
+    f = StringIO("")
+    with redirect_stdout(f):
+        opt.run()
+    with open(filename, 'r') as file:
+        expected = file.read()
+
+    assert f.getvalue().strip() == expected.strip()
+
+
+@pytest.mark.parametrize("args", [['--parallel-parse'],
+                                  ['--parallel-parse', '2']])
+def test_parallel_parse(args):
+    filename = 'tests/xdsl_opt/constant_program.xdsl'
+    opt = xDSLOptMain(args=[filename, *args])
+
+    f = StringIO("")
+    with redirect_stdout(f):
+        opt.run()
+    with open(filename, 'r') as file:
+        expected = file.read()
+
+    assert f.getvalue().strip() == expected.strip()
+
+
+def test_bytecode(tmp_path):
+    filename = 'tests/xdsl_opt/constant_program.xdsl'
+    filename_bytecode = str(tmp_path / 'constant_program.xdslbc')
+
+    opt = xDSLOptMain(args=[filename, '-t', 'bytecode', '-o',
+                            filename_bytecode])
+    opt.run()
+    opt = xDSLOptMain(args=[filename_bytecode])
+
+    f = StringIO("")
+    with redirect_stdout(f):
+        opt.run()
+    with open(filename, 'r') as file:
+        expected = file.read()
+
+    assert f.getvalue().strip() == expected.strip()
+
+
+def test_cache(tmp_path):
+    filename_in = 'tests/xdsl_opt/constant_program.xdsl'
+    filename_out = 'tests/xdsl_opt/empty_program.xdsl'
+    cache_dir = str(tmp_path / 'cache')
+    applied_passes: list[str] = []
+
+    class xDSLOptMainPass(xDSLOptMain):
+
+        def register_all_passes(self):
+
+            def remove_constant(ctx: MLContext, module: ModuleOp):
+                applied_passes.append('remove-constant')
+                module.ops[0].detach()
+
+            self.available_passes['remove-constant'] = remove_constant
+
+    def run(*args: str) -> str:
+        opt = xDSLOptMainPass(
+            args=[filename_in, '--cache-dir', cache_dir, *args])
+        f = StringIO("")
+        with redirect_stdout(f):
+            opt.run()
+        return f.getvalue().strip()
+
+    with open(filename_in, 'r') as file:
+        expected_in = file.read().strip()
+    with open(filename_out, 'r') as file:
+        expected_out = file.read().strip()
+
+    # The parsed module, and the module after the pass, are cached
+    assert run('-p', 'remove-constant') == expected_out
+    assert applied_passes == ['remove-constant']
+    assert len(list((tmp_path / 'cache').iterdir())) == 2
+
+    assert run('-p', 'remove-constant') == expected_out
+    assert run() == expected_in
+    assert applied_passes == ['remove-constant']
+
+    # The least recently used modules are removed when the cache is full
+    assert run('--disable-verify', '--cache-size', '0') == expected_in
+    assert list((tmp_path / 'cache').iterdir()) == []
+
+
+@pytest.mark.parametrize("filename, args", [
+    ('tests/filecheck/dialects/pdl/mlir-tests/attribute_with_dict.mlir',
+     ['-t', 'mlir', '--allow-unregistered-ops']),
+    ('tests/filecheck/dialects/builtin/attrs.xdsl', []),
+    ('tests/filecheck/mlir-conversion/builtin_attrs.mlir', ['-t', 'mlir']),
+    ('tests/filecheck/arith_ops.xdsl', []),
+    ('tests/filecheck/cf_ops.mlir', ['-t', 'mlir']),
+    ('tests/filecheck/dialects/memref/memref_ops.xdsl', []),
+    ('tests/filecheck/scf_ops.xdsl', []),
+])
+def test_cache_matches_uncached(tmp_path, filename: str, args: list[str]):
+    cache_dir = str(tmp_path / 'cache')
+
+    def run(*cache_args: str) -> str:
+        opt = xDSLOptMain(args=[filename, *args, *cache_args])
+        f = StringIO("")
+        with redirect_stdout(f):
+            opt.run()
+        return f.getvalue()
+
+    expected = run()
+    # The first run stores the module, and the second one loads it
+    assert run('--cache-dir', cache_dir) == expected
+    assert len(list((tmp_path / 'cache').iterdir())) == 1
+    assert run('--cache-dir', cache_dir) == expected
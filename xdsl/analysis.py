@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from abc import ABC, abstractmethod
+from typing import TypeVar
+
+from xdsl.ir import Region
+
+
+class RegionAnalysis(ABC):
+    """
+    An analysis of the control flow of a region.
+    Region analyses only depend on the blocks of the region and on their
+    terminators, so they can be cached until these change.
+    """
+
+    region: Region
+    """The analyzed region."""
+
+    @abstractmethod
+    def __init__(self, region: Region):
+        ...
+
+
+_RegionAnalysisT = TypeVar("_RegionAnalysisT", bound=RegionAnalysis)
+
+
+class AnalysisManager:
+    """
+    Cache region analyses, and recompute them when the blocks of the
+    analyzed region or their terminators change.
+    Modifications of the successors of an operation in place are not
+    tracked, and require an explicit call to `invalidate`.
+    """
+
+    _analyses: dict[tuple[type[RegionAnalysis], Region],
+                    tuple[int, RegionAnalysis]]
+    """The cached analyses, with the region version they were computed at."""
+
+    def __init__(self):
+        self._analyses = {}
+
+    def get(self, analysis: type[_RegionAnalysisT],
+            region: Region) -> _RegionAnalysisT:
+        """Get an analysis of a region, and compute it if necessary."""
+        key = (analysis, region)
+        cached = self._analyses.get(key)
+        if cached is not None and cached[0] == region.cfg_version:
+            return cached[1]  # type: ignore
+        result = analysis(region)
+        self._analyses[key] = (region.cfg_version, result)
+        return result
+
+    def is_cached(self, analysis: type[RegionAnalysis],
+                  region: Region) -> bool:
+        """Check if an up to date analysis of a region is cached."""
+        cached = self._analyses.get((analysis, region))
+        return cached is not None and cached[0] == region.cfg_version
+
+    def invalidate(self, region: Region | None = None) -> None:
+        """Invalidate the analyses of a region, or all analyses."""
+        if region is None:
+            self._analyses.clear()
+            return
+        for key in [key for key in self._analyses if key[1] is region]:
+            del self._analyses[key]
@@ -0,0 +1,763 @@
+"""
+A compact binary format for modules, whose functions are loaded lazily.
+
+A bytecode file starts with a header, followed by the tables of the strings,
+operation names and attributes used in the module, the body of the module,
+and the bodies of its functions:
+
+    file       ::= MAGIC version strings op-names attributes module bodies
+    strings    ::= count (length utf-8-bytes)*
+    op-names   ::= count string*
+    attributes ::= count attribute*
+    module     ::= attr-dict count top-op*
+    bodies     ::= region*
+
+Integers are unsigned LEB128 varints, and strings, operation names and
+attributes are referred to by their index in their table.
+
+Attributes are stored structurally, so that they are read back exactly as
+they were written. Each attribute only refers to the attributes stored
+before it:
+
+    attribute  ::= PARAMETRIZED string count attribute*
+                 | INT signed-integer
+                 | STRING string
+                 | FLOAT float64
+                 | ARRAY count attribute*
+                 | DICTIONARY count (string attribute)*
+                 | SIGNEDNESS integer
+                 | DATA string string
+                 | DENSE-INT attribute attribute count signed-integer*
+                 | DENSE-FLOAT attribute attribute count float64*
+
+Parametrized attributes are stored with their name and their parameters.
+Other data attributes are stored with their name and their parameter in the
+xDSL format, and are only written if they are parsed back to the same
+attribute. Dense elements whose elements are all integers or all floats of
+the same type are stored with their type, their element type and their
+packed values. Signed integers are zigzag-encoded varints, and floats are
+8-byte little-endian doubles.
+
+    top-op     ::= 0 op-header region* | 1 op-header offset
+    op-header  ::= op-name results operands attr-dict successors count
+    results    ::= count (attribute name)*
+    operands   ::= count value*
+    attr-dict  ::= count (string attribute)*
+    successors ::= count block*
+    region     ::= count (block args count op*)*
+    args       ::= count (attribute name)*
+    op         ::= op-header region*
+
+Values are numbered in the order they are read: the arguments of a block
+before its operations, and the values defined in the regions of an
+operation before its results. They may be used before they are defined.
+Blocks are numbered in the order they are defined or first used as a
+successor. The name of a value is the index of a string plus one, or 0 for
+values without names.
+
+The regions of top-level operations that do not use values defined outside
+of them, such as functions, are stored at an offset of the bodies section,
+with their own numbering of values and blocks. They are only decoded when
+the blocks of one of their regions are first accessed.
+"""
+
+from __future__ import annotations
+
+import mmap
+import struct
+from dataclasses import dataclass
+from io import StringIO
+from math import copysign
+from typing import IO, Any, Sequence, cast
+
+from xdsl.dialects.builtin import (AnyFloatAttr, ArrayAttr, DenseArrayBase,
+                                   DenseIntOrFPElementsAttr, DictionaryAttr,
+                                   FloatAttr, FloatData, IntAttr, IntegerAttr,
+                                   IntegerType, ModuleOp, NoneAttr,
+                                   Signedness, SignednessAttr, StringAttr,
+                                   UnregisteredOp)
+from xdsl.ir import (Attribute, Block, Data, MLContext, Operation,
+                     ParametrizedAttribute, Region, SSAValue)
+from xdsl.parser import XDSLParser
+from xdsl.printer import Printer
+from xdsl.utils.exceptions import BytecodeError
+
+MAGIC = b"xDSLbc"
+"""The first bytes of bytecode files."""
+
+VERSION = 2
+"""The version of the format, incremented on incompatible changes."""
+
+_INLINE = 0
+"""The kind of top-level operations whose regions follow their header."""
+
+_LAZY = 1
+"""The kind of top-level operations whose regions are loaded lazily."""
+
+# The kinds of attributes in the attribute table
+_PARAMETRIZED = 0
+_INT = 1
+_STRING = 2
+_FLOAT = 3
+_ARRAY = 4
+_DICTIONARY = 5
+_SIGNEDNESS = 6
+_DATA = 7
+_DENSE_INT = 8
+_DENSE_FLOAT = 9
+
+_PARAMETRIZED_BUILTINS: dict[str, type[ParametrizedAttribute]] = {
+    DenseArrayBase.name: DenseArrayBase,
+}
+"""The parametrized attributes whose name is also the name of a data
+attribute."""
+
+_float64 = struct.Struct("<d")
+
+
+class _UndefinedValue(Exception):
+    """Raised when an operand is not defined in the module."""
+
+
+def _write_varint(output: bytearray, value: int) -> None:
+    while value >= 0x80:
+        output.append((value & 0x7f) | 0x80)
+        value >>= 7
+    output.append(value)
+
+
+def _number_region_values(op: Operation, values: dict[SSAValue,
+                                                      int]) -> None:
+    """
+    Number the values defined in the regions of an operation, in the order
+    they are read.
+    """
+    for region in op.regions:
+        for block in region.blocks:
+            for arg in block.args:
+                values[arg] = len(values)
+            for nested_op in block.ops:
+                _number_region_values(nested_op, values)
+                for result in nested_op.results:
+                    values[result] = len(values)
+
+
+class _BytecodeWriter:
+    strings: dict[str, int]
+    op_names: dict[int, int]
+    """The index of the operation names, by the index of their string."""
+    attributes: dict[bytes, int]
+    """The index of the attributes, by their encoding."""
+    attribute_table: bytearray
+    """The encoding of the attributes, in the order of their index."""
+    attribute_ids: dict[int, int]
+    """The index of the attributes already written, by object identity."""
+    written_attributes: list[Attribute]
+    """The attributes already written, kept alive so ids are not reused."""
+
+    def __init__(self):
+        self.strings = {}
+        self.op_names = {}
+        self.attributes = {}
+        self.attribute_table = bytearray()
+        self.attribute_ids = {}
+        self.written_attributes = []
+
+    def string(self, string: str) -> int:
+        return self.strings.setdefault(string, len(self.strings))
+
+    def attribute(self, attribute: Attribute) -> int:
+        if (idx := self.attribute_ids.get(id(attribute))) is not None:
+            return idx
+        entry = bytearray()
+        if type(attribute) is DenseIntOrFPElementsAttr and self.write_dense(
+                entry, attribute):
+            pass
+        elif isinstance(attribute, ParametrizedAttribute):
+            params = [self.attribute(param) for param in attribute.parameters]
+            entry.append(_PARAMETRIZED)
+            _write_varint(entry, self.string(attribute.name))
+            _write_varint(entry, len(params))
+            for param in params:
+                _write_varint(entry, param)
+        else:
+            self.write_data(entry, attribute)
+        key = bytes(entry)
+        if (idx := self.attributes.get(key)) is None:
+            idx = self.attributes[key] = len(self.attributes)
+            self.attribute_table += entry
+        self.attribute_ids[id(attribute)] = idx
+        self.written_attributes.append(attribute)
+        return idx
+
+    def write_dense(self, output: bytearray,
+                    attribute: DenseIntOrFPElementsAttr) -> bool:
+        """
+        Write dense elements with packed values, if their elements are all
+        integers or all floats of the same type. Return whether they were
+        written.
+        """
+        elements = attribute.data.data
+        if type(attribute.data) is not ArrayAttr or not elements:
+            return False
+        element_type = elements[0].parameters[1]
+        if all(type(element) is IntegerAttr
+               and element.parameters[1] == element_type
+               for element in elements):
+            output.append(_DENSE_INT)
+            self.write_dense_header(output, attribute, element_type)
+            for element in elements:
+                value = cast(IntegerAttr[IntegerType], element).value.data
+                _write_varint(output,
+                              value * 2 if value >= 0 else -value * 2 - 1)
+            return True
+        if all(type(element) is FloatAttr
+               and element.parameters[1] == element_type
+               and type(element.value.data) is float
+               for element in elements):
+            output.append(_DENSE_FLOAT)
+            self.write_dense_header(output, attribute, element_type)
+            output += struct.pack(
+                f"<{len(elements)}d",
+                *(cast(AnyFloatAttr, element).value.data
+                  for element in elements))
+            return True
+        return False
+
+    def write_dense_header(self, output: bytearray,
+                           attribute: DenseIntOrFPElementsAttr,
+                           element_type: Attribute) -> None:
+        _write_varint(output, self.attribute(attribute.type))
+        _write_varint(output, self.attribute(element_type))
+        _write_varint(output, len(attribute.data.data))
+
+    def write_data(self, output: bytearray, attribute: Attribute) -> None:
+        """Write a data attribute, after the attributes it refers to."""
+        if type(attribute) is IntAttr:
+            value = attribute.data
+            output.append(_INT)
+            _write_varint(output, value * 2 if value >= 0 else -value * 2 - 1)
+        elif type(attribute) is StringAttr:
+            output.append(_STRING)
+            _write_varint(output, self.string(attribute.data))
+        elif type(attribute) is FloatData:
+            output.append(_FLOAT)
+            output += _float64.pack(attribute.data)
+        elif type(attribute) is ArrayAttr:
+            elements = cast(ArrayAttr[Attribute], attribute).data
+            indices = [self.attribute(element) for element in elements]
+            output.append(_ARRAY)
+            _write_varint(output, len(indices))
+            for idx in indices:
+                _write_varint(output, idx)
+        elif type(attribute) is DictionaryAttr:
+            entries = [(self.string(name), self.attribute(value))
+                       for name, value in attribute.data.items()]
+            output.append(_DICTIONARY)
+            _write_varint(output, len(entries))
+            for name, idx in entries:
+                _write_varint(output, name)
+                _write_varint(output, idx)
+        elif type(attribute) is SignednessAttr:
+            output.append(_SIGNEDNESS)
+            _write_varint(output, attribute.data.value)
+        elif isinstance(attribute, Data):
+            output.append(_DATA)
+            _write_varint(output, self.string(attribute.name))
+            _write_varint(
+                output,
+                self.string(_print_parameter(cast(Data[Any], attribute))))
+        else:
+            raise BytecodeError(f"Attribute {attribute} cannot be stored in "
+                                "bytecode")
+
+    def write_values(self, output: bytearray,
+                     values: Sequence[SSAValue]) -> None:
+        _write_varint(output, len(values))
+        for value in values:
+            name = value.name
+            _write_varint(output, self.attribute(value.typ))
+            _write_varint(output, 0 if name is None else self.string(name) + 1)
+
+    def write_attr_dict(self, output: bytearray,
+                        attributes: dict[str, Attribute]) -> None:
+        _write_varint(output, len(attributes))
+        for name, attribute in attributes.items():
+            _write_varint(output, self.string(name))
+            _write_varint(output, self.attribute(attribute))
+
+    def write_op_header(self, output: bytearray, op: Operation,
+                        values: dict[SSAValue, int],
+                        blocks: dict[Block, int]) -> None:
+        """Write an operation, except for its regions."""
+        attributes = op.attributes
+        if isinstance(op, UnregisteredOp):
+            name = op.op_name.data
+            attributes = {
+                attr_name: attribute
+                for attr_name, attribute in attributes.items()
+                if attr_name != "op_name__"
+            }
+        else:
+            name = op.name
+        _write_varint(
+            output,
+            self.op_names.setdefault(self.string(name), len(self.op_names)))
+        self.write_values(output, op.results)
+        _write_varint(output, len(op.operands))
+        for operand in op.operands:
+            if (value := values.get(operand)) is None:
+                raise _UndefinedValue()
+            _write_varint(output, value)
+        self.write_attr_dict(output, attributes)
+        _write_varint(output, len(op.successors))
+        for successor in op.successors:
+            _write_varint(output, blocks.setdefault(successor, len(blocks)))
+        _write_varint(output, len(op.regions))
+
+    def write_regions(self, output: bytearray, op: Operation,
+                      values: dict[SSAValue, int],
+                      blocks: dict[Block, int]) -> None:
+        """
+        Write the regions of an operation, whose values are already
+        numbered.
+        """
+        for region in op.regions:
+            _write_varint(output, len(region.blocks))
+            for block in region.blocks:
+                _write_varint(output, blocks.setdefault(block, len(blocks)))
+                self.write_values(output, block.args)
+                _write_varint(output, len(block.ops))
+                for nested_op in block.ops:
+                    self.write_op_header(output, nested_op, values, blocks)
+                    self.write_regions(output, nested_op, values, blocks)
+
+    def write_module(self, module: ModuleOp) -> tuple[bytearray, bytearray]:
+        """Write the body of a module, and the bodies of its functions."""
+        output = bytearray()
+        bodies = bytearray()
+        lazy_values: dict[Operation, dict[SSAValue, int]] = {}
+        for op in module.ops:
+            if not op.regions:
+                continue
+            op_values: dict[SSAValue, int] = {}
+            _number_region_values(op, op_values)
+            # Regions using values defined outside cannot be loaded on their
+            # own
+            if all(operand in op_values for nested_op in op.walk()
+                   if nested_op is not op for operand in nested_op.operands):
+                lazy_values[op] = op_values
+
+        values: dict[SSAValue, int] = {}
+        for op in module.ops:
+            if op not in lazy_values:
+                _number_region_values(op, values)
+            for result in op.results:
+                values[result] = len(values)
+
+        blocks: dict[Block, int] = {}
+        self.write_attr_dict(output, module.attributes)
+        _write_varint(output, len(module.ops))
+        for op in module.ops:
+            body_values = lazy_values.get(op)
+            _write_varint(output, _INLINE if body_values is None else _LAZY)
+            try:
+                self.write_op_header(output, op, values, blocks)
+                if body_values is None:
+                    self.write_regions(output, op, values, blocks)
+            except _UndefinedValue:
+                raise BytecodeError(f"Operation {op.name} uses a value that "
+                                    "is not defined in the module") from None
+            if body_values is not None:
+                _write_varint(output, len(bodies))
+                self.write_regions(bodies, op, body_values, {})
+        return output, bodies
+
+    def write_tables(self, output: bytearray) -> None:
+        _write_varint(output, len(self.strings))
+        for string in self.strings:
+            encoded = string.encode()
+            _write_varint(output, len(encoded))
+            output += encoded
+        _write_varint(output, len(self.op_names))
+        for string in self.op_names:
+            _write_varint(output, string)
+        _write_varint(output, len(self.attributes))
+        output += self.attribute_table
+
+
+def _print_parameter(attribute: Data[Any]) -> str:
+    """
+    Print the parameter of a data attribute, and check that it is parsed
+    back to the same attribute.
+    """
+    stream = StringIO()
+    attribute.print_parameter(Printer(stream=stream))
+    text = stream.getvalue()
+    try:
+        parsed = type(attribute).new(
+            attribute.parse_parameter(XDSLParser(MLContext(), text)))
+    except Exception:
+        parsed = None
+    if parsed != attribute:
+        raise BytecodeError(f"Attribute {attribute} cannot be stored in "
+                            "bytecode")
+    return text
+
+
+def write_bytecode(module: ModuleOp, output: IO[bytes]) -> None:
+    """Write a module in the bytecode format."""
+    writer = _BytecodeWriter()
+    body, bodies = writer.write_module(module)
+    header = bytearray(MAGIC)
+    _write_varint(header, VERSION)
+    writer.write_tables(header)
+    output.write(header)
+    output.write(body)
+    output.write(bodies)
+
+
+_region_blocks: Any = Region.__dict__["blocks"]
+"""The slot descriptor of the `blocks` field of regions."""
+
+
+class _LazyRegion(Region):
+    """A region whose blocks are decoded when they are first accessed."""
+
+    __slots__ = ("lazy_body", )
+
+    lazy_body: _LazyBody | None
+    """The regions to decode on first access, or None once decoded."""
+
+    def __init__(self):
+        self.lazy_body = None
+        super().__init__()
+
+    @property
+    def blocks(self) -> list[Block]:  # type: ignore
+        if self.lazy_body is not None:
+            self.lazy_body.load()
+        return _region_blocks.__get__(self)
+
+    @blocks.setter
+    def blocks(self, blocks: list[Block]) -> None:  # type: ignore
+        _region_blocks.__set__(self, blocks)
+
+
+class _LazyBody:
+    """The regions of a top-level operation, decoded on first access."""
+
+    reader: _BytecodeReader
+    offset: int
+    """The offset of the regions in the bodies section."""
+    regions: list[_LazyRegion]
+
+    def __init__(self, reader: _BytecodeReader, offset: int,
+                 num_regions: int):
+        self.reader = reader
+        self.offset = offset
+        self.regions = [_LazyRegion() for _ in range(num_regions)]
+        for region in self.regions:
+            region.lazy_body = self
+
+    def load(self) -> None:
+        for region in self.regions:
+            region.lazy_body = None
+        self.reader.read_body(self.offset, self.regions)
+
+
+@dataclass(slots=True)
+class _ForwardValue(SSAValue):
+    """A value used before it is read, replaced by the value once read."""
+
+    @property
+    def owner(self) -> Operation | Block:
+        raise BytecodeError("Value used before it is read")
+
+    def __hash__(self) -> int:  # type: ignore
+        return hash(id(self))
+
+
+class _BytecodeReader:
+    data: bytes | mmap.mmap
+    pos: int
+    ctx: MLContext
+    allow_unregistered_ops: bool
+    strings: list[str]
+    op_types: list[type[Operation]]
+    attributes: list[Attribute]
+    bodies_start: int
+
+    def __init__(self, ctx: MLContext, data: bytes | mmap.mmap,
+                 allow_unregistered_ops: bool):
+        self.data = data
+        self.pos = 0
+        self.ctx = ctx
+        self.allow_unregistered_ops = allow_unregistered_ops
+        self.strings = []
+        self.op_types = []
+        self.attributes = []
+        self.bodies_start = 0
+
+    def varint(self) -> int:
+        data = self.data
+        pos = self.pos
+        byte = data[pos]
+        result = byte & 0x7f
+        shift = 7
+        while byte & 0x80:
+            pos += 1
+            byte = data[pos]
+            result |= (byte & 0x7f) << shift
+            shift += 7
+        self.pos = pos + 1
+        return result
+
+    def string(self) -> str:
+        return self.strings[self.varint()]
+
+    def attribute(self) -> Attribute:
+        return self.attributes[self.varint()]
+
+    def get_attr_type(self, name: str) -> type[Attribute]:
+        if (attr_type := self.ctx.get_optional_attr(name)) is None:
+            raise BytecodeError(f"Unknown attribute {name}")
+        return attr_type
+
+    def read_attribute(self) -> Attribute:
+        kind = self.varint()
+        if kind == _PARAMETRIZED:
+            name = self.string()
+            attr_type = (_PARAMETRIZED_BUILTINS.get(name)
+                         or self.get_attr_type(name))
+            params = [self.attribute() for _ in range(self.varint())]
+            if not issubclass(attr_type, ParametrizedAttribute):
+                raise BytecodeError(f"Attribute {attr_type.name} is not "
+                                    "parametrized")
+            return attr_type.new(params)
+        if kind == _INT:
+            value = self.varint()
+            return IntAttr.new(value >> 1 if not value & 1 else -(value >> 1) -
+                               1)
+        if kind == _STRING:
+            return StringAttr.new(self.string())
+        if kind == _FLOAT:
+            (value, ) = _float64.unpack_from(self.data, self.pos)
+            self.pos += _float64.size
+            return FloatData.new(value)
+        if kind == _ARRAY:
+            return ArrayAttr[Attribute].new(
+                tuple(self.attribute() for _ in range(self.varint())))
+        if kind == _DICTIONARY:
+            return DictionaryAttr.new({
+                self.string(): self.attribute()
+                for _ in range(self.varint())
+            })
+        if kind == _SIGNEDNESS:
+            return SignednessAttr.new(Signedness(self.varint()))
+        if kind == _DATA:
+            attr_type = self.get_attr_type(self.string())
+            text = self.string()
+            if not issubclass(attr_type, Data):
+                raise BytecodeError(f"Attribute {attr_type.name} is not a "
+                                    "data attribute")
+            data_type = cast(type[Data[Any]], attr_type)
+            return data_type.new(
+                data_type.parse_parameter(XDSLParser(self.ctx, text)))
+        if kind == _DENSE_INT or kind == _DENSE_FLOAT:
+            return self.read_dense(kind == _DENSE_FLOAT)
+        raise BytecodeError(f"Unknown attribute kind {kind}")
+
+    def read_dense(self, is_float: bool) -> Attribute:
+        typ = self.attribute()
+        element_type = self.attribute()
+        count = self.varint()
+        if is_float:
+            values: Sequence[float] = struct.unpack_from(
+                f"<{count}d", self.data, self.pos)
+            self.pos += count * _float64.size
+        else:
+            values = []
+            for _ in range(count):
+                value = self.varint()
+                values.append(value >> 1 if not value & 1 else -(value >> 1) -
+                              1)
+        # Equal elements are read as the same attribute
+        elements: dict[tuple[float, float], Attribute] = {}
+        for value in values:
+            key = (value, copysign(1.0, value))
+            if key not in elements:
+                if is_float:
+                    elements[key] = FloatAttr.new(
+                        [FloatData.new(value), element_type])
+                else:
+                    elements[key] = IntegerAttr.new(
+                        [IntAttr.new(int(value)), element_type])
+        data = ArrayAttr[Attribute].new(
+            tuple(elements[value, copysign(1.0, value)] for value in values))
+        return DenseIntOrFPElementsAttr.new([typ, data])
+
+    def get_op_type(self, name: str) -> type[Operation]:
+        if (op_type := self.ctx.get_optional_op(name)) is not None:
+            return op_type
+        if self.allow_unregistered_ops:
+            return UnregisteredOp.with_name(name, self.ctx)
+        raise BytecodeError(f"Unknown operation {name}")
+
+    def read_header(self) -> None:
+        if self.data[:len(MAGIC)] != MAGIC:
+            raise BytecodeError("Not an xDSL bytecode file")
+        self.pos = len(MAGIC)
+        if (version := self.varint()) != VERSION:
+            raise BytecodeError(f"Unsupported bytecode version {version}, "
+                                f"expected version {VERSION}")
+        data = self.data
+        for _ in range(self.varint()):
+            length = self.varint()
+            self.strings.append(str(data[self.pos:self.pos + length], "utf-8"))
+            self.pos += length
+        self.op_types = [
+            self.get_op_type(self.string()) for _ in range(self.varint())
+        ]
+        for _ in range(self.varint()):
+            self.attributes.append(self.read_attribute())
+
+    def read_values(self) -> tuple[list[Attribute], list[int]]:
+        """Read the types and the names of values."""
+        types: list[Attribute] = []
+        names: list[int] = []
+        for _ in range(self.varint()):
+            types.append(self.attribute())
+            names.append(self.varint())
+        return types, names
+
+    def set_names(self, values: Sequence[SSAValue], names: list[int]):
+        for value, name in zip(values, names):
+            if name:
+                value.name = self.strings[name - 1]
+
+    def read_attr_dict(self) -> dict[str, Attribute]:
+        return {
+            self.string(): self.attribute()
+            for _ in range(self.varint())
+        }
+
+    def read_operand(self, values: list[SSAValue],
+                     forward_values: dict[int, _ForwardValue]) -> SSAValue:
+        idx = self.varint()
+        if idx < len(values):
+            return values[idx]
+        # The value is replaced once it is read
+        if (value := forward_values.get(idx)) is None:
+            value = forward_values[idx] = _ForwardValue(NoneAttr())
+        return value
+
+    def read_op(self, values: list[SSAValue], blocks: list[Block],
+                forward_values: dict[int, _ForwardValue],
+                lazy: bool) -> Operation:
+        """
+        Read an operation, whose regions are loaded lazily if `lazy` is set.
+        """
+        op_type = self.op_types[self.varint()]
+        result_types, result_names = self.read_values()
+        operands = [
+            self.read_operand(values, forward_values)
+            for _ in range(self.varint())
+        ]
+        attributes = self.read_attr_dict()
+        successors = [
+            self.get_block(blocks, self.varint())
+            for _ in range(self.varint())
+        ]
+        num_regions = self.varint()
+        if lazy:
+            regions: list[Region] = list(
+                _LazyBody(self, self.varint(), num_regions).regions)
+        else:
+            regions = [Region() for _ in range(num_regions)]
+            self.read_regions(regions, values, blocks, forward_values)
+        op = op_type.create(operands=operands,
+                            result_types=result_types,
+                            attributes=attributes,
+                            successors=successors,
+                            regions=regions)
+        self.set_names(op.results, result_names)
+        values.extend(op.results)
+        return op
+
+    @staticmethod
+    def get_block(blocks: list[Block], idx: int) -> Block:
+        if idx == len(blocks):
+            blocks.append(Block())
+        return blocks[idx]
+
+    def read_regions(self, regions: Sequence[Region], values: list[SSAValue],
+                     blocks: list[Block],
+                     forward_values: dict[int, _ForwardValue]) -> None:
+        for region in regions:
+            for _ in range(self.varint()):
+                block = self.get_block(blocks, self.varint())
+                arg_types, arg_names = self.read_values()
+                for typ in arg_types:
+                    block.insert_arg(typ, len(block.args))
+                self.set_names(block.args, arg_names)
+                values.extend(block.args)
+                block.add_ops([
+                    self.read_op(values, blocks, forward_values, False)
+                    for _ in range(self.varint())
+                ])
+                region.add_block(block)
+
+    @staticmethod
+    def resolve_forward_values(
+            values: list[SSAValue],
+            forward_values: dict[int, _ForwardValue]) -> None:
+        """Replace the values used before they were read."""
+        for idx, forward_value in forward_values.items():
+            if idx >= len(values):
+                raise BytecodeError("Use of an undefined value")
+            forward_value.replace_by(values[idx])
+
+    def read_module(self) -> ModuleOp:
+        values: list[SSAValue] = []
+        blocks: list[Block] = []
+        forward_values: dict[int, _ForwardValue] = {}
+        attributes = self.read_attr_dict()
+        ops = [
+            self.read_op(values, blocks, forward_values,
+                         self.varint() == _LAZY) for _ in range(self.varint())
+        ]
+        self.resolve_forward_values(values, forward_values)
+        self.bodies_start = self.pos
+        return ModuleOp.create(attributes=attributes,
+                               regions=[Region.from_operation_list(ops)])
+
+    def read_body(self, offset: int, regions: Sequence[Region]) -> None:
+        """Read the regions of a top-level operation, stored at an offset."""
+        pos = self.pos
+        self.pos = self.bodies_start + offset
+        values: list[SSAValue] = []
+        forward_values: dict[int, _ForwardValue] = {}
+        try:
+            self.read_regions(regions, values, [], forward_values)
+        except IndexError:
+            raise BytecodeError("Truncated bytecode file") from None
+        finally:
+            self.pos = pos
+        self.resolve_forward_values(values, forward_values)
+
+
+def read_bytecode(ctx: MLContext,
+                  data: bytes | mmap.mmap,
+                  allow_unregistered_ops: bool = False) -> ModuleOp:
+    """
+    Read a module in the bytecode format. The regions of its top-level
+    operations, such as the bodies of functions, are only decoded when they
+    are first accessed, and keep a reference to `data` until then.
+    """
+    reader = _BytecodeReader(ctx, data, allow_unregistered_ops)
+    try:
+        reader.read_header()
+        return reader.read_module()
+    except (IndexError, struct.error):
+        raise BytecodeError("Truncated bytecode file") from None
@@ -51,7 +51,7 @@ class Constant(Operation):
             attributes={"value": val})
 
 
-@dataclass
+@dataclass(slots=True)
 class BinaryOperation(Operation):
     """A generic operation. Operation definitions inherit this class."""
 
@@ -2,12 +2,13 @@ from __future__ import annotations
 
 from dataclasses import dataclass
 from enum import Enum
-from typing import (Iterable, TypeAlias, List, cast, Type, Sequence,
-                    TYPE_CHECKING, Any, TypeVar, overload)
+from math import copysign
+from typing import (Callable, Iterable, TypeAlias, List, cast,
+                    Type, Sequence, TYPE_CHECKING, Any, TypeVar, overload)
 
-from xdsl.ir import (Block, Data, MLContext, MLIRType, ParametrizedAttribute,
-                     Operation, Region, Attribute, Dialect, SSAValue,
-                     AttributeCovT, AttributeInvT)
+from xdsl.ir import (Block, BlockOps, Data, MLContext, MLIRType,
+                     ParametrizedAttribute, Operation, Region, Attribute,
+                     Dialect, SSAValue, AttributeCovT, AttributeInvT)
 
 from xdsl.irdl import (AllOf, OpAttr, VarOpResult, VarOperand, VarRegion,
                        irdl_attr_definition, attr_constr_coercion,
@@ -40,6 +41,11 @@ class ArrayOfConstraint(AttrConstraint):
         for e in cast(ArrayAttr[Attribute], attr).data:
             self.elem_constr.verify(e)
 
+    def matches(self, attr: Attribute) -> bool:
+        return isinstance(attr, ArrayAttr) and all(
+            self.elem_constr.matches(e)
+            for e in cast(ArrayAttr[Attribute], attr).data)
+
 
 @irdl_attr_definition
 class ArrayAttr(GenericData[tuple[AttributeCovT, ...]]):
@@ -581,6 +587,12 @@ class ContainerOf(AttrConstraint):
         else:
             self.elem_constr.verify(attr)
 
+    def matches(self, attr: Attribute) -> bool:
+        if isinstance(attr, VectorType) or isinstance(attr, TensorType):
+            return self.elem_constr.matches(
+                attr.element_type)  # type: ignore
+        return self.elem_constr.matches(attr)
+
 
 VectorOrTensorOf: TypeAlias = (VectorType[AttributeInvT]
                                | TensorType[AttributeInvT]
@@ -604,6 +616,10 @@ class VectorRankConstraint(AttrConstraint):
                 f"Expected vector rank to be {self.expected_rank}, got {attr.get_num_dims()}."
             )
 
+    def matches(self, attr: Attribute) -> bool:
+        return (isinstance(attr, VectorType)
+                and attr.get_num_dims() == self.expected_rank)
+
 
 @dataclass
 class VectorBaseTypeConstraint(AttrConstraint):
@@ -622,6 +638,10 @@ class VectorBaseTypeConstraint(AttrConstraint):
                 f"Expected vector type to be {self.expected_type}, got {attr.element_type}."  # type: ignore
             )
 
+    def matches(self, attr: Attribute) -> bool:
+        return (isinstance(attr, VectorType)
+                and attr.element_type == self.expected_type)  # type: ignore
+
 
 @dataclass
 class VectorBaseTypeAndRankConstraint(AttrConstraint):
@@ -642,6 +662,38 @@ class VectorBaseTypeAndRankConstraint(AttrConstraint):
         ])
         constraint.verify(attr)
 
+    def matches(self, attr: Attribute) -> bool:
+        return (isinstance(attr, VectorType)
+                and attr.element_type == self.expected_type  # type: ignore
+                and attr.get_num_dims() == self.expected_rank)
+
+
+_ElementT = TypeVar("_ElementT", bound=int | float)
+_ElementAttrT = TypeVar("_ElementAttrT", bound=Attribute)
+
+
+def _build_element_attrs(
+        data: Sequence[_ElementT],
+        build: Callable[[_ElementT], _ElementAttrT]) -> list[_ElementAttrT]:
+    """
+    Build the attributes of the elements of a dense attribute, building a
+    single attribute per distinct element.
+    """
+    attrs = {element: build(element) for element in set(data)}
+    if 0 not in attrs:
+        return [attrs[element] for element in data]
+    # 0.0 and -0.0 are equal, but their attributes are different
+    zeros: dict[float, _ElementT] = {
+        copysign(1.0, element): element
+        for element in data if not element
+    }
+    zero_attrs = {sign: build(element) for sign, element in zeros.items()}
+    return [
+        zero_attrs[copysign(1.0, element)]
+        if element == 0 else attrs[element]
+        for element in data
+    ]
+
 
 @irdl_attr_definition
 class DenseIntOrFPElementsAttr(ParametrizedAttribute):
@@ -680,10 +732,8 @@ class DenseIntOrFPElementsAttr(ParametrizedAttribute):
         data: Sequence[int] | Sequence[IntegerAttr[IndexType]]
     ) -> DenseIntOrFPElementsAttr:
         if len(data) and isinstance(data[0], int):
-            attr_list = [
-                IntegerAttr.from_index_int_value(d)
-                for d in cast(Sequence[int], data)
-            ]
+            attr_list = _build_element_attrs(cast(Sequence[int], data),
+                                             IntegerAttr.from_index_int_value)
         else:
             attr_list = cast(Sequence[IntegerAttr[IndexType]], data)
 
@@ -695,10 +745,10 @@ class DenseIntOrFPElementsAttr(ParametrizedAttribute):
         data: Sequence[int] | Sequence[IntegerAttr[IntegerType]]
     ) -> DenseIntOrFPElementsAttr:
         if len(data) and isinstance(data[0], int):
-            attr_list = [
-                IntegerAttr[IntegerType](d, type.element_type)
-                for d in cast(Sequence[int], data)
-            ]
+            element_type = type.element_type
+            attr_list = _build_element_attrs(
+                cast(Sequence[int], data),
+                lambda d: IntegerAttr[IntegerType](d, element_type))
         else:
             attr_list = cast(Sequence[IntegerAttr[IntegerType]], data)
 
@@ -710,10 +760,10 @@ class DenseIntOrFPElementsAttr(ParametrizedAttribute):
         data: Sequence[int | float] | Sequence[AnyFloatAttr]
     ) -> DenseIntOrFPElementsAttr:
         if len(data) and isinstance(data[0], int | float):
-            attr_list = [
-                FloatAttr(float(d), type.element_type)
-                for d in cast(Sequence[int | float], data)
-            ]
+            element_type = type.element_type
+            attr_list = _build_element_attrs(
+                cast(Sequence[int | float], data),
+                lambda d: FloatAttr(float(d), element_type))
         else:
             attr_list = cast(Sequence[AnyFloatAttr], data)
 
@@ -824,7 +874,8 @@ class DenseArrayBase(ParametrizedAttribute):
             typ: IntegerType | IndexType,
             data: Sequence[int] | Sequence[IntAttr]) -> DenseArrayBase:
         if len(data) and isinstance(data[0], int):
-            attr_list = [IntAttr(d) for d in cast(Sequence[int], data)]
+            attr_list = _build_element_attrs(cast(Sequence[int], data),
+                                             IntAttr)
         else:
             attr_list = cast(Sequence[IntAttr], data)
 
@@ -836,9 +887,8 @@ class DenseArrayBase(ParametrizedAttribute):
             data: Sequence[int | float] | Sequence[FloatData]
     ) -> DenseArrayBase:
         if len(data) and isinstance(data[0], int | float):
-            attr_list = [
-                FloatData(float(d)) for d in cast(Sequence[int | float], data)
-            ]
+            attr_list = _build_element_attrs(
+                cast(Sequence[int | float], data), lambda d: FloatData(float(d)))
         else:
             attr_list = cast(Sequence[FloatData], data)
 
@@ -953,7 +1003,7 @@ class ModuleOp(Operation):
     body: SingleBlockRegion
 
     @property
-    def ops(self) -> List[Operation]:
+    def ops(self) -> BlockOps:
         return self.regions[0].blocks[0].ops
 
     @staticmethod
@@ -30,6 +30,10 @@ class IntOrUnknown(AttrConstraint):
                 f"Expected array of length {self.length}, got {len(attr.data)}."
             )
 
+    def matches(self, attr: Attribute) -> bool:
+        return isinstance(attr, ArrayAttr) and len(
+            cast(ArrayAttr[Any], attr).data) == self.length
+
 
 _FieldTypeElement = TypeVar("_FieldTypeElement", bound=Attribute)
 
@@ -110,6 +114,10 @@ class ArrayLength(AttrConstraint):
                 f"Expected array of length {self.length}, got {len(attr.data)}."
             )
 
+    def matches(self, attr: Attribute) -> bool:
+        return isinstance(attr, ArrayAttr) and len(
+            cast(ArrayAttr[Any], attr).data) == self.length
+
 
 # TODO: How can we inherit from MLIRType and ParametrizedAttribute?
 @dataclass(frozen=True)
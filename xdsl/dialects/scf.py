@@ -88,8 +88,8 @@ class For(Operation):
                     "The scf.for's body does not end with a scf.yield. A scf.for loop "
                     "with loop-carried variables must yield their values at the end of "
                     "its body.")
-        if (len(self.body.ops) > 0 and isinstance(self.body.ops[-1], Yield)):
-            yieldop = self.body.ops[-1]
+        yieldop = self.body.blocks[0].last_op
+        if isinstance(yieldop, Yield):
             if len(yieldop.arguments) != len(self.iter_args):
                 raise VerifyException(
                     f"Expected {len(self.iter_args)} args, got {len(yieldop.arguments)}. "
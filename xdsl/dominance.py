@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+from typing import Callable, Iterable, Sequence
+
+from xdsl.analysis import RegionAnalysis
+from xdsl.ir import Block, BlockArgument, Operation, OpResult, Region, SSAValue
+
+
+def _successors(block: Block) -> Sequence[Block]:
+    """Get the successors of a block, given by its terminator."""
+    terminator = block.last_op
+    if terminator is None:
+        return ()
+    return terminator.successors
+
+
+def _compute_immediate_dominators(
+        roots: Sequence[Block], successors: Callable[[Block], Iterable[Block]]
+) -> tuple[list[Block], dict[Block, Block | None]]:
+    """
+    Compute the immediate dominators of the blocks reachable from the roots,
+    using the algorithm of Cooper, Harvey and Kennedy.
+    The roots are the successors of a virtual root block, which is the
+    immediate dominator of the roots, and is represented by None.
+    Returns the reachable blocks in reverse postorder, and their immediate
+    dominators.
+    """
+    # Number the reachable blocks in postorder, with an iterative DFS.
+    # The virtual root has the highest number.
+    postorder: list[Block] = []
+    numbers: dict[Block, int] = {}
+    predecessors: dict[Block, list[Block]] = {root: [] for root in roots}
+    visited: set[Block] = set(roots)
+    for root in roots:
+        stack = [(root, iter(successors(root)))]
+        while stack:
+            block, block_successors = stack[-1]
+            for successor in block_successors:
+                predecessors.setdefault(successor, []).append(block)
+                if successor not in visited:
+                    visited.add(successor)
+                    stack.append((successor, iter(successors(successor))))
+                    break
+            else:
+                stack.pop()
+                numbers[block] = len(postorder)
+                postorder.append(block)
+    root_number = len(postorder)
+
+    idoms: dict[Block, Block | None] = {root: None for root in roots}
+
+    def intersect(lhs: Block | None, rhs: Block | None) -> Block | None:
+        lhs_number = root_number if lhs is None else numbers[lhs]
+        rhs_number = root_number if rhs is None else numbers[rhs]
+        while lhs_number != rhs_number:
+            while lhs_number < rhs_number:
+                assert lhs is not None
+                lhs = idoms[lhs]
+                lhs_number = root_number if lhs is None else numbers[lhs]
+            while rhs_number < lhs_number:
+                assert rhs is not None
+                rhs = idoms[rhs]
+                rhs_number = root_number if rhs is None else numbers[rhs]
+        return lhs
+
+    root_set = set(roots)
+    reverse_postorder = postorder[::-1]
+    changed = True
+    while changed:
+        changed = False
+        for block in reverse_postorder:
+            if block in root_set:
+                continue
+            new_idom: Block | None = None
+            has_idom = False
+            for pred in predecessors[block]:
+                if pred not in idoms:
+                    continue
+                if not has_idom:
+                    new_idom = pred
+                    has_idom = True
+                else:
+                    new_idom = intersect(pred, new_idom)
+            if idoms.get(block, block) is not new_idom:
+                idoms[block] = new_idom
+                changed = True
+    return reverse_postorder, idoms
+
+
+class _DominatorTree(RegionAnalysis):
+    """
+    A dominator tree over the blocks of a region.
+    Blocks that are not reachable from the roots of the tree are not part
+    of it, and only dominate themselves.
+    """
+
+    region: Region
+
+    _idoms: dict[Block, Block | None]
+    """The immediate dominator of each block in the tree."""
+
+    _intervals: dict[Block, tuple[int, int]]
+    """
+    The preorder and postorder numbers of each block in the tree, such that
+    a block dominates another one when its interval contains the other one.
+    """
+
+    def __init__(self, region: Region, roots: Sequence[Block],
+                 successors: Callable[[Block], Iterable[Block]]):
+        self.region = region
+        reverse_postorder, self._idoms = _compute_immediate_dominators(
+            roots, successors)
+
+        children: dict[Block | None, list[Block]] = {}
+        for block in reverse_postorder:
+            children.setdefault(self._idoms[block], []).append(block)
+
+        # Number the tree nodes with an iterative DFS
+        self._intervals = {}
+        counter = 0
+        preorder_numbers: dict[Block, int] = {}
+        stack: list[tuple[Block, bool]] = [
+            (block, False) for block in reversed(children.get(None, []))
+        ]
+        while stack:
+            block, is_exit = stack.pop()
+            if is_exit:
+                self._intervals[block] = (preorder_numbers[block], counter)
+                counter += 1
+                continue
+            preorder_numbers[block] = counter
+            counter += 1
+            stack.append((block, True))
+            stack.extend(
+                (child, False) for child in reversed(children.get(block, [])))
+
+    def is_reachable(self, block: Block) -> bool:
+        """Check if a block is part of the tree."""
+        return block in self._intervals
+
+    def get_immediate_dominator(self, block: Block) -> Block | None:
+        """
+        Get the immediate dominator of a block, or None if the block is a
+        root of the tree or is not part of it.
+        """
+        return self._idoms.get(block)
+
+    def dominates(self, lhs: Block, rhs: Block) -> bool:
+        """Check if a block dominates another one."""
+        if lhs is rhs:
+            return True
+        lhs_interval = self._intervals.get(lhs)
+        rhs_interval = self._intervals.get(rhs)
+        if lhs_interval is None or rhs_interval is None:
+            return False
+        return (lhs_interval[0] <= rhs_interval[0]
+                and rhs_interval[1] <= lhs_interval[1])
+
+    def properly_dominates(self, lhs: Block, rhs: Block) -> bool:
+        """Check if a block dominates another, different, one."""
+        return lhs is not rhs and self.dominates(lhs, rhs)
+
+    def _get_ancestor_in_region(self, op: Operation) -> Operation | None:
+        """Get the ancestor of an operation that is in the analyzed region."""
+        ancestor: Operation | None = op
+        while ancestor is not None:
+            block = ancestor.parent
+            if block is None:
+                return None
+            if block.parent is self.region:
+                return ancestor
+            ancestor = block.parent_op()
+        return None
+
+
+class DominanceInfo(_DominatorTree):
+    """
+    The dominance information of the blocks of a region.
+    A block dominates another one if every path from the entry block to the
+    other block goes through it.
+    """
+
+    def __init__(self, region: Region):
+        super().__init__(region, region.blocks[:1], _successors)
+
+    def op_properly_dominates(self, lhs: Operation, rhs: Operation) -> bool:
+        """
+        Check if an operation of the region properly dominates another
+        operation, that may be nested in an operation of the region.
+        """
+        if lhs.parent is None or lhs.parent.parent is not self.region:
+            raise ValueError("Operation is not in the analyzed region.")
+        ancestor = self._get_ancestor_in_region(rhs)
+        if ancestor is None:
+            return False
+        if ancestor is lhs:
+            # An operation does not dominate the operations nested in it
+            return False
+        if lhs.parent is ancestor.parent:
+            return lhs.is_before_in_block(ancestor)
+        assert ancestor.parent is not None
+        return self.properly_dominates(lhs.parent, ancestor.parent)
+
+    def value_dominates(self, value: SSAValue, op: Operation) -> bool:
+        """
+        Check if a value defined in the region dominates an operation, that
+        may be nested in an operation of the region, so that the operation
+        can use the value.
+        """
+        if isinstance(value, OpResult):
+            return self.op_properly_dominates(value.op, op)
+        if isinstance(value, BlockArgument):
+            if value.block.parent is not self.region:
+                raise ValueError("Value is not defined in the analyzed region.")
+            ancestor = self._get_ancestor_in_region(op)
+            if ancestor is None:
+                return False
+            assert ancestor.parent is not None
+            return self.dominates(value.block, ancestor.parent)
+        raise ValueError(f"Unexpected value {value}")
+
+
+class PostDominanceInfo(_DominatorTree):
+    """
+    The post-dominance information of the blocks of a region.
+    A block post-dominates another one if every path from the other block to
+    a block without successors goes through it.
+    """
+
+    def __init__(self, region: Region):
+        predecessors: dict[Block, list[Block]] = {
+            block: []
+            for block in region.blocks
+        }
+        for block in region.blocks:
+            for successor in _successors(block):
+                if successor in predecessors:
+                    predecessors[successor].append(block)
+        exits = [
+            block for block in region.blocks if not any(
+                successor.parent is region
+                for successor in _successors(block))
+        ]
+        super().__init__(region, exits, predecessors.__getitem__)
+
+    def post_dominates(self, lhs: Block, rhs: Block) -> bool:
+        """Check if a block post-dominates another one."""
+        return self.dominates(lhs, rhs)
+
+    def properly_post_dominates(self, lhs: Block, rhs: Block) -> bool:
+        """Check if a block post-dominates another, different, one."""
+        return self.properly_dominates(lhs, rhs)
@@ -1,13 +1,22 @@
+# The IR classes of this module maintain each other's private links (use
+# lists, operation lists, orders and versions), which is not reported.
+# pyright: reportPrivateUsage=false
 from __future__ import annotations
 import re
 import sys
+import warnings
 
-from abc import ABC, abstractmethod
+from abc import ABC, ABCMeta, abstractmethod
+from collections import deque
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from io import StringIO
 from itertools import chain
-from typing import (TYPE_CHECKING, Any, Callable, Generic, Protocol, Sequence,
-                    TypeVar, cast, Iterator, ClassVar)
+from math import copysign
+from weakref import WeakValueDictionary
+from typing import (TYPE_CHECKING, AbstractSet, Any, Callable, Generic,
+                    Hashable, Iterable, Protocol, Sequence, TypeAlias,
+                    TypeVar, cast, Iterator, ClassVar, overload, Generator)
 
 # Used for cyclic dependencies in type hints
 if TYPE_CHECKING:
@@ -54,6 +63,9 @@ class MLContext:
     _registeredAttrs: dict[str, type[Attribute]] = field(default_factory=dict)
     registered_unregistered_ops: dict[str, type[Operation]] = field(
         default_factory=dict)
+    _lazy_dialects: dict[str, Callable[[], Dialect]] = field(
+        default_factory=dict[str, Callable[[], Dialect]])
+    """The loaders of the dialects registered lazily, by dialect name."""
 
     def register_dialect(self, dialect: Dialect):
         """Register a dialect. Operation and Attribute names should be unique"""
@@ -63,6 +75,32 @@ class MLContext:
         for attr in dialect.attributes:
             self.register_attr(attr)
 
+    def register_lazy_dialect(self, name: str,
+                              loader: Callable[[], Dialect]) -> None:
+        """
+        Register a dialect that is only loaded, by calling `loader`, when one
+        of its operations or attributes is first looked up.
+        The operation and attribute names of the dialect are expected to be
+        prefixed by `name`, otherwise the dialect is only loaded when a name
+        cannot be found in any other dialect.
+        """
+        if name in self._lazy_dialects:
+            raise Exception(f"Dialect {name} has already been registered")
+        self._lazy_dialects[name] = loader
+
+    def _load_lazy_dialects(self, name: str,
+                            registered: dict[str, Any]) -> None:
+        """
+        Load lazily registered dialects until `name` is registered.
+        The dialect prefixing `name` is loaded first.
+        """
+        loader = self._lazy_dialects.pop(name.split(".")[0], None)
+        if loader is not None:
+            self.register_dialect(loader())
+        while name not in registered and self._lazy_dialects:
+            loader = self._lazy_dialects.pop(next(iter(self._lazy_dialects)))
+            self.register_dialect(loader())
+
     def register_op(self, op: type[Operation]) -> None:
         """Register an operation definition. Operation names should be unique."""
         if op.name in self._registeredOps:
@@ -76,11 +114,23 @@ class MLContext:
                 f"Attribute {attr.name} has already been registered")
         self._registeredAttrs[attr.name] = attr
 
+    def get_registered_names(self) -> list[str]:
+        """
+        Get the names of the registered operations and attributes, and of the
+        lazily registered dialects that were not loaded yet.
+        """
+        return [
+            *sorted(self._registeredOps), *sorted(self._registeredAttrs),
+            *sorted(self._lazy_dialects)
+        ]
+
     def get_optional_op(self, name: str) -> type[Operation] | None:
         """Get an operation class from its name if it exists."""
         if name not in self._registeredOps:
-            return None
-        return self._registeredOps[name]
+            if not self._lazy_dialects:
+                return None
+            self._load_lazy_dialects(name, self._registeredOps)
+        return self._registeredOps.get(name)
 
     def get_op(self, name: str) -> type[Operation]:
         """Get an operation class from its name."""
@@ -91,8 +141,10 @@ class MLContext:
     def get_optional_attr(self, name: str) -> type[Attribute] | None:
         """Get an attribute class from its name if it exists."""
         if name not in self._registeredAttrs:
-            return None
-        return self._registeredAttrs[name]
+            if not self._lazy_dialects:
+                return None
+            self._load_lazy_dialects(name, self._registeredAttrs)
+        return self._registeredAttrs.get(name)
 
     def get_attr(self, name: str) -> type[Attribute]:
         """Get an attribute class from its name."""
@@ -101,9 +153,13 @@ class MLContext:
         raise Exception(f"Attribute {name} is not registered")
 
 
-@dataclass(frozen=True)
+@dataclass(eq=False, slots=True)
 class Use:
-    """The use of a SSA value."""
+    """
+    The use of a SSA value.
+    Each operand of an operation owns a single `Use`, which is linked in the
+    use list of the value it currently refers to.
+    """
 
     operation: Operation
     """The operation using the value."""
@@ -111,8 +167,75 @@ class Use:
     index: int
     """The index of the operand using the value in the operation."""
 
+    _prev_use: Use | None = field(default_factory=lambda: None, init=False,
+                                  repr=False)
+    """The previous use in the use list of the value."""
 
-@dataclass
+    _next_use: Use | None = field(default_factory=lambda: None, init=False,
+                                  repr=False)
+    """The next use in the use list of the value."""
+
+    @property
+    def value(self) -> SSAValue:
+        """The value being used."""
+        return self.operation.operands[self.index]
+
+    def _is_linked_to(self, value: SSAValue) -> bool:
+        """Check if the use is currently in the use list of `value`."""
+        return self._prev_use is not None or value._first_use is self
+
+    def __eq__(self, other: object) -> bool:
+        return (isinstance(other, Use) and self.operation is other.operation
+                and self.index == other.index)
+
+    def __hash__(self) -> int:
+        return hash((self.operation, self.index))
+
+
+class UseList(AbstractSet[Use]):
+    """
+    A set-compatible view over the uses of an SSA value.
+    The uses are stored in an intrusive doubly-linked list, this view only
+    walks over it.
+    """
+
+    value: SSAValue
+
+    def __init__(self, value: SSAValue):
+        self.value = value
+
+    def __iter__(self) -> Iterator[Use]:
+        use = self.value._first_use
+        while use is not None:
+            next_use = use._next_use
+            yield use
+            use = next_use
+
+    def __len__(self) -> int:
+        return self.value._num_uses
+
+    def __bool__(self) -> bool:
+        return self.value._first_use is not None
+
+    def __contains__(self, use: object) -> bool:
+        if not isinstance(use, Use):
+            return False
+        operand_uses = use.operation._operand_uses
+        if use.index >= len(operand_uses):
+            return False
+        owned_use = operand_uses[use.index]
+        return (use.operation.operands[use.index] is self.value
+                and owned_use._is_linked_to(self.value))
+
+    def copy(self) -> set[Use]:
+        """Get the uses of the value as a new set."""
+        return set(self)
+
+    def __repr__(self) -> str:
+        return repr(set(self))
+
+
+@dataclass(slots=True)
 class SSAValue(ABC):
     """
     A reference to an SSA variable.
@@ -122,14 +245,23 @@ class SSAValue(ABC):
     typ: Attribute
     """Each SSA variable is associated to a type."""
 
-    uses: set[Use] = field(init=False, default_factory=set, repr=False)
-    """All uses of the value."""
+    _first_use: Use | None = field(default_factory=lambda: None, init=False,
+                                   repr=False)
+    """The first use of the value."""
+
+    _num_uses: int = field(default_factory=lambda: 0, init=False, repr=False)
+    """The number of uses of the value."""
 
-    _name: str | None = field(init=False, default=None)
+    _name: str | None = field(default_factory=lambda: None, init=False)
 
     _name_regex: ClassVar[re.Pattern[str]] = re.compile(
         r'[A-Za-z0-9._$-]*[A-Za-z._$-]')
 
+    @property
+    def uses(self) -> UseList:
+        """All uses of the value."""
+        return UseList(self)
+
     @property
     @abstractmethod
     def owner(self) -> Operation | Block:
@@ -162,19 +294,35 @@ class SSAValue(ABC):
             f"Expected SSAValue or Operation for SSAValue.get, but got {arg}")
 
     def add_use(self, use: Use):
-        """Add a new use of the value."""
-        self.uses.add(use)
+        """Link a use in the use list of the value."""
+        use._prev_use = None
+        use._next_use = self._first_use
+        if self._first_use is not None:
+            self._first_use._prev_use = use
+        self._first_use = use
+        self._num_uses += 1
 
     def remove_use(self, use: Use):
-        """Remove a use of the value."""
-        assert use in self.uses, "use to be removed was not in use list"
-        self.uses.remove(use)
+        """Unlink a use from the use list of the value."""
+        assert use._is_linked_to(self), "use to be removed was not in use list"
+        if use._prev_use is None:
+            self._first_use = use._next_use
+        else:
+            use._prev_use._next_use = use._next_use
+        if use._next_use is not None:
+            use._next_use._prev_use = use._prev_use
+        use._prev_use = None
+        use._next_use = None
+        self._num_uses -= 1
 
     def replace_by(self, value: SSAValue) -> None:
         """Replace the value by another value in all its uses."""
-        for use in self.uses.copy():
+        use = self._first_use
+        while use is not None:
+            next_use = use._next_use
             use.operation.replace_operand(use.index, value)
-        assert len(self.uses) == 0, "unexpected error in xdsl"
+            use = next_use
+        assert self._num_uses == 0, "unexpected error in xdsl"
 
     def erase(self, safe_erase: bool = True) -> None:
         """
@@ -189,7 +337,7 @@ class SSAValue(ABC):
         self.replace_by(ErasedSSAValue(self.typ, self))
 
 
-@dataclass
+@dataclass(slots=True)
 class OpResult(SSAValue):
     """A reference to an SSA variable defined by an operation result."""
 
@@ -212,15 +360,13 @@ class OpResult(SSAValue):
             len(self.uses),
         )
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    # This might be problematic, as the superclass is not hashable ...
-    def __hash__(self) -> int:  # type: ignore
-        return id(self)
+    # Values are compared by identity. The `object` methods are used rather
+    # than Python functions, as values are often used as dictionary keys.
+    __eq__ = object.__eq__  # type: ignore
+    __hash__ = object.__hash__  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class BlockArgument(SSAValue):
     """A reference to an SSA variable defined by a basic block argument."""
 
@@ -242,14 +388,11 @@ class BlockArgument(SSAValue):
             len(self.uses),
         )
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
-
-    def __hash__(self) -> int:  # type: ignore
-        return id(self)
+    __eq__ = object.__eq__  # type: ignore
+    __hash__ = object.__hash__  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class ErasedSSAValue(SSAValue):
     """
     An erased SSA variable.
@@ -283,9 +426,30 @@ class MLIRType:
 
 
 A = TypeVar('A', bound='Attribute')
+_T = TypeVar('_T')
+
+_uniqued_attributes: WeakValueDictionary[Hashable, Attribute] = \
+    WeakValueDictionary()
+"""
+The table of uniqued attributes, indexed by their uniquing key.
+Attributes are removed from the table once they are not used anymore.
+"""
+
+
+class AttributeMeta(ABCMeta):
+    """
+    The metaclass of attributes.
+    Attributes are uniqued when they are constructed, so that structurally
+    equal attributes are the same object. Attributes are verified only once,
+    when they are first added to the uniquing table.
+    """
+
+    def __call__(cls: type[_T], *args: Any, **kwargs: Any) -> _T:
+        attr = super().__call__(*args, **kwargs)  # type: ignore
+        return attr._get_uniqued()
 
 
-class Attribute(ABC):
+class Attribute(ABC, metaclass=AttributeMeta):
     """
     A compile-time value.
     Attributes are used to represent SSA variable types, and can be attached
@@ -299,8 +463,28 @@ class Attribute(ABC):
         """Create a new attribute using one of the builder defined in IRDL."""
         assert False
 
-    def __post_init__(self):
+    def _uniquing_key(self) -> Hashable | None:
+        """
+        Get the key used to unique the attribute, or None if the attribute
+        cannot be uniqued.
+        """
+        return None
+
+    def _get_uniqued(self: A) -> A:
+        """
+        Get the uniqued attribute that is structurally equal to this one.
+        The attribute is verified and added to the uniquing table if no such
+        attribute exists yet.
+        """
+        key = self._uniquing_key()
+        if key is None:
+            self._verify()
+            return self
+        if (uniqued := _uniqued_attributes.get(key)) is not None:
+            return cast(A, uniqued)
         self._verify()
+        _uniqued_attributes[key] = self
+        return self
 
     def _verify(self):
         self.verify()
@@ -328,11 +512,64 @@ AttributeCovT = TypeVar("AttributeCovT", bound=Attribute, covariant=True)
 AttributeInvT = TypeVar("AttributeInvT", bound=Attribute)
 
 
+def _get_data_key(data: object) -> Hashable:
+    """
+    Get the key uniquing the data of an attribute. Floats are keyed with their
+    sign, including in tuples, as 0.0 and -0.0 are equal but should not be
+    uniqued together.
+    """
+    if isinstance(data, float):
+        return (float, data, copysign(1.0, data))
+    key = (type(data), data)
+    if isinstance(data, tuple):
+        elems = cast(tuple[Any, ...], data)
+        if any(isinstance(elem, (float, tuple)) for elem in elems):
+            return (tuple, tuple(map(_get_data_key, elems)))
+    return key
+
+
 @dataclass(frozen=True)
 class Data(Generic[DataElement], Attribute, ABC):
     """An attribute represented by a Python structure."""
     data: DataElement
 
+    _hash: int | None = field(default=None,
+                              init=False,
+                              repr=False,
+                              compare=False)
+    """The hash of the attribute, or None if its data is unhashable."""
+
+    def __post_init__(self):
+        try:
+            data_hash = hash((type(self), self.data))
+        except TypeError:
+            data_hash = None
+        object.__setattr__(self, "_hash", data_hash)
+
+    def _uniquing_key(self) -> Hashable | None:
+        if self._hash is None:
+            return None
+        return (type(self), _get_data_key(self.data))
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        other = cast(Data[Any], other)
+        if self._hash is None or other._hash is None:
+            return self.data == other.data
+        return (self._hash == other._hash
+                and self._uniquing_key() == other._uniquing_key())
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            raise TypeError(f"unhashable attribute data: {self.data}")
+        return self._hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self).new, (self.data, ))
+
     @classmethod
     def new(cls: type[_D], params: Any) -> _D:
         """
@@ -350,8 +587,8 @@ class Data(Generic[DataElement], Attribute, ABC):
         attr = cls.__new__(cls)
 
         # Call the __init__ of Data, which will set the parameters field.
-        Data[Any].__init__(attr, params)
-        return attr
+        Data.__init__(attr, params)  # type: ignore
+        return attr._get_uniqued()
 
     @staticmethod
     @abstractmethod
@@ -369,10 +606,49 @@ _PA = TypeVar("_PA", bound="ParametrizedAttribute")
 @dataclass(frozen=True)
 class ParametrizedAttribute(Attribute):
     """An attribute parametrized by other attributes."""
-    parameters: list[Attribute] = field(default_factory=list)
+    parameters: Sequence[Attribute] = field(default_factory=tuple)
+    """The attribute parameters, stored as a tuple."""
+
+    _hash: int | None = field(default=None,
+                              init=False,
+                              repr=False,
+                              compare=False)
+    """The hash of the attribute, or None if its parameters are unhashable."""
+
+    def __post_init__(self):
+        if not isinstance(self.parameters, tuple):
+            object.__setattr__(self, "parameters", tuple(self.parameters))
+        try:
+            params_hash = hash((type(self), self.parameters))
+        except TypeError:
+            params_hash = None
+        object.__setattr__(self, "_hash", params_hash)
+
+    def _uniquing_key(self) -> Hashable | None:
+        if self._hash is None:
+            return None
+        return (type(self), self.parameters)
+
+    def __eq__(self, other: object) -> bool:
+        if self is other:
+            return True
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        other = cast(ParametrizedAttribute, other)
+        return (self._hash == other._hash
+                and self.parameters == other.parameters)
+
+    def __hash__(self) -> int:
+        if self._hash is None:
+            raise TypeError(f"unhashable attribute parameters: "
+                            f"{self.parameters}")
+        return self._hash
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return (type(self).new, (self.parameters, ))
 
     @classmethod
-    def new(cls: type[_PA], params: list[Attribute]) -> _PA:
+    def new(cls: type[_PA], params: Sequence[Attribute]) -> _PA:
         """
         Create a new `ParametrizedAttribute` given its parameters.
 
@@ -386,8 +662,8 @@ class ParametrizedAttribute(Attribute):
 
         # Call the __init__ of ParametrizedAttribute, which will set the
         # parameters field.
-        ParametrizedAttribute.__init__(attr, params)
-        return attr
+        ParametrizedAttribute.__init__(attr, tuple(params))
+        return attr._get_uniqued()
 
     @staticmethod
     def parse_parameters(parser: BaseParser) -> list[Attribute]:
@@ -411,7 +687,12 @@ class ParametrizedAttribute(Attribute):
         ...
 
 
-@dataclass
+# IR nodes are slotted dataclasses. Their fields that are not set by
+# `__init__` use a `default_factory` rather than a `default`, so that they are
+# still initialized by the `__init__` of non-slotted dataclass subclasses.
+
+
+@dataclass(slots=True)
 class IRNode(ABC):
 
     parent: IRNode | None
@@ -438,6 +719,72 @@ class IRNode(ABC):
         """Check if two IR nodes are structurally equivalent."""
         ...
 
+    @overload
+    def walk(self, fun: Callable[[Operation], None]) -> None:
+        ...
+
+    @overload
+    def walk(
+        self,
+        *,
+        reverse: bool = False,
+        post_order: bool = False,
+        op_type: None = None,
+        skip_regions: Callable[[Operation], bool] | None = None
+    ) -> Iterator[Operation]:
+        ...
+
+    @overload
+    def walk(
+        self,
+        *,
+        reverse: bool = False,
+        post_order: bool = False,
+        op_type: type[OpT],
+        skip_regions: Callable[[Operation], bool] | None = None
+    ) -> Iterator[OpT]:
+        ...
+
+    def walk(
+        self,
+        fun: Callable[[Operation], None] | None = None,
+        *,
+        reverse: bool = False,
+        post_order: bool = False,
+        op_type: type[OpT] | None = None,
+        skip_regions: Callable[[Operation], bool] | None = None
+    ) -> Iterator[Operation] | None:
+        """
+        Iterate over all operations contained in the node, including the node
+        itself if it is an operation.
+        If `reverse` is True, regions, blocks and operations are visited in
+        reverse order. If `post_order` is True, operations are yielded after
+        their regions. If `op_type` is set, only operations of this type are
+        yielded. The regions of operations for which `skip_regions` returns
+        True are not visited. The operation that was just yielded can be
+        erased during the walk.
+
+        Passing a function `fun` is deprecated. It is then called on each
+        operation, in pre-order, and nothing is returned.
+        """
+        stack = self._walk_stack(reverse)
+        if fun is None:
+            return _walk_ops(stack, reverse, post_order, op_type,
+                             skip_regions)
+        warnings.warn(
+            "Calling walk with a function is deprecated, iterate over the "
+            "operations returned by walk instead.",
+            DeprecationWarning,
+            stacklevel=2)
+        for op in _walk_ops(stack, False, False, Operation, None):
+            fun(op)
+        return None
+
+    @abstractmethod
+    def _walk_stack(self, reverse: bool) -> list[tuple[Operation, int]]:
+        """Get the initial stack of `_walk_ops` to walk the node."""
+        ...
+
     @abstractmethod
     def __eq__(self, other: object) -> bool:
         ...
@@ -447,34 +794,136 @@ class IRNode(ABC):
         ...
 
 
-@dataclass
+# Kinds of entries in the stack of `_walk_ops`.
+_WALK_VISIT = 0
+"""Visit the operation."""
+_WALK_VISIT_SIBLINGS = 1
+"""Visit the operation, then the following operations in its block."""
+_WALK_EXIT = 2
+"""Yield the operation after its regions were visited, in post-order."""
+
+
+def _walk_ops(stack: list[tuple[Operation, int]], reverse: bool,
+              post_order: bool, op_type: type[OpT] | None,
+              skip_regions: Callable[[Operation], bool] | None
+              ) -> Iterator[OpT]:
+    """
+    Walk operations using an explicit stack rather than recursion.
+    The next operation in a block is read before the current operation is
+    yielded, so the current operation can be erased during the walk.
+    """
+    while stack:
+        op, kind = stack.pop()
+        if kind == _WALK_EXIT:
+            if op_type is None or isinstance(op, op_type):
+                yield cast(OpT, op)
+            continue
+
+        if kind == _WALK_VISIT_SIBLINGS:
+            sibling = op._prev_op if reverse else op._next_op
+            if sibling is not None:
+                stack.append((sibling, _WALK_VISIT_SIBLINGS))
+
+        if post_order:
+            stack.append((op, _WALK_EXIT))
+        elif op_type is None or isinstance(op, op_type):
+            parent = op.parent
+            yield cast(OpT, op)
+            # The operation was erased or moved while the walk was suspended.
+            if op.parent is not parent:
+                continue
+
+        if not op.regions or (skip_regions is not None
+                              and skip_regions(op)):
+            continue
+        # Entries are pushed in reverse order, as the stack is LIFO.
+        for region in (op.regions if reverse else reversed(op.regions)):
+            for block in (region.blocks
+                          if reverse else reversed(region.blocks)):
+                first_op = block._last_op if reverse else block._first_op
+                if first_op is not None:
+                    stack.append((first_op, _WALK_VISIT_SIBLINGS))
+
+
+@dataclass(slots=True)
 class Operation(IRNode):
     """A generic operation. Operation definitions inherit this class."""
 
-    name: str = field(default="", init=False)
+    name = ""
     """The operation name. Should be a static member of the class"""
 
     _operands: tuple[SSAValue, ...] = field(default_factory=lambda: ())
     """The operation operands."""
 
+    _operand_uses: tuple[Use, ...] = field(default_factory=lambda: (),
+                                           init=False,
+                                           repr=False)
+    """The uses owned by the operation, one per operand."""
+
     results: list[OpResult] = field(default_factory=list)
     """The results created by the operation."""
 
-    successors: list[Block] = field(default_factory=list)
+    successors: Sequence[Block] = ()
     """
     The basic blocks that the operation may give control to.
     This list should be empty for non-terminator operations.
+    Operations without successors share the same empty tuple.
     """
 
     attributes: dict[str, Attribute] = field(default_factory=dict)
     """The attributes attached to the operation."""
 
-    regions: list[Region] = field(default_factory=list)
-    """Regions arguments of the operation."""
+    regions: Sequence[Region] = ()
+    """
+    Regions arguments of the operation.
+    Operations without regions share the same empty tuple.
+    """
 
     parent: Block | None = field(default=None, repr=False)
     """The block containing this operation."""
 
+    _prev_op: Operation | None = field(default_factory=lambda: None,
+                                       init=False, repr=False)
+    """The previous operation in the parent block."""
+
+    _next_op: Operation | None = field(default_factory=lambda: None,
+                                       init=False, repr=False)
+    """The next operation in the parent block."""
+
+    _order_index: int = field(default_factory=lambda: 0, init=False,
+                              repr=False)
+    """
+    The relative position of the operation in its parent block.
+    Only meaningful when the parent block has a valid operation order.
+    """
+
+    _shape_hash: _StructuralHash | None = field(
+        default_factory=lambda: None, init=False, repr=False)
+    """Cached shape hash of the operation, see `_get_shape_hash`."""
+
+    @property
+    def prev_op(self) -> Operation | None:
+        """The operation placed right before this one in its block, if any."""
+        return self._prev_op
+
+    @property
+    def next_op(self) -> Operation | None:
+        """The operation placed right after this one in its block, if any."""
+        return self._next_op
+
+    def is_before_in_block(self, other: Operation) -> bool:
+        """
+        Return true if the operation is placed before `other` in their block.
+        Both operations should be in the same block.
+        """
+        block = self.parent
+        if block is None or other.parent is not block:
+            raise ValueError(
+                "Operations should be in the same block to be compared.")
+        if not block._op_order_valid:
+            block._recompute_op_order()
+        return self._order_index < other._order_index
+
     def parent_op(self) -> Operation | None:
         if p := self.parent_region():
             return p.parent
@@ -493,14 +942,27 @@ class Operation(IRNode):
         return self._operands
 
     @operands.setter
-    def operands(self, new: list[SSAValue] | tuple[SSAValue, ...]):
-        if isinstance(new, list):
-            new = tuple(new)
-        for idx, operand in enumerate(self._operands):
-            operand.remove_use(Use(self, idx))
-        for idx, operand in enumerate(new):
-            operand.add_use(Use(self, idx))
+    def operands(self, new: Sequence[SSAValue]):
+        new = tuple(new)
+        old = self._operands
+        uses = self._operand_uses
+        # Only relink the uses of operands that changed
+        for idx in range(min(len(old), len(new))):
+            if old[idx] is not new[idx]:
+                old[idx].remove_use(uses[idx])
+                new[idx].add_use(uses[idx])
+        if len(old) > len(new):
+            for idx in range(len(new), len(old)):
+                old[idx].remove_use(uses[idx])
+            self._operand_uses = uses[:len(new)]
+        elif len(old) < len(new):
+            new_uses = tuple(
+                Use(self, idx) for idx in range(len(old), len(new)))
+            for use in new_uses:
+                new[use.index].add_use(use)
+            self._operand_uses = uses + new_uses
         self._operands = new
+        _invalidate_shape_hash(self)
 
     def __post_init__(self):
         assert (self.name != "")
@@ -563,17 +1025,28 @@ class Operation(IRNode):
 
     def replace_operand(self, operand_idx: int, new_operand: SSAValue) -> None:
         """Replace an operand with another operand."""
-        self.operands = list(self._operands[:operand_idx]) + [
-            new_operand
-        ] + list(self._operands[operand_idx + 1:])
+        old_operand = self._operands[operand_idx]
+        if old_operand is new_operand:
+            return
+        use = self._operand_uses[operand_idx]
+        old_operand.remove_use(use)
+        new_operand.add_use(use)
+        self._operands = (*self._operands[:operand_idx], new_operand,
+                          *self._operands[operand_idx + 1:])
+        _invalidate_shape_hash(self)
 
     def add_region(self, region: Region) -> None:
         """Add an unattached region to the operation."""
         if region.parent:
             raise Exception(
                 "Cannot add region that is already attached on an operation.")
-        self.regions.append(region)
+        self.regions = [*self.regions, region]
         region.parent = self
+        _invalidate_shape_hash(self)
+        if (index := _get_op_index(self)) is not None:
+            for block in region.blocks:
+                for op in block.ops:
+                    index._add_nested(op)
 
     def drop_all_references(self) -> None:
         """
@@ -581,18 +1054,14 @@ class Operation(IRNode):
         This function is called prior to deleting an operation.
         """
         self.parent = None
-        for idx, operand in enumerate(self.operands):
-            operand.remove_use(Use(self, idx))
+        for operand, use in zip(self._operands, self._operand_uses):
+            if use._is_linked_to(operand):
+                operand.remove_use(use)
         for region in self.regions:
             region.drop_all_references()
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """
-        Call a function on all operations contained in the operation (including this one)
-        """
-        fun(self)
-        for region in self.regions:
-            region.walk(fun)
+    def _walk_stack(self, reverse: bool) -> list[tuple[Operation, int]]:
+        return [(self, _WALK_VISIT)]
 
     def verify(self, verify_nested_ops: bool = True) -> None:
         for operand in self.operands:
@@ -633,24 +1102,7 @@ class Operation(IRNode):
             value_mapper = {}
         if block_mapper is None:
             block_mapper = {}
-        operands = [
-            (value_mapper[operand] if operand in value_mapper else operand)
-            for operand in self.operands
-        ]
-        result_types = [res.typ for res in self.results]
-        attributes = self.attributes.copy()
-        successors = [(block_mapper[successor]
-                       if successor in block_mapper else successor)
-                      for successor in self.successors]
-        regions = [Region() for _ in self.regions]
-        cloned_op = self.create(operands=operands,
-                                result_types=result_types,
-                                attributes=attributes,
-                                successors=successors,
-                                regions=regions)
-        for idx, result in enumerate(cloned_op.results):
-            value_mapper[self.results[idx]] = result
-        return cloned_op
+        return _clone_op_without_regions(self, value_mapper, block_mapper)
 
     def clone(self: OpT,
               value_mapper: dict[SSAValue, SSAValue] | None = None,
@@ -660,9 +1112,13 @@ class Operation(IRNode):
             value_mapper = {}
         if block_mapper is None:
             block_mapper = {}
-        op = self.clone_without_regions(value_mapper, block_mapper)
-        for idx, region in enumerate(self.regions):
-            region.clone_into(op.regions[idx], 0, value_mapper, block_mapper)
+        op = _clone_op_without_regions(self, value_mapper, block_mapper)
+        for region, new_region in zip(self.regions, op.regions):
+            new_blocks = _clone_blocks(region.blocks, value_mapper,
+                                       block_mapper)
+            for block in new_blocks:
+                block.parent = new_region
+            new_region.blocks = new_blocks
         return op
 
     def erase(self,
@@ -696,10 +1152,12 @@ class Operation(IRNode):
         to be equivalent. This enables checking whether the use dependencies and
         successors are equivalent.
         """
-        if context is None:
-            context = {}
         if not isinstance(other, Operation):
             return False
+        if context is None:
+            if _get_shape_hash(self)[0] != _get_shape_hash(other)[0]:
+                return False
+            context = {}
         if self.name != other.name:
             return False
         if len(self.operands) != len(other.operands) or \
@@ -708,6 +1166,9 @@ class Operation(IRNode):
            len(self.successors) != len(other.successors) or \
            self.attributes != other.attributes:
             return False
+        if any(result.typ != other_result.typ
+               for result, other_result in zip(self.results, other.results)):
+            return False
         if self.parent and other.parent and context.get(
                 self.parent) != other.parent:
             return False
@@ -729,11 +1190,18 @@ class Operation(IRNode):
 
         return True
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
+    def structural_hash(self) -> int:
+        """
+        Get a hash of the operation structure, such that structurally
+        equivalent operations have the same hash.
+        The hash does not depend on the identity of the values used, but on
+        the position of their definitions. It is recomputed on each call, and
+        is only stable within a process.
+        """
+        return _StructuralHasher(_hash_nested_regions(self)).hash_op(self)
 
-    def __hash__(self) -> int:
-        return id(self)
+    __eq__ = object.__eq__  # type: ignore
+    __hash__ = object.__hash__  # type: ignore
 
     def __str__(self) -> str:
         from xdsl.printer import Printer
@@ -759,7 +1227,84 @@ class Operation(IRNode):
         return None
 
 
-@dataclass()
+class BlockOps(Sequence[Operation]):
+    """
+    A read-only, list-compatible view over the operations of a block.
+    The operations are stored in an intrusive doubly-linked list, this view
+    only walks over it. Random access is served from a cache that is rebuilt
+    lazily after the block is modified.
+    """
+
+    block: Block
+
+    def __init__(self, block: Block):
+        self.block = block
+
+    def __iter__(self) -> Iterator[Operation]:
+        op = self.block.first_op
+        while op is not None:
+            next_op = op.next_op
+            yield op
+            op = next_op
+
+    def __reversed__(self) -> Iterator[Operation]:
+        op = self.block.last_op
+        while op is not None:
+            prev_op = op.prev_op
+            yield op
+            op = prev_op
+
+    def __len__(self) -> int:
+        return self.block._num_ops
+
+    def __bool__(self) -> bool:
+        return self.block.first_op is not None
+
+    def __contains__(self, op: object) -> bool:
+        return isinstance(op, Operation) and op.parent is self.block
+
+    @overload
+    def __getitem__(self, index: int) -> Operation:
+        ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Operation]:
+        ...
+
+    def __getitem__(self, index: int | slice) -> Operation | list[Operation]:
+        if isinstance(index, int):
+            if index == 0 or index == -len(self):
+                if (op := self.block.first_op) is not None:
+                    return op
+            if index == -1 or index == len(self) - 1:
+                if (op := self.block.last_op) is not None:
+                    return op
+        return self.block._get_ops_list()[index]
+
+    def index(self, op: Any, start: int = 0, stop: int | None = None) -> int:
+        if not isinstance(op, Operation) or op.parent is not self.block:
+            raise ValueError(f"{op} is not in the block")
+        return self.block.get_operation_index(op)
+
+    def copy(self) -> list[Operation]:
+        """Get the operations of the block as a new list."""
+        return list(self)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, BlockOps):
+            return self.block is other.block or list(self) == list(other)
+        if isinstance(other, (list, tuple)):
+            return list(self) == list(cast(Sequence[Any], other))
+        return False
+
+    def __hash__(self) -> int:
+        return id(self.block)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+@dataclass(slots=True)
 class Block(IRNode):
     """A sequence of operations"""
 
@@ -769,12 +1314,73 @@ class Block(IRNode):
                                              init=False)
     """The basic block arguments."""
 
-    ops: list[Operation] = field(default_factory=list, init=False)
-    """Ordered operations contained in the block."""
+    _first_op: Operation | None = field(default_factory=lambda: None,
+                                        init=False, repr=False)
+    """The first operation of the block."""
+
+    _last_op: Operation | None = field(default_factory=lambda: None,
+                                       init=False, repr=False)
+    """The last operation of the block."""
 
-    parent: Region | None = field(default=None, init=False, repr=False)
+    _num_ops: int = field(default_factory=lambda: 0, init=False, repr=False)
+    """The number of operations in the block."""
+
+    _op_order_valid: bool = field(default_factory=lambda: True, init=False,
+                                  repr=False)
+    """Are the `_order_index` of the block operations up to date."""
+
+    _ops_list: list[Operation] | None = field(default=None,
+                                              init=False,
+                                              repr=False)
+    """Cached list of the block operations, used for indexed accesses."""
+
+    _shape_hash: _StructuralHash | None = field(
+        default_factory=lambda: None, init=False, repr=False)
+    """Cached shape hash of the block, see `_get_shape_hash`."""
+
+    parent: Region | None = field(default_factory=lambda: None, init=False,
+                                  repr=False)
     """Parent region containing the block."""
 
+    _ORDER_STRIDE: ClassVar[int] = 5
+    """The gap left between the order indices of consecutive operations."""
+
+    @property
+    def ops(self) -> BlockOps:
+        """Ordered operations contained in the block."""
+        return BlockOps(self)
+
+    @property
+    def first_op(self) -> Operation | None:
+        """The first operation of the block, if any."""
+        return self._first_op
+
+    @property
+    def last_op(self) -> Operation | None:
+        """The last operation of the block, if any."""
+        return self._last_op
+
+    @property
+    def is_empty(self) -> bool:
+        """Check if the block contains no operations."""
+        return self._first_op is None
+
+    def _get_ops_list(self) -> list[Operation]:
+        """Get the cached list of the block operations."""
+        if self._ops_list is None:
+            self._ops_list = list(self.ops)
+        return self._ops_list
+
+    def _recompute_op_order(self) -> None:
+        """Renumber the order indices of all operations in the block."""
+        index = 0
+        op = self._first_op
+        while op is not None:
+            op._order_index = index
+            index += Block._ORDER_STRIDE
+            op = op._next_op
+        self._op_order_valid = True
+
     def parent_op(self) -> Operation | None:
         return self.parent.parent if self.parent else None
 
@@ -785,7 +1391,7 @@ class Block(IRNode):
         return self.parent.parent.parent if self.parent and self.parent.parent else None
 
     def __repr__(self) -> str:
-        return f"Block(_args={repr(self._args)}, num_ops={len(self.ops)})"
+        return f"Block(_args={repr(self._args)}, num_ops={self._num_ops})"
 
     @property
     def args(self) -> tuple[BlockArgument, ...]:
@@ -801,7 +1407,7 @@ class Block(IRNode):
         return b
 
     @staticmethod
-    def from_ops(ops: list[Operation],
+    def from_ops(ops: Iterable[Operation],
                  arg_types: list[Attribute] | None = None):
         b = Block()
         if arg_types:
@@ -834,6 +1440,7 @@ class Block(IRNode):
             arg.index += 1
         self._args = tuple(
             chain(self._args[:index], [new_arg], self._args[index:]))
+        _invalidate_shape_hash(self)
         return new_arg
 
     def erase_arg(self, arg: BlockArgument, safe_erase: bool = True) -> None:
@@ -849,6 +1456,7 @@ class Block(IRNode):
             block_arg.index -= 1
         self._args = tuple(
             chain(self._args[:arg.index], self._args[arg.index + 1:]))
+        _invalidate_shape_hash(self)
         arg.erase(safe_erase=safe_erase)
 
     def _attach_op(self, operation: Operation) -> None:
@@ -862,6 +1470,63 @@ class Block(IRNode):
                 "Can't add an operation to a block contained in the operation."
             )
         operation.parent = self
+        _invalidate_shape_hash(self)
+        if (index := _get_op_index(self)) is not None:
+            index._add_nested(operation)
+
+    def _link_op(self, operation: Operation, prev_op: Operation | None,
+                 next_op: Operation | None) -> None:
+        """
+        Link an attached operation in the operation list, between `prev_op`
+        and `next_op`.
+        """
+        operation._prev_op = prev_op
+        operation._next_op = next_op
+        if prev_op is None:
+            self._first_op = operation
+        else:
+            prev_op._next_op = operation
+        if next_op is None:
+            self._last_op = operation
+            if self.parent is not None:
+                self.parent._cfg_version += 1
+        else:
+            next_op._prev_op = operation
+        self._num_ops += 1
+        self._ops_list = None
+
+        # Keep the order indices valid when there is room for a new index
+        if self._op_order_valid:
+            if prev_op is None and next_op is None:
+                operation._order_index = 0
+            elif next_op is None:
+                assert prev_op is not None
+                operation._order_index = prev_op._order_index + Block._ORDER_STRIDE
+            elif prev_op is None:
+                operation._order_index = next_op._order_index - Block._ORDER_STRIDE
+            elif next_op._order_index - prev_op._order_index > 1:
+                operation._order_index = (prev_op._order_index +
+                                          next_op._order_index) // 2
+            else:
+                self._op_order_valid = False
+
+    def _unlink_op(self, operation: Operation) -> None:
+        """Remove an operation from the operation list."""
+        prev_op, next_op = operation._prev_op, operation._next_op
+        if prev_op is None:
+            self._first_op = next_op
+        else:
+            prev_op._next_op = next_op
+        if next_op is None:
+            self._last_op = prev_op
+            if self.parent is not None:
+                self.parent._cfg_version += 1
+        else:
+            next_op._prev_op = prev_op
+        operation._prev_op = None
+        operation._next_op = None
+        self._num_ops -= 1
+        self._ops_list = None
 
     def add_op(self, operation: Operation) -> None:
         """
@@ -869,9 +1534,9 @@ class Block(IRNode):
         The operation should not be attached to another block already.
         """
         self._attach_op(operation)
-        self.ops.append(operation)
+        self._link_op(operation, self._last_op, None)
 
-    def add_ops(self, ops: list[Operation]) -> None:
+    def add_ops(self, ops: Iterable[Operation]) -> None:
         """
         Add operations at the end of the block.
         The operations should not be attached to another block.
@@ -879,6 +1544,49 @@ class Block(IRNode):
         for op in ops:
             self.add_op(op)
 
+    def insert_op_before(self, new_op: Operation,
+                         existing_op: Operation) -> None:
+        """
+        Insert an operation before another operation of the block.
+        The operation should not be attached to another block.
+        """
+        if existing_op.parent is not self:
+            raise ValueError("Can't insert an operation before an operation "
+                             "that is not in the block.")
+        self._attach_op(new_op)
+        self._link_op(new_op, existing_op._prev_op, existing_op)
+
+    def insert_op_after(self, new_op: Operation,
+                        existing_op: Operation) -> None:
+        """
+        Insert an operation after another operation of the block.
+        The operation should not be attached to another block.
+        """
+        if existing_op.parent is not self:
+            raise ValueError("Can't insert an operation after an operation "
+                             "that is not in the block.")
+        self._attach_op(new_op)
+        self._link_op(new_op, existing_op, existing_op._next_op)
+
+    def insert_ops_before(self, ops: Sequence[Operation],
+                          existing_op: Operation) -> None:
+        """
+        Insert operations before another operation of the block.
+        The operations should not be attached to another block.
+        """
+        for op in ops:
+            self.insert_op_before(op, existing_op)
+
+    def insert_ops_after(self, ops: Sequence[Operation],
+                         existing_op: Operation) -> None:
+        """
+        Insert operations after another operation of the block.
+        The operations should not be attached to another block.
+        """
+        for op in ops:
+            self.insert_op_after(op, existing_op)
+            existing_op = op
+
     def insert_op(self,
                   ops: Operation | list[Operation],
                   index: int,
@@ -887,43 +1595,46 @@ class Block(IRNode):
         Insert one or multiple operations at a given index in the block.
         The operations should not be attached to another block.
         """
-        if index < 0 or index > len(self.ops):
+        if index < 0 or index > self._num_ops:
             raise ValueError(
                 f"Can't insert operation in index {index} in a block with "
-                f"{len(self.ops)} operations.")
+                f"{self._num_ops} operations.")
         if not isinstance(ops, list):
             ops = [ops]
         if name:
             for curr_op in ops:
                 for res in curr_op.results:
                     res.name = name
-        for op in ops:
-            self._attach_op(op)
-        self.ops = self.ops[:index] + ops + self.ops[index:]
+        if index == self._num_ops:
+            self.add_ops(ops)
+        else:
+            self.insert_ops_before(ops, self.ops[index])
 
     def get_operation_index(self, op: Operation) -> int:
         """Get the operation position in a block."""
         if op.parent is not self:
             raise Exception("Operation is not a children of the block.")
-        for idx, block_op in enumerate(self.ops):
-            if block_op is op:
-                return idx
-        assert False, "Unexpected xdsl error"
+        idx = 0
+        prev_op = op._prev_op
+        while prev_op is not None:
+            idx += 1
+            prev_op = prev_op._prev_op
+        return idx
 
     def detach_op(self, op: int | Operation) -> Operation:
         """
         Detach an operation from the block.
         Returns the detached operation.
         """
-        if isinstance(op, Operation):
-            op_idx = self.get_operation_index(op)
-        else:
-            op_idx = op
-            op = self.ops[op_idx]
+        if not isinstance(op, Operation):
+            op = self.ops[op]
         if op.parent is not self:
             raise Exception("Cannot detach operation from a different block.")
+        if (index := _get_op_index(self)) is not None:
+            index._remove_nested(op)
+        self._unlink_op(op)
         op.parent = None
-        self.ops = self.ops[:op_idx] + self.ops[op_idx + 1:]
+        _invalidate_shape_hash(self)
         return op
 
     def erase_op(self, op: int | Operation, safe_erase: bool = True) -> None:
@@ -934,18 +1645,25 @@ class Block(IRNode):
         op = self.detach_op(op)
         op.erase(safe_erase=safe_erase)
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """Call a function on all operations contained in the block."""
-        for op in self.ops:
-            op.walk(fun)
+    def _walk_stack(self, reverse: bool) -> list[tuple[Operation, int]]:
+        first_op = self._last_op if reverse else self._first_op
+        if first_op is None:
+            return []
+        return [(first_op, _WALK_VISIT_SIBLINGS)]
 
-    def verify(self) -> None:
+    def verify(self, verified_ops: AbstractSet[Operation] = frozenset()
+               ) -> None:
+        """
+        Verify the block operations, except those in `verified_ops` that are
+        already known to be valid.
+        """
         for operation in self.ops:
             if operation.parent != self:
                 raise Exception(
                     "Parent pointer of operation does not refer to containing region"
                 )
-            operation.verify()
+            if operation not in verified_ops:
+                operation.verify()
 
     def drop_all_references(self) -> None:
         """
@@ -979,10 +1697,12 @@ class Block(IRNode):
         to be equivalent. This enables checking whether the use dependencies and
         successors are equivalent.
         """
-        if context is None:
-            context = {}
         if not isinstance(other, Block):
             return False
+        if context is None:
+            if _get_shape_hash(self)[0] != _get_shape_hash(other)[0]:
+                return False
+            context = {}
         if len(self.args) != len(other.args) or \
            len(self.ops) != len(other.ops):
             return False
@@ -999,23 +1719,51 @@ class Block(IRNode):
 
         return True
 
-    def __eq__(self, other: object) -> bool:
-        return self is other
+    def structural_hash(self) -> int:
+        """
+        Get a hash of the block structure, such that structurally equivalent
+        blocks have the same hash.
+        The hash does not depend on the identity of the values used, but on
+        the position of their definitions. It is recomputed on each call, and
+        is only stable within a process.
+        """
+        return _StructuralHasher(_hash_nested_regions(self)).hash_blocks(
+            [self])[0]
 
-    def __hash__(self) -> int:
-        return id(self)
+    __eq__ = object.__eq__  # type: ignore
+    __hash__ = object.__hash__  # type: ignore
 
 
-@dataclass
+@dataclass(slots=True)
 class Region(IRNode):
     """A region contains a CFG of blocks. Regions are contained in operations."""
 
     blocks: list[Block] = field(default_factory=list, init=False)
     """Blocks contained in the region. The first block is the entry block."""
 
-    parent: Operation | None = field(default=None, init=False, repr=False)
+    parent: Operation | None = field(default_factory=lambda: None, init=False,
+                                     repr=False)
     """Operation containing the region."""
 
+    _cfg_version: int = field(default_factory=lambda: 0, init=False,
+                              repr=False)
+    """
+    A counter incremented when the blocks of the region, or their last
+    operations, change. It is used to invalidate control-flow analyses.
+    """
+
+    _shape_hash: _StructuralHash | None = field(
+        default_factory=lambda: None, init=False, repr=False)
+    """Cached shape hash of the region, see `_get_shape_hash`."""
+
+    @property
+    def cfg_version(self) -> int:
+        """
+        A counter incremented when the blocks of the region, or their last
+        operations, change.
+        """
+        return self._cfg_version
+
     def parent_block(self) -> Block | None:
         return self.parent.parent if self.parent else None
 
@@ -1056,7 +1804,7 @@ class Region(IRNode):
         raise TypeError(f"Can't build a region with argument {arg}")
 
     @property
-    def ops(self) -> list[Operation]:
+    def ops(self) -> BlockOps:
         """
         Get the operations of a single-block region.
         Returns an exception if the region is not single-block.
@@ -1076,7 +1824,9 @@ class Region(IRNode):
         if len(self.blocks) != 1 or len(self.blocks[0].ops) != 1:
             raise ValueError("'op' property of Region class is only available "
                              "for single-operation single-block regions.")
-        return self.blocks[0].ops[0]
+        op = self.blocks[0].first_op
+        assert op is not None
+        return op
 
     def _attach_block(self, block: Block) -> None:
         """Attach a block to the region, and check that it has no parents."""
@@ -1087,6 +1837,11 @@ class Region(IRNode):
             raise ValueError(
                 "Can't add a block to a region contained in the block.")
         block.parent = self
+        self._cfg_version += 1
+        _invalidate_shape_hash(self)
+        if (index := _get_op_index(self)) is not None:
+            for op in block.ops:
+                index._add_nested(op)
 
     def add_block(self, block: Block) -> None:
         """Add a block to the region."""
@@ -1127,7 +1882,12 @@ class Region(IRNode):
         else:
             block_idx = block
             block = self.blocks[block_idx]
+        if (index := _get_op_index(self)) is not None:
+            for op in block.ops:
+                index._remove_nested(op)
         block.parent = None
+        self._cfg_version += 1
+        _invalidate_shape_hash(self)
         self.blocks = self.blocks[:block_idx] + self.blocks[block_idx + 1:]
         return block
 
@@ -1155,25 +1915,26 @@ class Region(IRNode):
         if block_mapper is None:
             block_mapper = {}
 
-        for block in self.blocks:
-            new_block = Block()
-            block_mapper[block] = new_block
-            for idx, block_arg in enumerate(block.args):
-                new_block.insert_arg(block_arg.typ, idx)
-                value_mapper[block_arg] = new_block.args[idx]
-            for op in block.ops:
-                new_block.add_op(op.clone(value_mapper, block_mapper))
-            dest.insert_block(new_block, insert_index)
-            insert_index += 1
+        new_blocks = _clone_blocks(self.blocks, value_mapper, block_mapper)
+        if new_blocks:
+            dest.insert_block(new_blocks, insert_index)
 
-    def walk(self, fun: Callable[[Operation], None]) -> None:
-        """Call a function on all operations contained in the region."""
-        for block in self.blocks:
-            block.walk(fun)
+    def _walk_stack(self, reverse: bool) -> list[tuple[Operation, int]]:
+        stack: list[tuple[Operation, int]] = []
+        for block in (self.blocks if reverse else reversed(self.blocks)):
+            first_op = block._last_op if reverse else block._first_op
+            if first_op is not None:
+                stack.append((first_op, _WALK_VISIT_SIBLINGS))
+        return stack
 
-    def verify(self) -> None:
+    def verify(self, verified_ops: AbstractSet[Operation] = frozenset()
+               ) -> None:
+        """
+        Verify the region blocks, except the operations in `verified_ops`
+        that are already known to be valid.
+        """
         for block in self.blocks:
-            block.verify()
+            block.verify(verified_ops)
             if block.parent != self:
                 raise Exception(
                     "Parent pointer of block does not refer to containing region"
@@ -1200,10 +1961,22 @@ class Region(IRNode):
         """
         Move the blocks of this region to another region. Leave no blocks in this region.
         """
+        if (index := _get_op_index(self)) is not None:
+            for block in self.blocks:
+                for op in block.ops:
+                    index._remove_nested(op)
         region.blocks = self.blocks
         self.blocks = []
         for block in region.blocks:
             block.parent = region
+        self._cfg_version += 1
+        region._cfg_version += 1
+        _invalidate_shape_hash(self)
+        _invalidate_shape_hash(region)
+        if (index := _get_op_index(region)) is not None:
+            for block in region.blocks:
+                for op in block.ops:
+                    index._add_nested(op)
 
     def is_structurally_equivalent(
         self,
@@ -1216,10 +1989,12 @@ class Region(IRNode):
         to be equivalent. This enables checking whether the use dependencies and
         successors are equivalent.
         """
-        if context is None:
-            context = {}
         if not isinstance(other, Region):
             return False
+        if context is None:
+            if _get_shape_hash(self)[0] != _get_shape_hash(other)[0]:
+                return False
+            context = {}
         if len(self.blocks) != len(other.blocks):
             return False
         # register all blocks in the context so we can check whether ops have
@@ -1231,3 +2006,554 @@ class Region(IRNode):
                 for block, other_block in zip(self.blocks, other.blocks)):
             return False
         return True
+
+    def structural_hash(self) -> int:
+        """
+        Get a hash of the region structure, such that structurally equivalent
+        regions have the same hash.
+        The hash does not depend on the identity of the values used, but on
+        the position of their definitions. It is recomputed on each call, and
+        is only stable within a process.
+        """
+        return _StructuralHasher(_hash_nested_regions(self)).hash_blocks(
+            self.blocks)[0]
+
+    __eq__ = object.__eq__  # type: ignore
+    __hash__ = object.__hash__  # type: ignore
+
+
+# Structural hashing
+#
+# The structural hash of a region or block is computed from its operations,
+# with the values they use numbered by the position of their definition.
+# Values defined outside of the region or block are numbered by the order in
+# which they are first used, and are returned with the hash, so that the
+# hash of an enclosing region can number them in turn.
+
+_StructuralHash: TypeAlias = tuple[int, tuple[SSAValue, ...]]
+"""A structural hash, and the values used but not defined in the hashed IR."""
+
+
+def _attribute_hash(attr: Attribute) -> int:
+    """Hash an attribute, or its type when it is not hashable."""
+    try:
+        return hash(attr)
+    except TypeError:
+        return hash(type(attr))
+
+
+def _hash_nested_regions(node: IRNode) -> dict[Region, _StructuralHash]:
+    """
+    Hash the regions nested in an IR node, innermost first, so that they are
+    hashed without recursion.
+    """
+    region_hashes: dict[Region, _StructuralHash] = {}
+    for op in node.walk(post_order=True):
+        for region in op.regions:
+            region_hashes[region] = _StructuralHasher(
+                region_hashes).hash_blocks(region.blocks)
+    return region_hashes
+
+
+class _StructuralHasher:
+    """Compute the structural hash of operations or blocks."""
+
+    value_numbers: dict[SSAValue, int]
+    """The values defined in the hashed IR, by position."""
+
+    captured_values: dict[SSAValue, int]
+    """The values used but not defined in the hashed IR, by first use."""
+
+    block_numbers: dict[Block, int]
+    """The hashed blocks, by position."""
+
+    region_hashes: dict[Region, _StructuralHash]
+    """The hashes of the regions nested in the hashed IR."""
+
+    def __init__(self, region_hashes: dict[Region, _StructuralHash]):
+        self.region_hashes = region_hashes
+        self.value_numbers = {}
+        self.captured_values = {}
+        self.block_numbers = {}
+
+    def value_number(self, value: SSAValue) -> int:
+        number = self.value_numbers.get(value)
+        if number is not None:
+            return number
+        number = self.captured_values.get(value)
+        if number is None:
+            number = self.captured_values[value] = len(self.captured_values)
+        return -1 - number
+
+    def hash_op(self, op: Operation) -> int:
+        value_number = self.value_number
+        regions: list[tuple[int, tuple[int, ...]]] = []
+        for region in op.regions:
+            region_hash, captured_values = self.region_hashes[region]
+            regions.append(
+                (region_hash, tuple(map(value_number, captured_values))))
+        attributes = op.attributes
+        try:
+            attributes_hash = hash(frozenset(attributes.items()))
+        except TypeError:
+            attributes_hash = hash(
+                frozenset((name, _attribute_hash(attr))
+                          for name, attr in attributes.items()))
+        return hash((op.name, attributes_hash,
+                     tuple(_attribute_hash(res.typ) for res in op.results),
+                     tuple(map(value_number, op._operands)),
+                     tuple(
+                         self.block_numbers.get(successor, -1)
+                         for successor in op.successors), tuple(regions)))
+
+    def hash_blocks(self, blocks: Sequence[Block]) -> _StructuralHash:
+        # Number all definitions first, as values may be used before they
+        # are defined, when blocks are not ordered by dominance
+        value_numbers = self.value_numbers
+        for idx, block in enumerate(blocks):
+            self.block_numbers[block] = idx
+            for arg in block._args:
+                value_numbers[arg] = len(value_numbers)
+            op = block._first_op
+            while op is not None:
+                for result in op.results:
+                    value_numbers[result] = len(value_numbers)
+                op = op._next_op
+
+        hashes: list[int | tuple[int, ...]] = []
+        for block in blocks:
+            hashes.append(
+                tuple(_attribute_hash(arg.typ) for arg in block._args))
+            op = block._first_op
+            while op is not None:
+                hashes.append(self.hash_op(op))
+                op = op._next_op
+        return hash(tuple(hashes)), tuple(self.captured_values)
+
+
+# Shape hashing
+#
+# The shape hash of an IR node is a coarser structural hash, covering only
+# what is modified through the methods of operations, blocks and regions:
+# the operation names, numbers of results and block arguments, operands and
+# nesting. Attributes, types and successors, which can be modified in place,
+# are left out. The shape hash of each node is cached, and the cache is
+# invalidated on the node and its ancestors when they are modified, so that
+# structurally equivalent IR always has the same cached shape hash, and
+# `is_structurally_equivalent` can reject different IR without walking it.
+
+
+def _invalidate_shape_hash(node: Operation | Block | Region | None) -> None:
+    """
+    Invalidate the cached shape hash of an IR node and its ancestors.
+    The nodes nested in a node with a cached hash also have a cached hash, so
+    the ancestors of a node without one have none either.
+    """
+    while node is not None and node._shape_hash is not None:
+        node._shape_hash = None
+        node = node.parent
+
+
+def _get_shape_hash(node: Operation | Block | Region) -> _StructuralHash:
+    """
+    Get the shape hash of an IR node, and cache it. The nested nodes without
+    a cached hash are hashed first, innermost first and without recursion.
+    """
+    worklist: list[tuple[Operation | Block | Region, bool]] = [(node, False)]
+    while worklist:
+        current, children_hashed = worklist.pop()
+        if current._shape_hash is not None:
+            continue
+        if children_hashed:
+            current._shape_hash = _ShapeHasher().hash_node(current)
+            continue
+        worklist.append((current, True))
+        children: Iterable[Operation | Block | Region]
+        if isinstance(current, Operation):
+            children = current.regions
+        elif isinstance(current, Block):
+            children = current.ops
+        else:
+            children = current.blocks
+        worklist.extend((child, False) for child in children
+                        if child._shape_hash is None)
+    assert node._shape_hash is not None
+    return node._shape_hash
+
+
+class _ShapeHasher:
+    """Compute the shape hash of an IR node from the hashes of its children."""
+
+    value_numbers: dict[SSAValue, int]
+    """The values defined in the hashed node, by position."""
+
+    captured_values: dict[SSAValue, int]
+    """The values used but not defined in the hashed node, by first use."""
+
+    def __init__(self):
+        self.value_numbers = {}
+        self.captured_values = {}
+
+    def value_number(self, value: SSAValue) -> int:
+        number = self.value_numbers.get(value)
+        if number is not None:
+            return number
+        number = self.captured_values.get(value)
+        if number is None:
+            number = self.captured_values[value] = len(self.captured_values)
+        return -1 - number
+
+    def hash_children(
+        self, children: Iterable[Operation | Block | Region]
+    ) -> tuple[tuple[int, tuple[int, ...]], ...]:
+        value_number = self.value_number
+        hashes: list[tuple[int, tuple[int, ...]]] = []
+        for child in children:
+            assert child._shape_hash is not None
+            child_hash, captured_values = child._shape_hash
+            hashes.append(
+                (child_hash, tuple(map(value_number, captured_values))))
+        return tuple(hashes)
+
+    def number_definitions(self, blocks: Iterable[Block]) -> None:
+        value_numbers = self.value_numbers
+        for block in blocks:
+            for arg in block._args:
+                value_numbers[arg] = len(value_numbers)
+            op = block._first_op
+            while op is not None:
+                for result in op.results:
+                    value_numbers[result] = len(value_numbers)
+                op = op._next_op
+
+    def hash_node(self, node: Operation | Block | Region) -> _StructuralHash:
+        if isinstance(node, Operation):
+            node_hash = hash(
+                (node.name, len(node.results),
+                 tuple(map(self.value_number, node._operands)),
+                 self.hash_children(node.regions)))
+        elif isinstance(node, Block):
+            self.number_definitions([node])
+            node_hash = hash(
+                (len(node._args), self.hash_children(node.ops)))
+        else:
+            self.number_definitions(node.blocks)
+            node_hash = hash(self.hash_children(node.blocks))
+        return node_hash, tuple(self.captured_values)
+
+
+# Cloning
+#
+# Operations are cloned without going through `Operation.create`: their
+# uses, results and regions are created directly, and the cloned operations
+# are linked in their blocks without the checks done when attaching an
+# operation. Nested regions are cloned with a worklist rather than recursion.
+
+
+_default_init_op_types: dict[type[Operation], bool] = {}
+"""Cache of `_has_default_init`."""
+
+
+def _has_default_init(op_type: type[Operation]) -> bool:
+    """
+    Check if an operation type has the fields of `Operation` only, and is
+    initialized like `Operation`, so its `__init__` can be skipped.
+    """
+    has_default_init = _default_init_op_types.get(op_type)
+    if has_default_init is None:
+        has_default_init = (
+            op_type.__post_init__ is Operation.__post_init__
+            and op_type.__dataclass_fields__ == Operation.__dataclass_fields__
+            and all("__dataclass_fields__" in cls.__dict__
+                    for cls in op_type.__mro__ if "__init__" in cls.__dict__
+                    and issubclass(cls, Operation)))
+        _default_init_op_types[op_type] = has_default_init
+    return has_default_init
+
+
+def _clone_op_without_regions(op: OpT, value_mapper: dict[SSAValue, SSAValue],
+                              block_mapper: dict[Block, Block]) -> OpT:
+    """
+    Clone an operation with empty regions, and map its results to the
+    results of the clone.
+    """
+    op_type = type(op)
+    if _has_default_init(op_type):
+        # Set the fields directly rather than calling `__init__`
+        new_op = object.__new__(op_type)
+        new_op._operands = ()
+        new_op._operand_uses = ()
+        new_op.results = []
+        new_op.successors = ()
+        new_op.attributes = {}
+        new_op.regions = ()
+        new_op.parent = None
+        new_op._prev_op = None
+        new_op._next_op = None
+        new_op._order_index = 0
+        new_op._shape_hash = None
+    else:
+        new_op = op_type()
+    if operands := op._operands:
+        new_operands = tuple(
+            [value_mapper.get(operand, operand) for operand in operands])
+        new_uses = tuple([Use(new_op, idx) for idx in range(len(operands))])
+        for operand, use in zip(new_operands, new_uses):
+            operand.add_use(use)
+        new_op._operands = new_operands
+        new_op._operand_uses = new_uses
+    if results := op.results:
+        new_results = [
+            OpResult(result.typ, new_op, idx)
+            for idx, result in enumerate(results)
+        ]
+        new_op.results = new_results
+        value_mapper.update(zip(results, new_results))
+    if op.attributes:
+        new_op.attributes = op.attributes.copy()
+    if op.successors:
+        new_op.successors = [
+            block_mapper.get(successor, successor)
+            for successor in op.successors
+        ]
+    if op.regions:
+        new_regions: list[Region] = []
+        for _ in op.regions:
+            new_region = Region()
+            new_region.parent = new_op
+            new_regions.append(new_region)
+        new_op.regions = new_regions
+    return new_op
+
+
+def _clone_block_args(blocks: Sequence[Block],
+                      value_mapper: dict[SSAValue, SSAValue],
+                      block_mapper: dict[Block, Block]) -> list[Block]:
+    """
+    Create empty blocks with the same arguments as the given blocks, and map
+    the blocks and their arguments to the new ones.
+    """
+    new_blocks: list[Block] = []
+    for block in blocks:
+        new_block = Block()
+        if args := block._args:
+            new_args = tuple([
+                BlockArgument(arg.typ, new_block, idx)
+                for idx, arg in enumerate(args)
+            ])
+            new_block._args = new_args
+            value_mapper.update(zip(args, new_args))
+        block_mapper[block] = new_block
+        new_blocks.append(new_block)
+    return new_blocks
+
+
+def _clone_blocks(blocks: Sequence[Block],
+                  value_mapper: dict[SSAValue, SSAValue],
+                  block_mapper: dict[Block, Block]) -> list[Block]:
+    """
+    Clone blocks with the operations they contain. The new blocks are not
+    attached to a region.
+    All blocks of a region are created before their operations are cloned,
+    so successors referring to later blocks are remapped, and blocks are
+    cloned before the regions nested in them.
+    """
+    new_blocks = _clone_block_args(blocks, value_mapper, block_mapper)
+    worklist = deque(zip(blocks, new_blocks))
+    while worklist:
+        block, new_block = worklist.popleft()
+        op = block._first_op
+        prev_op: Operation | None = None
+        order_index = 0
+        while op is not None:
+            new_op = _clone_op_without_regions(op, value_mapper,
+                                               block_mapper)
+            new_op.parent = new_block
+            new_op._prev_op = prev_op
+            new_op._order_index = order_index
+            if prev_op is None:
+                new_block._first_op = new_op
+            else:
+                prev_op._next_op = new_op
+            for region, new_region in zip(op.regions, new_op.regions):
+                nested_blocks = _clone_block_args(region.blocks,
+                                                  value_mapper, block_mapper)
+                for nested_block in nested_blocks:
+                    nested_block.parent = new_region
+                new_region.blocks = nested_blocks
+                worklist.extend(zip(region.blocks, nested_blocks))
+            prev_op = new_op
+            order_index += Block._ORDER_STRIDE
+            op = op._next_op
+        new_block._last_op = prev_op
+        new_block._num_ops = block._num_ops
+    return new_blocks
+
+
+_op_indices: WeakValueDictionary[Operation, OpIndex] = WeakValueDictionary()
+"""The live operation indices, by the top-level operation they index."""
+
+
+def _get_op_index(node: IRNode) -> OpIndex | None:
+    """Get the operation index of the top-level ancestor of an IR node."""
+    if not _op_indices:
+        return None
+    while node.parent is not None:
+        node = node.parent
+    if not isinstance(node, Operation):
+        return None
+    return _op_indices.get(node)
+
+
+def _get_program_order_key(op: Operation) -> list[int]:
+    """
+    Get a key ordering the operations nested in a top-level operation in the
+    order they are walked. It holds the position of the operation and of its
+    ancestors in their blocks, regions and operations.
+    """
+    key: list[int] = []
+    while (block := op.parent) is not None:
+        if not block._op_order_valid:
+            block._recompute_op_order()
+        key.append(op._order_index)
+        if (region := block.parent) is None:
+            break
+        key.append(region.get_block_index(block))
+        if (parent_op := region.parent) is None:
+            break
+        key.append(next(idx for idx, parent_region in enumerate(
+            parent_op.regions) if parent_region is region))
+        op = parent_op
+    key.reverse()
+    return key
+
+
+class OpIndex:
+    """
+    An index of the operations nested in a top-level operation, by type.
+    The index is updated when operations are attached to or detached from a
+    block nested in the top-level operation, so that the operations of a
+    given type can be found without walking the whole operation.
+    Indices are only maintained while they are referenced, or until they are
+    dropped, as maintaining them slows down every attach and detach. Blocks
+    and regions should only be moved with the methods of `Region` and
+    `Operation`, so that the operations they contain are reindexed.
+    """
+
+    root: Operation
+    """The indexed operation."""
+
+    _ops_by_type: dict[type[Operation], dict[Operation, None]]
+    """The indexed operations, as insertion-ordered sets, by type."""
+
+    _in_program_order: bool
+    """
+    Whether the operations of each type were inserted in program order, which
+    holds until operations are added after the index was created.
+    """
+
+    _lookups: dict[type[Operation] | str, list[Operation]]
+    """
+    The operations returned by the lookups since the index was last modified,
+    by the type or name they were looked up with.
+    """
+
+    def __init__(self, root: Operation):
+        if root.parent is not None:
+            raise ValueError("Only top-level operations can be indexed.")
+        if root in _op_indices:
+            raise ValueError("The operation already has an index.")
+        self.root = root
+        self._ops_by_type = {}
+        self._lookups = {}
+        self._add_nested(root)
+        self._in_program_order = True
+        _op_indices[root] = self
+
+    @staticmethod
+    def of(root: Operation) -> OpIndex:
+        """
+        Get the index of a top-level operation, and create it if it does not
+        exist. Indices are only maintained while they are referenced.
+        """
+        index = _op_indices.get(root)
+        if index is None:
+            index = OpIndex(root)
+        return index
+
+    @staticmethod
+    @contextmanager
+    def scoped(root: Operation) -> Generator[OpIndex, None, None]:
+        """
+        Get the index of a top-level operation in a `with` block. If the
+        index does not exist, it is created and dropped at the end of the
+        block.
+        """
+        index = _op_indices.get(root)
+        if index is not None:
+            yield index
+            return
+        index = OpIndex(root)
+        try:
+            yield index
+        finally:
+            index.drop()
+
+    def _add_nested(self, op: Operation) -> None:
+        """Add an operation and the operations it contains to the index."""
+        self._in_program_order = False
+        self._lookups.clear()
+        for nested_op in op.walk():
+            ops = self._ops_by_type.get(type(nested_op))
+            if ops is None:
+                ops = self._ops_by_type[type(nested_op)] = {}
+            ops[nested_op] = None
+
+    def _remove_nested(self, op: Operation) -> None:
+        """Remove an operation and the operations it contains from the index."""
+        self._lookups.clear()
+        for nested_op in op.walk():
+            ops = self._ops_by_type.get(type(nested_op))
+            if ops is not None:
+                ops.pop(nested_op, None)
+
+    def _lookup(self, key: type[Operation] | str,
+                ops_by_type: list[dict[Operation, None]]) -> list[Operation]:
+        """
+        Get the indexed operations of some types in program order. The result
+        is kept until the index is next modified.
+        """
+        ops = self._lookups.get(key)
+        if ops is None:
+            ops = [op for typ_ops in ops_by_type for op in typ_ops]
+            if len(ops_by_type) > 1 or not self._in_program_order:
+                ops.sort(key=_get_program_order_key)
+            self._lookups[key] = ops
+        return list(ops)
+
+    def get(self, op_type: type[OpT]) -> list[OpT]:
+        """
+        Get the operations of a given type, including its subclasses, in
+        the indexed operation, in program order.
+        """
+        ops_by_type = [
+            ops for typ, ops in self._ops_by_type.items()
+            if issubclass(typ, op_type) and ops
+        ]
+        return cast(list[OpT], self._lookup(op_type, ops_by_type))
+
+    def get_by_name(self, name: str) -> list[Operation]:
+        """
+        Get the operations with a given name in the indexed operation, in
+        program order.
+        """
+        ops_by_type = [
+            ops for typ, ops in self._ops_by_type.items()
+            if typ.name == name and ops
+        ]
+        return self._lookup(name, ops_by_type)
+
+    def drop(self) -> None:
+        """Stop maintaining the index."""
+        if _op_indices.get(self.root) is self:
+            del _op_indices[self.root]
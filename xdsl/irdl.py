@@ -3,11 +3,12 @@ from __future__ import annotations
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
-from functools import reduce
+from functools import cache, reduce
 from inspect import isclass
-from typing import (Annotated, Any, Generic, Literal, Sequence, TypeAlias,
-                    TypeVar, Union, cast, get_args, get_origin, get_type_hints,
-                    overload)
+from operator import attrgetter
+from typing import (Annotated, Any, Callable, Generic, Literal, Sequence,
+                    TypeAlias, TypeVar, Union, cast, get_args, get_origin,
+                    get_type_hints, overload)
 from types import UnionType, GenericAlias, FunctionType
 
 from xdsl.ir import (Attribute, Block, Data, OpResult, Operation,
@@ -53,6 +54,19 @@ class AttrConstraint(ABC):
         """
         ...
 
+    def matches(self, attr: Attribute) -> bool:
+        """
+        Check if the attribute satisfies the constraint, without raising an
+        exception.
+        Constraints should override this method, as the default
+        implementation calls `verify` and catches its exception.
+        """
+        try:
+            self.verify(attr)
+            return True
+        except VerifyException:
+            return False
+
 
 @dataclass
 class EqAttrConstraint(AttrConstraint):
@@ -66,6 +80,9 @@ class EqAttrConstraint(AttrConstraint):
             raise VerifyException(
                 f"Expected attribute {self.attr} but got {attr}")
 
+    def matches(self, attr: Attribute) -> bool:
+        return attr == self.attr
+
 
 @dataclass
 class BaseAttr(AttrConstraint):
@@ -79,6 +96,9 @@ class BaseAttr(AttrConstraint):
             raise VerifyException(
                 f"{attr} should be of base attribute {self.attr.name}")
 
+    def matches(self, attr: Attribute) -> bool:
+        return isinstance(attr, self.attr)
+
 
 def attr_constr_coercion(attr: (Attribute | type[Attribute]
                                 | AttrConstraint)) -> AttrConstraint:
@@ -102,6 +122,9 @@ class AnyAttr(AttrConstraint):
     def verify(self, attr: Attribute) -> None:
         pass
 
+    def matches(self, attr: Attribute) -> bool:
+        return True
+
 
 @dataclass(init=False)
 class AnyOf(AttrConstraint):
@@ -117,13 +140,12 @@ class AnyOf(AttrConstraint):
         ]
 
     def verify(self, attr: Attribute) -> None:
-        for attr_constr in self.attr_constrs:
-            try:
-                attr_constr.verify(attr)
-                return
-            except VerifyException:
-                pass
-        raise VerifyException(f"Unexpected attribute {attr}")
+        if not self.matches(attr):
+            raise VerifyException(f"Unexpected attribute {attr}")
+
+    def matches(self, attr: Attribute) -> bool:
+        return any(
+            attr_constr.matches(attr) for attr_constr in self.attr_constrs)
 
 
 @dataclass()
@@ -149,6 +171,10 @@ class AllOf(AttrConstraint):
             exc_msg += "\n".join([str(e) for e in exc_bucket])
             raise VerifyException(exc_msg)
 
+    def matches(self, attr: Attribute) -> bool:
+        return all(
+            attr_constr.matches(attr) for attr_constr in self.attr_constrs)
+
 
 @dataclass(init=False)
 class ParamAttrConstraint(AttrConstraint):
@@ -182,6 +208,13 @@ class ParamAttrConstraint(AttrConstraint):
         for idx, param_constr in enumerate(self.param_constrs):
             param_constr.verify(attr.parameters[idx])
 
+    def matches(self, attr: Attribute) -> bool:
+        return (isinstance(attr, self.base_attr)
+                and len(self.param_constrs) == len(attr.parameters)
+                and all(
+                    param_constr.matches(param) for param_constr, param in
+                    zip(self.param_constrs, attr.parameters)))
+
 
 def irdl_to_attr_constraint(
     irdl: Any,
@@ -488,6 +521,12 @@ OptOpAttr: TypeAlias = Annotated[_OpAttrT | None,
                                  IRDLAnnotations.OptAttributeDefAnnot]
 
 
+@cache
+def _get_operation_type_hints() -> dict[str, Any]:
+    """Get the type hints of the fields of `Operation`."""
+    return get_type_hints(Operation, include_extras=True)
+
+
 @dataclass(kw_only=True)
 class OpDef:
     """The internal IRDL definition of an operation."""
@@ -497,6 +536,11 @@ class OpDef:
     attributes: dict[str, AttributeDef] = field(default_factory=dict)
     regions: list[tuple[str, RegionDef]] = field(default_factory=list)
     options: list[IRDLOption] = field(default_factory=list)
+    _verifier: Callable[[Operation], None] | None = field(default=None,
+                                                          init=False,
+                                                          repr=False,
+                                                          compare=False)
+    """The verifier compiled from the definition, see `verify`."""
 
     @staticmethod
     def from_pyrdl(pyrdl_def: type[_OpT]) -> OpDef:
@@ -525,11 +569,16 @@ class OpDef:
                 "OpAttr[<Constraint>]")
 
         # Check that all fields of the operation definition are either already
-        # in Operation, or are class functions or methods.
+        # in Operation, are class functions or methods, or are slots.
+        slots = clsdict.get("__slots__", ())
+        slots = (slots, ) if isinstance(slots, str) else tuple(slots)
         for field_name, value in clsdict.items():
             if field_name in opdict:
                 continue
-            if field_name == "irdl_options":
+            if field_name in ("irdl_options", "__dict__", "__weakref__",
+                              "__slots__"):
+                continue
+            if field_name in slots:
                 continue
             if isinstance(
                     value,
@@ -545,9 +594,10 @@ class OpDef:
 
         op_def = OpDef(clsdict["name"])
 
+        operation_fields = _get_operation_type_hints().keys()
         for field_name, field_type in type_hints.items():
 
-            if field_name in get_type_hints(Operation).keys():
+            if field_name in operation_fields or field_name == "name":
                 continue
 
             # If the field type is an Annotated, separate the origin
@@ -654,6 +704,15 @@ class OpDef:
 
     def verify(self, op: Operation):
         """Given an IRDL definition, verify that an operation satisfies its invariants."""
+        if self._verifier is None:
+            self._verifier = compile_op_verifier(self)
+        self._verifier(op)
+
+    def verify_generic(self, op: Operation):
+        """
+        Verify an operation by interpreting the definition.
+        This is used by the compiled verifier to report errors.
+        """
 
         # Verify operands.
         irdl_op_verify_arg_list(op, self, VarIRConstruct.OPERAND)
@@ -709,7 +768,7 @@ def get_construct_defs(
 
 def get_op_constructs(
     op: Operation, construct: VarIRConstruct
-) -> tuple[SSAValue, ...] | list[OpResult] | list[Region]:
+) -> tuple[SSAValue, ...] | list[OpResult] | Sequence[Region]:
     """
         Get the list of arguments of the type in an operation.
         For example, if the argument type is an operand, get the list of
@@ -831,42 +890,6 @@ def get_variadic_sizes(op: Operation, op_def: OpDef,
     assert False, "Unexpected xDSL error while fetching variadic sizes"
 
 
-def get_operand_result_or_region(
-    op: Operation, op_def: OpDef, arg_def_idx: int, previous_var_args: int,
-    construct: VarIRConstruct
-) -> None | SSAValue | tuple[SSAValue,
-                             ...] | list[OpResult] | Region | list[Region]:
-    """
-    Get an operand, result, or region.
-    In the case of a variadic definition, return a list of elements.
-    :param op: The operation we want to get argument of.
-    :param arg_def_idx: The index of the argument in the irdl definition.
-    :param previous_var_args: The number of previous variadic definitions
-           before this definition.
-    :param arg_type: The type of the argument we want
-           (i.e. operand, result, or region)
-    :return:
-    """
-    defs = get_construct_defs(op_def, construct)
-    args = get_op_constructs(op, construct)
-
-    variadic_sizes = get_variadic_sizes(op, op_def, construct)
-
-    begin_arg = arg_def_idx - previous_var_args + sum(
-        variadic_sizes[:previous_var_args])
-    if isinstance(defs[arg_def_idx][1], OptionalDef):
-        arg_size = variadic_sizes[previous_var_args]
-        if arg_size == 0:
-            return None
-        else:
-            return args[begin_arg]
-    if isinstance(defs[arg_def_idx][1], VariadicDef):
-        arg_size = variadic_sizes[previous_var_args]
-        return args[begin_arg:begin_arg + arg_size]
-    else:
-        return args[begin_arg]
-
-
 def irdl_op_verify_arg_list(op: Operation, op_def: OpDef,
                             construct: VarIRConstruct) -> None:
     """Verify the argument list of an operation."""
@@ -904,6 +927,232 @@ def irdl_op_verify_arg_list(op: Operation, op_def: OpDef,
             arg_idx += 1
 
 
+#   ____                      _ _          _
+#  / ___|___  _ __ ___  _ __ (_) | ___  __| |
+# | |   / _ \| '_ ` _ \| '_ \| | |/ _ \/ _` |
+# | |__| (_) | | | | | | |_) | | |  __/ (_| |
+#  \____\___/|_| |_| |_| .__/|_|_|\___|\__,_|
+#                      |_|
+#
+# IRDL definitions are compiled into specialised verifiers, generated as
+# Python source. The generated code inlines the constraint checks as boolean
+# expressions, and uses fixed operand, result and region indices when the
+# definition has at most one variadic. It only checks that the IR is valid:
+# when a check fails, or raises, the generic verifier interpreting the
+# definition is called to raise the error.
+
+
+class _VerifierCompiler:
+    """Generate the source of a compiled verifier."""
+
+    namespace: dict[str, Any]
+    """The globals of the generated code."""
+
+    lines: list[str]
+    """The lines of the generated `check` function body."""
+
+    def __init__(self):
+        self.namespace = {}
+        self.lines = []
+
+    def add_global(self, value: Any) -> str:
+        """Make a value available to the generated code, and get its name."""
+        name = f"_g{len(self.namespace)}"
+        self.namespace[name] = value
+        return name
+
+    def emit(self, line: str, indent: int = 1) -> None:
+        self.lines.append("    " * indent + line)
+
+    def emit_check(self, condition: str, indent: int = 1) -> None:
+        self.emit(f"if not ({condition}):", indent)
+        self.emit("return False", indent + 1)
+
+    @staticmethod
+    def _conjunction(checks: list[str]) -> str:
+        checks = [check for check in checks if check != "True"]
+        if len(checks) == 0:
+            return "True"
+        return "(" + " and ".join(checks) + ")"
+
+    def constraint(self, constr: AttrConstraint, var: str) -> str:
+        """Get an expression checking that `var` satisfies a constraint."""
+        if type(constr) is AnyAttr:
+            return "True"
+        if type(constr) is EqAttrConstraint:
+            return f"{var} == {self.add_global(constr.attr)}"
+        if type(constr) is BaseAttr:
+            return f"isinstance({var}, {self.add_global(constr.attr)})"
+        if type(constr) is AnyOf:
+            checks = [self.constraint(c, var) for c in constr.attr_constrs]
+            if "True" in checks:
+                return "True"
+            return "(" + " or ".join(checks) + ")"
+        if type(constr) is AllOf:
+            checks = [self.constraint(c, var) for c in constr.attr_constrs]
+            return self._conjunction(checks)
+        if type(constr) is ParamAttrConstraint:
+            checks = [
+                f"isinstance({var}, {self.add_global(constr.base_attr)})",
+                f"len({var}.parameters) == {len(constr.param_constrs)}"
+            ] + [
+                self.constraint(c, f"{var}.parameters[{idx}]")
+                for idx, c in enumerate(constr.param_constrs)
+            ]
+            return self._conjunction(checks)
+
+        # Circular import because builtin is defined using IRDL
+        from xdsl.dialects.builtin import ContainerOf, TensorType, VectorType
+        if type(constr) is ContainerOf:
+            container_types = self.add_global((VectorType, TensorType))
+            element_check = self.constraint(constr.elem_constr,
+                                            f"{var}.element_type")
+            check = self.constraint(constr.elem_constr, var)
+            return (f"({element_check} if isinstance({var}, "
+                    f"{container_types}) else {check})")
+        return f"{self.add_global(constr.matches)}({var})"
+
+    def arg_list(self, op_def: OpDef, construct: VarIRConstruct,
+                 args: str) -> None:
+        """Generate the checks of the operands, results or regions."""
+        defs = get_construct_defs(op_def, construct)
+        if len(defs) == 0:
+            self.emit_check(f"len({args}) == 0")
+            return
+
+        def arg_constraint(arg: str, arg_def: Any) -> str:
+            if construct == VarIRConstruct.REGION:
+                if isinstance(arg_def, SingleBlockRegionDef):
+                    return f"len({arg}.blocks) == 1"
+                return "True"
+            return self.constraint(arg_def.constr, f"{arg}.typ")
+
+        def check_arg(arg: str, arg_def: Any) -> None:
+            constraint = arg_constraint(arg, arg_def)
+            if constraint != "True":
+                self.emit_check(constraint)
+
+        def check_args(args_slice: str, arg_def: Any) -> None:
+            constraint = arg_constraint("arg", arg_def)
+            if constraint != "True":
+                self.emit(f"for arg in {args_slice}:")
+                self.emit_check(constraint, 2)
+
+        num_variadics = sum(
+            isinstance(arg_def, VariadicDef) for _, arg_def in defs)
+        attribute_option = get_attr_size_option(construct)
+        self.emit(f"args = {args}")
+
+        if (num_variadics > 1 or attribute_option is not None
+                and attribute_option in op_def.options):
+            # The sizes are only known at runtime
+            self.emit(f"sizes = _get_variadic_sizes(op, op_def, "
+                      f"{self.add_global(construct)})")
+            self.emit("idx = 0")
+            var_idx = 0
+            for _, arg_def in defs:
+                if isinstance(arg_def, VariadicDef):
+                    check_args(f"args[idx:idx + sizes[{var_idx}]]", arg_def)
+                    self.emit(f"idx += sizes[{var_idx}]")
+                    var_idx += 1
+                else:
+                    check_arg("args[idx]", arg_def)
+                    self.emit("idx += 1")
+            self.emit_check("idx <= len(args)")
+            return
+
+        if num_variadics == 0:
+            self.emit_check(f"len(args) == {len(defs)}")
+            for idx, (_, arg_def) in enumerate(defs):
+                check_arg(f"args[{idx}]", arg_def)
+            return
+
+        # A single variadic, whose size is given by the number of arguments
+        self.emit_check(f"len(args) >= {len(defs) - 1}")
+        self.emit(f"size = len(args) - {len(defs) - 1}")
+        after_variadic = False
+        for idx, (_, arg_def) in enumerate(defs):
+            if isinstance(arg_def, VariadicDef):
+                check_args(f"args[{idx}:{idx} + size]", arg_def)
+                after_variadic = True
+            elif after_variadic:
+                check_arg(f"args[{idx - 1} + size]", arg_def)
+            else:
+                check_arg(f"args[{idx}]", arg_def)
+
+    def attributes(self, op_def: OpDef) -> None:
+        """Generate the checks of the attributes."""
+        if len(op_def.attributes) == 0:
+            return
+        self.emit("attributes = op.attributes")
+        for attr_name, attr_def in op_def.attributes.items():
+            self.emit(f"attr = attributes.get({attr_name!r})")
+            constraint = self.constraint(attr_def.constr, "attr")
+            if isinstance(attr_def, OptAttributeDef):
+                if constraint != "True":
+                    self.emit_check(f"attr is None or {constraint}")
+            else:
+                self.emit_check(f"attr is not None and {constraint}")
+
+    def compile(self, arg_name: str, generic_verifier: Callable[[Any], None],
+                extra_globals: dict[str, Any]) -> Callable[[Any], None]:
+        """
+        Compile the generated checks into a verifier, calling the generic
+        verifier when the checks fail.
+        """
+        self.namespace.update(extra_globals)
+        self.namespace["_generic_verifier"] = generic_verifier
+        source = "\n".join([
+            f"def check({arg_name}):",
+            *self.lines,
+            "    return True",
+            f"def verify({arg_name}):",
+            "    try:",
+            f"        if check({arg_name}):",
+            "            return",
+            "    except Exception:",
+            "        pass",
+            f"    _generic_verifier({arg_name})",
+        ])
+        exec(source, self.namespace)
+        return self.namespace["verify"]
+
+
+def compile_op_verifier(op_def: OpDef) -> Callable[[Operation], None]:
+    """
+    Compile an operation definition into a function verifying that an
+    operation satisfies its invariants, and raising the same exceptions as
+    `OpDef.verify_generic` otherwise.
+    """
+    compiler = _VerifierCompiler()
+    compiler.arg_list(op_def, VarIRConstruct.OPERAND, "op.operands")
+    compiler.arg_list(op_def, VarIRConstruct.RESULT, "op.results")
+    compiler.arg_list(op_def, VarIRConstruct.REGION, "op.regions")
+    compiler.attributes(op_def)
+    return compiler.compile(
+        "op", op_def.verify_generic, {
+            "op_def": op_def,
+            "_get_variadic_sizes": get_variadic_sizes
+        })
+
+
+def compile_param_attr_verifier(
+        attr_def: ParamAttrDef) -> Callable[[ParametrizedAttribute], None]:
+    """
+    Compile an attribute definition into a function verifying that an
+    attribute satisfies its invariants, and raising the same exceptions as
+    `ParamAttrDef.verify_generic` otherwise.
+    """
+    compiler = _VerifierCompiler()
+    compiler.emit("params = attr.parameters")
+    compiler.emit_check(f"len(params) == {len(attr_def.parameters)}")
+    for idx, (_, constr) in enumerate(attr_def.parameters):
+        constraint = compiler.constraint(constr, f"params[{idx}]")
+        if constraint != "True":
+            compiler.emit_check(constraint)
+    return compiler.compile("attr", attr_def.verify_generic, {})
+
+
 @overload
 def irdl_build_arg_list(construct: Literal[VarIRConstruct.OPERAND],
                         args: Sequence[SSAValue | Sequence[SSAValue]],
@@ -1063,19 +1312,134 @@ def irdl_op_builder(
                       regions=built_regions)
 
 
+_construct_fields = {
+    VarIRConstruct.OPERAND: "operands",
+    VarIRConstruct.RESULT: "results",
+    VarIRConstruct.REGION: "regions",
+}
+"""The operation field holding each kind of construct."""
+
+
+_SegmentOffsets: TypeAlias = dict[Attribute, list[tuple[int, int]]]
+"""The offsets and sizes of the segments of each segment sizes attribute."""
+
+_MAX_SEGMENT_OFFSETS = 64
+"""
+The maximal number of segment sizes attributes whose offsets are cached for
+the arguments of an operation definition. The oldest ones are evicted first.
+"""
+
+
+def _segment_accessor(op_def: OpDef, construct: VarIRConstruct, arg_idx: int,
+                      segments: _SegmentOffsets) -> Callable[[Operation], Any]:
+    """
+    Get an accessor for an argument whose position is given by a segment
+    sizes attribute.
+    The segment offsets are cached in `segments` per segment sizes
+    attribute, as they only depend on the attribute, which is uniqued and
+    immutable. At most `_MAX_SEGMENT_OFFSETS` attributes are kept, so that
+    the cache does not keep alive every attribute it has seen.
+    """
+    defs = get_construct_defs(op_def, construct)
+    attribute_option = get_attr_size_option(construct)
+    assert attribute_option is not None
+    attribute_name = attribute_option.attribute_name
+    args_getter = attrgetter(_construct_fields[construct])
+    arg_def = defs[arg_idx][1]
+
+    def get_segment(op: Operation) -> tuple[int, int]:
+        attribute = op.attributes.get(attribute_name)
+        offsets: list[tuple[int, int]] | None = segments.get(
+            attribute) if attribute is not None else None
+        if offsets is None:
+            sizes = iter(
+                get_variadic_sizes_from_attr(op, defs, construct,
+                                             attribute_name))
+            offsets = []
+            begin = 0
+            for _, segment_def in defs:
+                size = next(sizes) if isinstance(segment_def,
+                                                 VariadicDef) else 1
+                offsets.append((begin, size))
+                begin += size
+            assert attribute is not None
+            if len(segments) >= _MAX_SEGMENT_OFFSETS:
+                del segments[next(iter(segments))]
+            segments[attribute] = offsets
+        return offsets[arg_idx]
+
+    if isinstance(arg_def, OptionalDef):
+
+        def optional_accessor(op: Operation) -> Any:
+            begin, size = get_segment(op)
+            return args_getter(op)[begin] if size else None
+
+        return optional_accessor
+
+    if isinstance(arg_def, VariadicDef):
+
+        def variadic_accessor(op: Operation) -> Any:
+            begin, size = get_segment(op)
+            return args_getter(op)[begin:begin + size]
+
+        return variadic_accessor
+
+    def accessor(op: Operation) -> Any:
+        return args_getter(op)[get_segment(op)[0]]
+
+    return accessor
+
+
+def _arg_accessor(op_def: OpDef, construct: VarIRConstruct, arg_idx: int,
+                  segments: _SegmentOffsets) -> Callable[[Operation], Any]:
+    """
+    Get an accessor for an operand, result, or region of an operation.
+    The position of the argument is precomputed from the definition, and
+    only depends on the number of arguments when it follows a variadic.
+    """
+    defs = get_construct_defs(op_def, construct)
+    attribute_option = get_attr_size_option(construct)
+    if attribute_option is not None and attribute_option in op_def.options:
+        return _segment_accessor(op_def, construct, arg_idx, segments)
+
+    args_getter = attrgetter(_construct_fields[construct])
+    arg_def = defs[arg_idx][1]
+    variadic_indices = [
+        idx for idx, (_, def_) in enumerate(defs)
+        if isinstance(def_, VariadicDef)
+    ]
+    num_defs = len(defs)
+
+    if not variadic_indices or arg_idx < variadic_indices[0]:
+        return lambda op: args_getter(op)[arg_idx]
+
+    if arg_idx > variadic_indices[0]:
+        # Index from the end of the arguments
+        return lambda op: args_getter(op)[arg_idx - num_defs]
+
+    if isinstance(arg_def, OptionalDef):
+
+        def optional_accessor(op: Operation) -> Any:
+            args = args_getter(op)
+            return args[arg_idx] if len(args) >= num_defs else None
+
+        return optional_accessor
+
+    def variadic_accessor(op: Operation) -> Any:
+        args = args_getter(op)
+        return args[arg_idx:len(args) - num_defs + arg_idx + 1]
+
+    return variadic_accessor
+
+
 def irdl_op_arg_definition(new_attrs: dict[str, Any],
                            construct: VarIRConstruct, op_def: OpDef) -> None:
     previous_variadics = 0
     defs = get_construct_defs(op_def, construct)
+    segments: _SegmentOffsets = {}
     for arg_idx, (arg_name, arg_def) in enumerate(defs):
-
-        def fun(self: Any,
-                idx: int = arg_idx,
-                previous_vars: int = previous_variadics):
-            return get_operand_result_or_region(self, op_def, idx,
-                                                previous_vars, construct)
-
-        new_attrs[arg_name] = property(fun)
+        new_attrs[arg_name] = property(
+            _arg_accessor(op_def, construct, arg_idx, segments))
         if isinstance(arg_def, VariadicDef):
             previous_variadics += 1
 
@@ -1174,10 +1538,44 @@ def irdl_op_definition(cls: type[_OpT]) -> type[_OpT]:
 
     new_attrs["irdl_definition"] = irdl_definition
 
-    return type(cls.__name__, cls.__mro__, {
-        **cls.__dict__,
-        **new_attrs
-    })  # type: ignore
+    # The operation class is recreated from its bases with `__slots__`, so
+    # that operations do not carry an instance `__dict__` when all their
+    # parent classes are slotted.
+    cls_dict = {
+        key: value
+        for key, value in cls.__dict__.items()
+        if key not in ("__dict__", "__weakref__")
+    }
+    slots = cls_dict.get("__slots__", ())
+    slots = (slots, ) if isinstance(slots, str) else tuple(slots)
+    for slot in slots:
+        cls_dict.pop(slot, None)
+    cls_dict["__slots__"] = slots
+
+    new_cls = type(cls.__name__, cls.__bases__, {**cls_dict, **new_attrs})
+    _update_class_cells(cls, new_cls)
+    return new_cls  # type: ignore
+
+
+def _update_class_cells(old_cls: type, new_cls: type) -> None:
+    """
+    Make the `__class__` cells of the methods defined in `old_cls` refer to
+    `new_cls`, so zero-argument `super()` calls keep working after the class
+    is recreated.
+    """
+    for member in old_cls.__dict__.values():
+        while isinstance(member, (classmethod, staticmethod)):
+            member = cast(Any, member.__func__)
+        if isinstance(member, property):
+            functions = (member.fget, member.fset, member.fdel)
+        else:
+            functions = (member, )
+        for func in functions:
+            if not isinstance(func, FunctionType) or func.__closure__ is None:
+                continue
+            for name, cell in zip(func.__code__.co_freevars, func.__closure__):
+                if name == "__class__" and cell.cell_contents is old_cls:
+                    cell.cell_contents = new_cls
 
 
 #  ____        _
@@ -1256,7 +1654,7 @@ def irdl_data_definition(cls: type[T]) -> type[T]:
                             'attribute definition: the "verify" method cannot '
                             'be automatically derived for this definition.')
 
-    return dataclass(frozen=True)(type(cls.__name__, (cls, ), {
+    return dataclass(frozen=True, eq=False)(type(cls.__name__, (cls, ), {
         **cls.__dict__,
         **new_attrs
     }))  # type: ignore
@@ -1280,7 +1678,7 @@ def irdl_param_attr_get_param_type_hints(
     res = list[tuple[str, Any]]()
     for field_name, field_type in get_type_hints(cls,
                                                  include_extras=True).items():
-        if field_name == "name" or field_name == "parameters":
+        if field_name in ("name", "parameters", "_hash"):
             continue
 
         origin: Any | None = get_origin(field_type)
@@ -1300,6 +1698,9 @@ class ParamAttrDef:
     """The IRDL definition of a parametrized attribute."""
     name: str
     parameters: list[tuple[str, AttrConstraint]]
+    _verifier: Callable[[ParametrizedAttribute], None] | None = field(
+        default=None, init=False, repr=False, compare=False)
+    """The verifier compiled from the definition, see `verify`."""
 
     @staticmethod
     def from_pyrdl(pyrdl_def: type[ParametrizedAttribute]) -> ParamAttrDef:
@@ -1347,6 +1748,15 @@ class ParamAttrDef:
 
     def verify(self, attr: ParametrizedAttribute):
         """Verify that `attr` satisfies the invariants."""
+        if self._verifier is None:
+            self._verifier = compile_param_attr_verifier(self)
+        self._verifier(attr)
+
+    def verify_generic(self, attr: ParametrizedAttribute):
+        """
+        Verify an attribute by interpreting the definition.
+        This is used by the compiled verifier to report errors.
+        """
 
         if len(attr.parameters) != len(self.parameters):
             raise VerifyException(
@@ -1392,10 +1802,11 @@ def irdl_param_attr_definition(cls: type[_PAttrT]) -> type[_PAttrT]:
 
     new_fields["irdl_definition"] = irdl_definition
 
-    return dataclass(frozen=True, init=False)(type(cls.__name__, (cls, ), {
-        **cls.__dict__,
-        **new_fields
-    }))  # type: ignore
+    return dataclass(frozen=True, init=False,
+                     eq=False)(type(cls.__name__, (cls, ), {
+                         **cls.__dict__,
+                         **new_fields
+                     }))  # type: ignore
 
 
 _AttrT = TypeVar('_AttrT', bound=Attribute)
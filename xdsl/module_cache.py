@@ -0,0 +1,133 @@
+"""
+An on-disk cache of modules, addressed by the hash of what they depend on.
+
+Modules are stored in the bytecode format of `xdsl.bytecode`, in files named
+after their key. Entries that cannot be read back are treated as missing and
+removed. Files are written atomically, so that concurrent processes
+can share a cache. When the files of the cache exceed its maximal size, the
+least recently used ones are removed, as tracked by their modification time,
+which is updated when they are read.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import tempfile
+from io import BytesIO
+
+from xdsl.bytecode import read_bytecode, write_bytecode
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.ir import MLContext
+from xdsl.utils.exceptions import BytecodeError
+
+_SUFFIX = ".xdslbc"
+
+
+class ModuleCache:
+    """An on-disk cache of modules, with least recently used eviction."""
+
+    directory: str
+    max_size: int
+    """The maximal size of the files of the cache, in bytes."""
+
+    def __init__(self, directory: str, max_size: int):
+        self.directory = directory
+        self.max_size = max_size
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def get_key(*parts: str | bytes) -> str:
+        """Get the key of a module, from the parts it depends on."""
+        digest = hashlib.sha256()
+        for part in parts:
+            if isinstance(part, str):
+                part = part.encode()
+            # Lengths separate the parts, so that they cannot be confused
+            digest.update(len(part).to_bytes(8, "little"))
+            digest.update(part)
+        return digest.hexdigest()
+
+    def _get_path(self, key: str) -> str:
+        return os.path.join(self.directory, key + _SUFFIX)
+
+    def load(self,
+             ctx: MLContext,
+             key: str,
+             allow_unregistered_ops: bool = False) -> ModuleOp | None:
+        """
+        Get the module stored with a key, or None if there is none. Entries
+        that cannot be read, for instance because they were written with
+        other dialects, are removed.
+        """
+        path = self._get_path(key)
+        try:
+            with open(path, "rb") as file:
+                data = file.read()
+        except OSError:
+            return None
+        try:
+            module = read_bytecode(ctx, data, allow_unregistered_ops)
+            # Decode the lazily loaded regions, so that entries that cannot
+            # be read are found before the module is used
+            for _ in module.walk():
+                pass
+        except Exception:
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            # Removed by a concurrent process
+            pass
+        return module
+
+    @staticmethod
+    def _remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            # Removed by a concurrent process
+            pass
+
+    def store(self, key: str, module: ModuleOp) -> None:
+        """
+        Store a module with a key. Modules that cannot be written in the
+        bytecode format, or that are nested too deeply to be written and read
+        back without exceeding the recursion limit, are not stored.
+        """
+        output = BytesIO()
+        try:
+            write_bytecode(module, output)
+        except (BytecodeError, RecursionError):
+            return
+        fd, temp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(output.getbuffer())
+            os.replace(temp_path, self._get_path(key))
+        except OSError:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+            return
+        self.evict()
+
+    def evict(self) -> None:
+        """Remove the least recently used modules, until the cache fits."""
+        entries: list[tuple[float, int, str]] = []
+        for entry in os.scandir(self.directory):
+            if not entry.name.endswith(_SUFFIX):
+                continue
+            try:
+                stat = entry.stat()
+            except OSError:
+                # Removed by a concurrent process
+                continue
+            entries.append((stat.st_mtime, stat.st_size, entry.path))
+        size = sum(entry_size for _, entry_size, _ in entries)
+        entries.sort()
+        for _, entry_size, path in entries:
+            if size <= self.max_size:
+                break
+            self._remove(path)
+            size -= entry_size
@@ -0,0 +1,308 @@
+"""
+Parsing of modules, with their top-level operations parsed in parallel.
+
+The body of the module is first scanned for the boundaries of its top-level
+operations, by tracking the nesting of brackets while skipping string
+literals and comments. The operations are then split into chunks of similar
+sizes, that are parsed across a pool of worker processes, forked from the
+current process so that the input does not need to be sent to them.
+
+The IR is made of linked lists that are too deep to be pickled, so workers
+send back a flat description of the operations they parsed, from which the
+operations are rebuilt. Attributes are sent as they are, as they are uniqued
+again when unpickled.
+
+The parsed module is the same as the one parsed sequentially. When that cannot
+be guaranteed, for instance when top-level operations define values that may
+be used by other chunks, or when a chunk cannot be parsed on its own, the
+module is parsed sequentially instead, so that errors are also reported as
+the sequential parser does.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+import re
+from bisect import bisect_right
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, NamedTuple
+
+from xdsl.dialects.builtin import ModuleOp
+from xdsl.ir import (Attribute, Block, BlockArgument, MLContext, Operation,
+                     Region, SSAValue)
+from xdsl.parser import BaseParser, XDSLParser
+from xdsl.utils.lexer import Input, Span
+
+
+class _SerializedBlock(NamedTuple):
+    id: int
+    declared_at: tuple[int, int] | None
+    arg_types: tuple[Attribute, ...]
+    arg_names: tuple[str | None, ...]
+    ops: list[_SerializedOp]
+
+
+class _SerializedOp(NamedTuple):
+    op_type: type[Operation]
+    operands: tuple[int, ...]
+    """The indices of the operands, in the order values are defined."""
+    result_types: tuple[Attribute, ...]
+    result_names: tuple[str | None, ...]
+    attributes: dict[str, Attribute]
+    successors: tuple[int, ...]
+    regions: tuple[tuple[_SerializedBlock, ...], ...]
+
+
+def _serialize_ops(ops: Iterable[Operation]) -> list[_SerializedOp]:
+    """
+    Get a flat description of operations, where values and blocks are
+    referred to by indices, in the order they are defined or first referred
+    to.
+    """
+    values: dict[SSAValue, int] = {}
+    blocks: dict[Block, int] = {}
+
+    def serialize_block(block: Block) -> _SerializedBlock:
+        block_id = blocks.setdefault(block, len(blocks))
+        for arg in block.args:
+            values[arg] = len(values)
+        declared_at = None
+        if block.declared_at is not None:
+            declared_at = (block.declared_at.start, block.declared_at.end)
+        return _SerializedBlock(block_id, declared_at,
+                                tuple(arg.typ for arg in block.args),
+                                tuple(arg.name for arg in block.args),
+                                [serialize_op(op) for op in block.ops])
+
+    def serialize_op(op: Operation) -> _SerializedOp:
+        operands = tuple(values[operand] for operand in op.operands)
+        successors = tuple(
+            blocks.setdefault(successor, len(blocks))
+            for successor in op.successors)
+        regions = tuple(
+            tuple(serialize_block(block) for block in region.blocks)
+            for region in op.regions)
+        for result in op.results:
+            values[result] = len(values)
+        return _SerializedOp(type(op), operands,
+                             tuple(result.typ for result in op.results),
+                             tuple(result.name for result in op.results),
+                             op.attributes, successors, regions)
+
+    return [serialize_op(op) for op in ops]
+
+
+def _deserialize_ops(ops: Iterable[_SerializedOp],
+                     input: Input) -> list[Operation]:
+    """
+    Rebuild operations from their flat description, with the spans of their
+    blocks referring to `input`.
+    """
+    values: list[SSAValue] = []
+    blocks: list[Block] = []
+
+    def get_block(block_id: int) -> Block:
+        if block_id == len(blocks):
+            blocks.append(Block())
+        return blocks[block_id]
+
+    def set_name(value: SSAValue, name: str | None):
+        if name is not None:
+            value.name = name
+
+    def deserialize_block(serialized: _SerializedBlock) -> Block:
+        block = get_block(serialized.id)
+        if serialized.declared_at is not None:
+            block.declared_at = Span(*serialized.declared_at, input)
+        block._args = tuple(  # type: ignore
+            BlockArgument(typ, block, idx)
+            for idx, typ in enumerate(serialized.arg_types))
+        for arg, name in zip(block.args, serialized.arg_names):
+            set_name(arg, name)
+            values.append(arg)
+        block.add_ops(deserialize_op(op) for op in serialized.ops)
+        return block
+
+    def deserialize_op(serialized: _SerializedOp) -> Operation:
+        operands = [values[idx] for idx in serialized.operands]
+        successors = [get_block(block_id) for block_id in serialized.successors]
+        regions: list[Region] = []
+        for serialized_blocks in serialized.regions:
+            region = Region()
+            for serialized_block in serialized_blocks:
+                region.add_block(deserialize_block(serialized_block))
+            regions.append(region)
+        op = serialized.op_type.create(operands=operands,
+                                       result_types=serialized.result_types,
+                                       attributes=serialized.attributes,
+                                       successors=successors,
+                                       regions=regions)
+        for result, name in zip(op.results, serialized.result_names):
+            set_name(result, name)
+            values.append(result)
+        return op
+
+    return [deserialize_op(op) for op in ops]
+
+
+_top_level_tokens = re.compile(r'"(?:\\.|[^\n"\\])*"|//[^\n]*|[{}()\[\]]'
+                               r'|\n[ \t]*(?=[%"A-Za-z_])')
+"""
+The tokens relevant to find the top-level operations: string literals and
+comments, that are skipped, brackets, and the lines starting with a value
+or an operation name.
+"""
+
+
+def _find_top_level_ops(content: str,
+                        start: int) -> tuple[list[int], int] | None:
+    """
+    Find the positions of the operations at the top level of a block, whose
+    body starts at `start`, and the position of the closing bracket of the
+    block. Positions that are found are only candidates, as operations may
+    span several lines.
+    Return None if the brackets are unbalanced, or if values are defined at
+    the top level, as they can be used by any of the following operations.
+    """
+    ops: list[int] = [start]
+    depth = 0
+    for match in _top_level_tokens.finditer(content, start):
+        char = content[match.start()]
+        if char in "{([":
+            depth += 1
+        elif char in "})]":
+            if depth == 0:
+                return ops, match.start()
+            depth -= 1
+        elif char == "\n" and depth == 0:
+            if content[match.end()] == "%":
+                return None
+            ops.append(match.end())
+    return None
+
+
+_forked_parser: BaseParser | None = None
+"""The parser used by the forked worker processes."""
+
+
+def _parse_chunk(parser: BaseParser, start: int,
+                 stop: int) -> list[_SerializedOp] | None:
+    """
+    Parse the top-level operations between two positions, or return None if
+    they cannot be parsed independently of the rest of the module.
+    """
+    parser.tokenizer.pos = start
+    parser.tokenizer.history = None
+    parser.ssaValues = dict()
+    parser.blocks = dict()
+    parser.forward_block_references = defaultdict(list)
+    ops: list[Operation] = []
+    try:
+        while parser.tokenizer.next_pos() < stop:
+            op = parser.try_parse_operation()
+            # Values defined at the top level could be used by other chunks
+            if op is None or op.results or parser.tokenizer.pos > stop:
+                return None
+            ops.append(op)
+    except Exception:
+        return None
+    if parser.forward_block_references:
+        return None
+    return _serialize_ops(ops)
+
+
+def _parse_forked_chunk(start: int, stop: int) -> list[_SerializedOp] | None:
+    assert _forked_parser is not None
+    return _parse_chunk(_forked_parser, start, stop)
+
+
+def _try_parse_module_in_parallel(parser: BaseParser,
+                                  num_workers: int) -> ModuleOp | None:
+    """
+    Parse a module, with its top-level operations parsed in parallel, or
+    return None if it cannot be parsed as the sequential parser would.
+    """
+    global _forked_parser
+
+    input = parser.tokenizer.input
+    try:
+        attributes = parser.parse_module_start()
+        body_start = parser.tokenizer.pos
+        block_span = parser.tokenizer.last_token
+        found = _find_top_level_ops(input.content, body_start)
+        if found is None:
+            return None
+        starts, body_end = found
+        parser.tokenizer.pos = body_end
+        attributes |= parser.parse_module_end()
+        if not parser.tokenizer.is_eof():
+            return None
+    except Exception:
+        return None
+
+    # Split the operations in chunks of similar sizes
+    num_chunks = min(len(starts), num_workers * 4)
+    bounds = sorted({
+        starts[bisect_right(starts, body_start +
+                            (body_end - body_start) * idx // num_chunks) - 1]
+        for idx in range(num_chunks)
+    })
+    if len(bounds) <= 1:
+        return None
+    bounds.append(body_end)
+
+    _forked_parser = parser
+    executor = ProcessPoolExecutor(
+        num_workers, mp_context=multiprocessing.get_context("fork"))
+    try:
+        with executor:
+            chunks = list(executor.map(_parse_forked_chunk, bounds[:-1],
+                                       bounds[1:]))
+    except Exception:
+        # Operations that cannot be sent back, such as unregistered ones
+        return None
+    finally:
+        _forked_parser = None
+
+    if any(chunk is None for chunk in chunks):
+        return None
+    if not any(chunks):
+        block = Block()
+    else:
+        block = Block(block_span)
+        for chunk in chunks:
+            # Values and blocks are numbered separately in each chunk
+            assert chunk is not None
+            block.add_ops(_deserialize_ops(chunk, input))
+    region = Region()
+    region.add_block(block)
+    return ModuleOp.create(attributes=attributes, regions=[region])
+
+
+def parse_module_parallel(ctx: MLContext,
+                          input: str | Input,
+                          parser_type: type[BaseParser] = XDSLParser,
+                          num_workers: int | None = None,
+                          allow_unregistered_ops: bool = False) -> ModuleOp:
+    """
+    Parse a top-level module, with its top-level operations parsed in
+    parallel, using `num_workers` worker processes (by default, the number of
+    CPUs).
+    The module, and the errors that are raised, are the same as the ones of
+    `parser_type(...).parse_module()`.
+    """
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+
+    def make_parser() -> BaseParser:
+        return parser_type(ctx,
+                           input,
+                           allow_unregistered_ops=allow_unregistered_ops)
+
+    if num_workers > 1 and "fork" in multiprocessing.get_all_start_methods():
+        module = _try_parse_module_in_parallel(make_parser(), num_workers)
+        if module is not None:
+            return module
+    return make_parser().parse_module()
@@ -4,18 +4,19 @@ import ast
 import contextlib
 import functools
 import itertools
+import math
 import re
+import struct
 import sys
 import traceback
 from abc import ABC, abstractmethod
 from collections import defaultdict
 from dataclasses import dataclass, field
 from enum import Enum
-from io import StringIO
-from typing import Any, TypeVar, Iterable, IO, cast
+from typing import Any, TypeVar, Iterable, Iterator, IO, cast
 
 from xdsl.utils.exceptions import ParseError, MultipleSpansParseError
-from xdsl.utils.lexer import Input, Span
+from xdsl.utils.lexer import Input, Lexer, Span, Token, TokenKind
 from xdsl.dialects.memref import MemRefType, UnrankedMemrefType
 from xdsl.dialects.builtin import (
     AnyArrayAttr, AnyFloat, AnyFloatAttr, AnyTensorType, AnyUnrankedTensorType,
@@ -50,11 +51,21 @@ class BacktrackingHistory:
     It's parent will be the next error message (not a known attribute).
     Some errors happen in named regions (e.g. "parsing of operation")
     """
-    error: ParseError
+    _error: ParseError | Callable[[], ParseError] = field(repr=False)
+    """
+    The error, or a function producing it, so that errors that are
+    recovered from by backtracking are never formatted.
+    """
     parent: BacktrackingHistory | None
     region_name: str | None
     pos: int
 
+    @property
+    def error(self) -> ParseError:
+        if not isinstance(self._error, ParseError):
+            self._error = self._error()
+        return self._error
+
     def print_unroll(self, file: IO[str] = sys.stderr):
         if self.parent:
             if self.parent.get_farthest_point() > self.pos:
@@ -114,6 +125,27 @@ class StringLiteral(Span):
 save_t = int
 
 
+@functools.cache
+def _get_token_end_pattern(break_on: tuple[str, ...]) -> re.Pattern[str]:
+    """
+    Get a regex matching a token delimited by the given break strings: either
+    one of the break strings, or the characters up to the next one.
+    """
+    singles = {part for part in break_on if len(part) == 1}
+    # Characters starting a longer break string are only a break when the
+    # rest of the string follows
+    prefixes: dict[str, list[str]] = {}
+    for part in break_on:
+        if len(part) > 1 and part[0] not in singles:
+            prefixes.setdefault(part[0], []).append(re.escape(part[1:]))
+    other = "[^{}]".format("".join(
+        re.escape(char) for char in sorted(singles | prefixes.keys())))
+    prefix = "|".join(f"{re.escape(char)}(?!{'|'.join(rests)})"
+                      for char, rests in prefixes.items())
+    run = f"{other}*(?:(?:{prefix}){other}*)*" if prefix else f"{other}*"
+    return re.compile("|".join([*(re.escape(part) for part in break_on), run]))
+
+
 @dataclass
 class Tokenizer:
     """
@@ -140,6 +172,9 @@ class Tokenizer:
         the regex.
      - starts_with(pattern) checks if the input starts with a literal string or
         regex pattern
+     - lex(peek) is used to get the next typed token, as produced by the Lexer
+     - next_token_of_kind(kind, peek) can be used to get the next typed token
+        if it is of a specific kind
     """
 
     input: Input
@@ -156,13 +191,27 @@ class Tokenizer:
     characters the tokenizer should break on
     """
 
+    _token_end: re.Pattern[str] = field(init=False, repr=False)
+    """
+    The regex matching a token, as delimited by the _break_on strings
+    """
+
     history: BacktrackingHistory | None = field(init=False,
                                                 default=None,
                                                 repr=False)
 
     last_token: Span | None = field(init=False, default=None, repr=False)
 
+    _typed_token: tuple[int, re.Match[str]] | None = field(init=False,
+                                                           default=None,
+                                                           repr=False)
+    """
+    The position the last typed token was matched from, and its match.
+    Alternatives trying the same position share it.
+    """
+
     def __post_init__(self):
+        self._token_end = _get_token_end_pattern(self._break_on)
         self.last_token = self.next_token(peek=True)
 
     def save(self) -> save_t:
@@ -238,30 +287,28 @@ class Tokenizer:
 
         If an unexpected exception type is encountered, print a traceback to stderr
         """
-        assert self.last_token is not None
+        last_token = self.last_token
+        assert last_token is not None
+        history = self.history
         if isinstance(ex, ParseError):
-            return BacktrackingHistory(ex, self.history, region, pos)
+            return BacktrackingHistory(ex, history, region, pos)
         elif isinstance(ex, AssertionError):
-            reason = [
-                "Generic assertion failure",
-                *(reason for reason in ex.args if isinstance(reason, str)),
-            ]
-            # We assume that assertions fail because of the last read-in token
-            if len(reason) == 1:
-                tb = StringIO()
-                traceback.print_exc(file=tb)
-                reason[0] += "\n" + tb.getvalue()
 
-            return BacktrackingHistory(
-                ParseError(self.last_token, reason[-1], self.history),
-                self.history,
-                region,
-                pos,
-            )
+            def assertion_error() -> ParseError:
+                reason = [
+                    "Generic assertion failure",
+                    *(reason for reason in ex.args if isinstance(reason, str)),
+                ]
+                # We assume that assertions fail because of the last read-in token
+                if len(reason) == 1:
+                    reason[0] += "\n" + "".join(traceback.format_exception(ex))
+                return ParseError(last_token, reason[-1], history)
+
+            return BacktrackingHistory(assertion_error, history, region, pos)
         elif isinstance(ex, EOFError):
             return BacktrackingHistory(
-                ParseError(self.last_token, "Encountered EOF", self.history),
-                self.history,
+                lambda: ParseError(last_token, "Encountered EOF", history),
+                history,
                 region,
                 pos,
             )
@@ -270,9 +317,9 @@ class Tokenizer:
         traceback.print_exception(ex, file=sys.stderr)
 
         return BacktrackingHistory(
-            ParseError(self.last_token, "Unexpected exception: {}".format(ex),
-                       self.history),
-            self.history,
+            lambda: ParseError(last_token, "Unexpected exception: {}".format(
+                ex), history),
+            history,
             region,
             pos,
         )
@@ -340,16 +387,9 @@ class Tokenizer:
         Find the point (optionally starting from start) where the token ends
         """
         i = self.next_pos() if start is None else start
-        # Search for literal breaks
-        for part in self._break_on:
-            if self.input.content.startswith(part, i):
-                return i + len(part)
-        # Otherwise return the start of the next break
-        return min(
-            filter(
-                lambda x: x >= 0,
-                (self.input.content.find(part, i) for part in self._break_on),
-            ))
+        match = self._token_end.match(self.input.content, i)
+        assert match is not None
+        return match.end()
 
     def next_pos(self, i: int | None = None) -> int:
         """
@@ -358,16 +398,57 @@ class Tokenizer:
         This will skip line comments!
         """
         i = self.pos if i is None else i
-        # Skip whitespaces
-        while self.input.at(i).isspace():
-            i += 1
+        # Skip whitespaces and comments
+        match = Lexer.whitespace.match(self.input.content, i)
+        assert match is not None
+        i = match.end()
+        if i >= len(self.input.content):
+            raise EOFError()
+        return i
+
+    def _match_typed_token(self) -> re.Match[str]:
+        """
+        Match the next typed token with the regex of the Lexer, without
+        advancing. No group matches if the next character cannot start a
+        token, or at the end of the input.
+        """
+        cached = self._typed_token
+        if cached is None or cached[0] != self.pos:
+            match = Lexer.token.match(self.input.content, self.pos)
+            assert match is not None
+            cached = self._typed_token = (self.pos, match)
+        return cached[1]
 
-        # Skip comments as well
-        if self.input.content.startswith("//", i):
-            i = self.input.content.find("\n", i) + 1
-            return self.next_pos(i)
+    def lex(self, peek: bool = False) -> Token:
+        """
+        Return the next typed token, as produced by the Lexer.
 
-        return i
+        Can be modified using:
+         - peek: don't advance the position, only "peek" at the input
+        """
+        lexer = Lexer(self.input, self.pos)
+        token = lexer.lex()
+        if not peek:
+            self.pos = lexer.pos
+        self.last_token = token.span
+        return token
+
+    def next_token_of_kind(self,
+                           kind: TokenKind,
+                           peek: bool = False) -> Span | None:
+        """
+        Return the span of the next typed token if it is of the given kind,
+        or nothing.
+        You can choose not to consume the span.
+        """
+        match = self._match_typed_token()
+        if match.lastgroup != kind.name:
+            return None
+        span = Span(match.start(kind.name), match.end(), self.input)
+        if not peek:
+            self.pos = span.end
+        self.last_token = span
+        return span
 
     def is_eof(self):
         """
@@ -389,6 +470,40 @@ class Tokenizer:
             return False
 
 
+_MemoizedMethodT = TypeVar("_MemoizedMethodT",
+                           bound=Callable[[Any], Any | None])
+
+
+def _memoize(method: _MemoizedMethodT) -> _MemoizedMethodT:
+    """
+    Memoize the successful results of a parser method taking no arguments,
+    by input position (packrat parsing). When an alternative fails, the
+    attributes and types it parsed are not parsed again by the next
+    alternatives.
+
+    Only methods without side effects on the parser state, other than on
+    the tokenizer position and history, can be memoized. Failures are not
+    memoized, so that they still record their error history. A hit restores
+    both the position and the history the method ended with, so that later
+    errors report the same history as without memoization.
+    """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def memoized(self: BaseParser) -> Any | None:
+        tokenizer = self.tokenizer
+        key = (name, tokenizer.pos)
+        if (entry := self.memo.get(key)) is not None:
+            result, tokenizer.pos, tokenizer.history = entry
+            return result
+        result = method(self)
+        if result is not None:
+            self.memo[key] = (result, tokenizer.pos, tokenizer.history)
+        return result
+
+    return cast(_MemoizedMethodT, memoized)
+
+
 class ParserCommons:
     """
     Collection of common things used in parsing MLIR/IRDL
@@ -410,6 +525,17 @@ class ParserCommons:
     type_alias = re.compile(r"![A-Za-z_][\w$.]+")
     attribute_alias = re.compile(r"#[A-Za-z_][\w$.]+")
     boolean_literal = re.compile(r"(true|false)")
+    numeric_list = re.compile(r"[-+0-9.eE,\[\]\s]*")
+    """The characters of a list of numeric literals, parsed in bulk."""
+    numeric_literal = re.compile(
+        r"[-+]?[0-9]+(?:\.[0-9]*(?:[eE][-+]?[0-9]+)?)?")
+    whitespace = re.compile(r"\s+")
+    flat_list_skeleton = re.compile(r"0(?:,0)*")
+    nested_list_skeleton = re.compile(r"\[(?:0(?:,0)*,?)?\]")
+    """
+    The skeletons of numeric lists, where each literal is replaced by `0`.
+    A nested list is reduced to `0`, from its innermost lists outwards.
+    """
     # A list of names that are builtin types
     _builtin_type_names = (
         r"[su]?i\d+", r"f\d+", "tensor", "vector", "memref", "complex",
@@ -462,17 +588,27 @@ class BaseParser(ABC):
 
     allow_unregistered_ops: bool
 
+    memo: dict[tuple[str, int], tuple[Any, int, BacktrackingHistory | None]]
+    """
+    The results of memoized methods, with the position and backtracking
+    history they ended with, by method name and starting position.
+    The results are only kept while parsing the current operation.
+    """
+
     def __init__(self,
                  ctx: MLContext,
-                 input: str,
+                 input: str | Input,
                  name: str = '<unknown>',
                  allow_unregistered_ops: bool = False):
-        self.tokenizer = Tokenizer(Input(input, name))
+        if not isinstance(input, Input):
+            input = Input(input, name)
+        self.tokenizer = Tokenizer(input)
         self.ctx = ctx
         self.ssaValues = dict()
         self.blocks = dict()
         self.forward_block_references = dict()
         self.allow_unregistered_ops = allow_unregistered_ops
+        self.memo = dict()
 
     def parse_module(self) -> ModuleOp:
         op = self.try_parse_operation()
@@ -487,6 +623,60 @@ class BaseParser(ABC):
             self.raise_error("Expected ModuleOp at top level!",
                              self.tokenizer.next_token())
 
+    def parse_module_ops(self) -> Iterator[Operation]:
+        """
+        Parse a top-level `builtin.module`, and yield its operations one at a
+        time, as soon as each of them is parsed.
+
+        The module itself is not created, and the yielded operations are not
+        attached to a block, so that they can be processed and released one
+        at a time. The attributes of the module are ignored.
+        """
+        self.parse_module_start()
+        while (op := self.try_parse_operation()) is not None:
+            yield op
+        self.parse_module_end()
+
+    def parse_module_start(self) -> dict[str, Attribute]:
+        """
+        Parse a top-level `builtin.module` up to the start of the block of its
+        region, and get the attributes preceding it.
+        """
+        name = self._try_parse_op_name()
+        if name is None:
+            self.raise_error("Expected ModuleOp at top level!")
+        if self._get_op_by_name(name) is not ModuleOp:
+            self.raise_error("Expected ModuleOp at top level!", name)
+
+        attributes = self._parse_module_region_start()
+        self.blocks = dict()
+        self.forward_block_references = defaultdict(list)
+        return attributes
+
+    def parse_module_end(self) -> dict[str, Attribute]:
+        """
+        Parse the end of a top-level `builtin.module`, after the operations of
+        its block, and get the attributes following it.
+        """
+        self.parse_characters("}", "Reached end of region, expected `}`!")
+        return self._parse_module_region_end()
+
+    @abstractmethod
+    def _parse_module_region_start(self) -> dict[str, Attribute]:
+        """
+        Parse a module after its name, up to the start of the block of its
+        region, and get the attributes parsed on the way.
+        """
+        raise NotImplementedError()
+
+    @abstractmethod
+    def _parse_module_region_end(self) -> dict[str, Attribute]:
+        """
+        Parse a module after the end of its region, and get the attributes
+        parsed on the way.
+        """
+        raise NotImplementedError()
+
     def get_ssa_val(self, name: Span) -> SSAValue:
         if name.text not in self.ssaValues:
             self.raise_error('SSA Value used before assignment', name)
@@ -638,17 +828,23 @@ class BaseParser(ABC):
 
     def try_parse_string_literal(self) -> StringLiteral | None:
         return StringLiteral.from_span(
-            self.tokenizer.next_token_of_pattern(ParserCommons.string_literal))
+            self.tokenizer.next_token_of_kind(TokenKind.STRING_LIT))
 
     def try_parse_float_literal(self) -> Span | None:
         return self.tokenizer.next_token_of_pattern(
             ParserCommons.float_literal)
 
     def try_parse_bare_id(self) -> Span | None:
-        return self.tokenizer.next_token_of_pattern(ParserCommons.bare_id)
+        # Bare ids of a single character are not parsed
+        token = self.tokenizer.next_token_of_kind(TokenKind.BARE_IDENT,
+                                                  peek=True)
+        if token is None or len(token) < 2:
+            return None
+        self.tokenizer.consume_peeked(token)
+        return token
 
     def try_parse_value_id(self) -> Span | None:
-        return self.tokenizer.next_token_of_pattern(ParserCommons.value_id)
+        return self.tokenizer.next_token_of_kind(TokenKind.VALUE_ID)
 
     def try_parse_operand(self) -> SSAValue | None:
         """Try to parse an operand with format `%<value-id>`."""
@@ -665,7 +861,7 @@ class BaseParser(ABC):
         return self.tokenizer.next_token_of_pattern(ParserCommons.suffix_id)
 
     def try_parse_block_id(self) -> Span | None:
-        return self.tokenizer.next_token_of_pattern(ParserCommons.block_id)
+        return self.tokenizer.next_token_of_kind(TokenKind.BLOCK_ID)
 
     def try_parse_boolean_literal(self) -> Span | None:
         return self.tokenizer.next_token_of_pattern(
@@ -687,12 +883,14 @@ class BaseParser(ABC):
                 self.raise_error("Expected type of value-id here!")
             return value_id, type
 
+    @_memoize
     def try_parse_type(self) -> Attribute | None:
         if self.tokenizer.starts_with('!'):
             return self.try_parse_dialect_type()
         else:
             return self.try_parse_builtin_type()
 
+    @_memoize
     def try_parse_dialect_type_or_attribute(self) -> Attribute | None:
         """
         Parse a type or an attribute.
@@ -940,6 +1138,8 @@ class BaseParser(ABC):
             return self.parse_operation()
 
     def parse_operation(self) -> Operation:
+        # The input before the operation is not parsed again
+        self.memo.clear()
         result_list, ret_types = self._parse_op_result_list()
         if len(result_list) > 0:
             self.parse_characters(
@@ -1088,6 +1288,7 @@ class BaseParser(ABC):
         """
         raise NotImplementedError()
 
+    @_memoize
     def try_parse_attribute(self) -> Attribute | None:
         with self.tokenizer.backtracking("attribute"):
             return self.parse_attribute()
@@ -1147,7 +1348,12 @@ class BaseParser(ABC):
     def _parse_builtin_dense_attr(self, _name: Span) -> Attribute | None:
         err_msg = "Malformed dense attribute, format must be (`dense<` array-attr `>:` type)"  # noqa
         self.parse_characters("<", err_msg)
-        info = list(self._parse_builtin_dense_attr_args())
+        hex_blob = self.try_parse_string_literal()
+        info = None
+        if hex_blob is None:
+            info = self._try_parse_numeric_list(nested=True)
+            if info is None:
+                info = list(self._parse_builtin_dense_attr_args())
         self.parse_characters(">", err_msg)
         self.parse_characters(":", err_msg)
         type = self.expect(self.try_parse_type,
@@ -1155,8 +1361,60 @@ class BaseParser(ABC):
 
         assert isa(type, AnyTensorType)
 
+        if info is None:
+            assert hex_blob is not None
+            info = self._parse_dense_hex_blob(hex_blob, type)
+
         return DenseIntOrFPElementsAttr.from_list(type, info)
 
+    def _parse_dense_hex_blob(
+            self, blob: StringLiteral,
+            tensor_type: AnyTensorType) -> list[int] | list[float]:
+        """
+        Convert the hex form of a dense attribute, `"0x..."`, holding the
+        little-endian binary representation of its elements.
+        A blob holding a single element is a splat of this element.
+        """
+        contents = blob.string_contents
+        if not contents.startswith("0x"):
+            self.raise_error("Expected a hex string of the form `0x...`!",
+                             blob)
+        try:
+            data = bytes.fromhex(contents[2:])
+        except ValueError:
+            self.raise_error("Malformed hex string in dense attribute!", blob)
+
+        element_type = tensor_type.element_type
+        if isinstance(element_type, IntegerType | IndexType):
+            width = (64 if isinstance(element_type, IndexType) else
+                     element_type.width.data)
+            unsigned = (isinstance(element_type, IntegerType)
+                        and element_type.signedness.data
+                        == Signedness.UNSIGNED)
+            fmt = {8: "b", 16: "h", 32: "i", 64: "q"}.get(width)
+            if fmt is not None and unsigned:
+                fmt = fmt.upper()
+        else:
+            float_formats: dict[type[Attribute], str] = {
+                Float16Type: "e",
+                Float32Type: "f",
+                Float64Type: "d"
+            }
+            fmt = float_formats.get(type(element_type))
+        if fmt is None:
+            self.raise_error(
+                f"Hex dense attributes of element type {element_type} are "
+                "not supported!", blob)
+
+        num_elements, remainder = divmod(len(data), struct.calcsize(fmt))
+        shape = tensor_type.get_shape()
+        if (remainder or num_elements == 0
+                or num_elements != 1 and all(dim >= 0 for dim in shape)
+                and num_elements != math.prod(shape)):
+            self.raise_error(
+                "Hex dense attribute size does not match its type!", blob)
+        return list(struct.unpack(f"<{num_elements}{fmt}", data))
+
     def _parse_builtin_opaque_attr(self, _name: Span):
         self.parse_characters("<", "Opaque attribute must be parametrized")
         str_lit_list = self.parse_list_of(self.try_parse_string_literal,
@@ -1216,12 +1474,50 @@ class BaseParser(ABC):
                 return int(v.text)
             return None
 
-        values = self.parse_list_of(try_parse_dense_array_value,
-                                    "Expected tensor literal here!")
+        values = self._try_parse_numeric_list(nested=False)
+        if values is None:
+            values = self.parse_list_of(try_parse_dense_array_value,
+                                        "Expected tensor literal here!")
         self.parse_characters(">", err_msg)
 
         return DenseArrayBase.from_list(element_type, values)
 
+    def _try_parse_numeric_list(self,
+                                nested: bool) -> list[int | float] | None:
+        """
+        Try to parse a list of numeric literals ending before a `>` in bulk,
+        instead of one literal at a time.
+        The list is a comma-separated list of literals, or if `nested` is
+        set, a dense literal of nested bracketed lists.
+        Return None without consuming any input if the list contains anything
+        else, so that it is parsed one literal at a time.
+        """
+        content = self.tokenizer.input.content
+        start = self.tokenizer.next_pos()
+        # The pattern also matches an empty list
+        match = ParserCommons.numeric_list.match(content, start)
+        assert match is not None
+        end = match.end()
+        if not content.startswith(">", end):
+            return None
+        literal = content[start:end]
+        skeleton = ParserCommons.whitespace.sub(
+            "", ParserCommons.numeric_literal.sub("0", literal))
+        if nested:
+            while (reduced := ParserCommons.nested_list_skeleton.sub(
+                    "0", skeleton)) != skeleton:
+                skeleton = reduced
+            if skeleton != "0":
+                return None
+        elif ParserCommons.flat_list_skeleton.fullmatch(skeleton) is None:
+            return None
+
+        self.tokenizer.pos = end
+        numbers = ParserCommons.numeric_literal.findall(literal)
+        if "." not in literal:
+            return list(map(int, numbers))
+        return [float(num) if "." in num else int(num) for num in numbers]
+
     def _parse_builtin_dense_attr_args(self) -> Iterable[int | float]:
         """
         Dense attribute params must be:
@@ -1557,6 +1853,7 @@ class BaseParser(ABC):
 
 class MLIRParser(BaseParser):
 
+    @_memoize
     def try_parse_builtin_type(self) -> Attribute | None:
         """
         parse a builtin-type like i32, index, vector<i32> etc.
@@ -1637,6 +1934,24 @@ class MLIRParser(BaseParser):
 
         return args, succ, attrs, regions, func_type
 
+    def _parse_module_region_start(self) -> dict[str, Attribute]:
+        if self._parse_op_args_list() or self._parse_optional_successor_list(
+        ):
+            self.raise_error("builtin.module expects no operands or successors")
+        self.parse_characters("(", "Expected brackets enclosing regions!")
+        self.parse_characters("{", "Regions begin with `{`")
+        return dict()
+
+    def _parse_module_region_end(self) -> dict[str, Attribute]:
+        self.parse_characters(")", "Expected brackets enclosing regions!")
+        attributes = self.parse_optional_attr_dict()
+        self.parse_characters(
+            ":",
+            "MLIR Operation definitions must end in a function type signature!"
+        )
+        self.parse_function_type()
+        return attributes
+
     def _parse_optional_successor_list(self) -> list[Span]:
         if not self.tokenizer.starts_with("["):
             return []
@@ -1680,6 +1995,7 @@ class MLIRParser(BaseParser):
 
 class XDSLParser(BaseParser):
 
+    @_memoize
     def try_parse_builtin_type(self) -> Attribute | None:
         """
         parse a builtin-type like i32, index, vector<i32> etc.
@@ -1781,6 +2097,17 @@ class XDSLParser(BaseParser):
 
         return args, succ, attrs, regions, None
 
+    def _parse_module_region_start(self) -> dict[str, Attribute]:
+        if self._parse_op_args_list() or self._parse_optional_successor_list(
+        ):
+            self.raise_error("builtin.module expects no operands or successors")
+        attributes = self.parse_optional_attr_dict()
+        self.parse_characters("{", "Regions begin with `{`")
+        return attributes
+
+    def _parse_module_region_end(self) -> dict[str, Attribute]:
+        return dict()
+
     def _parse_optional_successor_list(self) -> list[Span]:
         if not self.tokenizer.starts_with("("):
             return []
@@ -1827,6 +2154,7 @@ class XDSLParser(BaseParser):
         # TODO: check if type is correct here!
         return [name for name, _ in args]
 
+    @_memoize
     def try_parse_type(self) -> Attribute | None:
         return self.try_parse_attribute()
 
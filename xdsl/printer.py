@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import sys
 from dataclasses import dataclass, field
 from enum import Enum
 from typing import Iterable, Sequence, TypeVar, Any, Dict, Optional, List, cast
@@ -19,6 +20,9 @@ from xdsl.dialects.builtin import (
 
 indentNumSpaces = 2
 
+_FLUSH_THRESHOLD = 4096
+"""The number of buffered fragments above which the buffer is flushed."""
+
 
 @dataclass(eq=False, repr=False)
 class Printer:
@@ -38,44 +42,113 @@ class Printer:
     _block_names: Dict[Block, int] = field(default_factory=dict, init=False)
     _next_valid_name_id: int = field(default=0, init=False)
     _next_valid_block_id: int = field(default=0, init=False)
-    _current_line: int = field(default=0, init=False)
-    _current_column: int = field(default=0, init=False)
     _next_line_callback: List[Callable[[], None]] = field(default_factory=list,
                                                           init=False)
-
-    def print(self, *argv: Any) -> None:
+    _buffer: List[str] = field(default_factory=list[str], init=False)
+    """The fragments printed since the buffer was last flushed."""
+    _buffering: bool = field(default=False, init=False)
+    _type_strings: Dict[int, tuple[Attribute, str]] = field(
+        default_factory=dict[int, tuple[Attribute, str]], init=False)
+    """The text of the printed types, by the id of the type."""
+    _column: int = field(default=0, init=False)
+    """The column at the end of the text written to the stream."""
+    _write: Callable[[str], None] = field(init=False)
+    """Emit a fragment, in the buffer when buffering, or in the stream."""
+    _print_functions: Dict[type, Callable[[Printer, Any], None]] = field(
+        init=False)
+    """The function printing each type of argument of `print`."""
+    _attribute_print_functions: Dict[tuple[Target, type[Attribute]],
+                                     Callable[[Printer, Any], None]] = field(
+                                         init=False)
+    """The function printing each attribute class, for each target."""
+
+    def __post_init__(self):
+        self._write = self._write_to_stream
+        # The print functions are looked up once per printer class, so that
+        # the methods overridden by subclasses are used
+        tables = _print_function_tables.get(type(self))
+        if tables is None:
+            tables = _print_function_tables[type(self)] = ({}, {})
+        self._print_functions, self._attribute_print_functions = tables
+
+    def print(self, *argv: object) -> None:
         for arg in argv:
-            if isinstance(arg, str):
-                self.print_string(arg)
-                continue
-            if isinstance(arg, SSAValue):
-                self.print_ssa_value(arg)
-                continue
-            if isinstance(arg, Attribute):
-                self.print_attribute(arg)
-                continue
-            if isinstance(arg, Region):
-                self.print_region(arg)
-                continue
-            if isinstance(arg, Block):
-                self.print_block(arg)
-                self._print_new_line()
-                continue
-            if isinstance(arg, Operation):
-                self.print_op(arg)
-                self._print_new_line()
-                continue
-            text = str(arg)
-            self.print_string(text)
+            if (print_fn := self._print_functions.get(type(arg))) is None:
+                print_fn = self._get_print_function(type(arg))
+            print_fn(self, arg)
+
+    def _get_print_function(self,
+                            arg_type: type) -> Callable[[Printer, Any], None]:
+        """Get the function printing an argument type, and cache it."""
+        for rule_type, name in _print_rules:
+            if issubclass(arg_type, rule_type):
+                break
+        else:
+            name = "_print_as_string"
+        print_fn = getattr(type(self), name)
+        self._print_functions[arg_type] = print_fn
+        return print_fn
+
+    def _print_block_and_new_line(self, block: Block) -> None:
+        self.print_block(block)
+        self._print_new_line()
+
+    def _print_op_and_new_line(self, op: Operation) -> None:
+        self.print_op(op)
+        self._print_new_line()
+
+    def _print_as_string(self, arg: Any) -> None:
+        self.print_string(str(arg))
 
     def print_string(self, text: str) -> None:
-        lines = text.split('\n')
-        if len(lines) != 1:
-            self._current_line += len(lines) - 1
-            self._current_column = len(lines[-1])
+        self._write(text)
+
+    def _write_to_stream(self, text: str) -> None:
+        newline = text.rfind("\n")
+        if newline == -1:
+            self._column += len(text)
         else:
-            self._current_column += len(lines[-1])
-        print(text, end='', file=self.stream)
+            self._column = len(text) - newline - 1
+        (sys.stdout if self.stream is None else self.stream).write(text)
+
+    @property
+    def _current_column(self) -> int:
+        """
+        The column at the end of the printed text. It is only computed for
+        diagnostics, from the fragments printed since the last line break.
+        """
+        column = 0
+        for text in reversed(self._buffer):
+            newline = text.rfind("\n")
+            if newline != -1:
+                return column + len(text) - newline - 1
+            column += len(text)
+        return column + self._column
+
+    def _flush(self) -> None:
+        """Write the buffered fragments to the stream in one chunk."""
+        if not self._buffer:
+            return
+        column = self._current_column
+        text = "".join(self._buffer)
+        # The buffer is cleared in place, as `_write` may be its `append`
+        self._buffer.clear()
+        (sys.stdout if self.stream is None else self.stream).write(text)
+        self._column = column
+
+    def _print_buffered(self, print_fn: Callable[[T], None], arg: T) -> None:
+        """
+        Call a print function, with its output buffered and written to the
+        stream when it returns.
+        """
+        self._buffering = True
+        self._write = self._buffer.append
+        try:
+            print_fn(arg)
+        finally:
+            self._buffering = False
+            self._write = self._write_to_stream
+            self._flush()
 
     def _add_message_on_next_line(self, message: str, begin_pos: int,
                                   end_pos: int):
@@ -142,12 +215,12 @@ class Printer:
                         indent: int | None = None,
                         print_message: bool = True) -> None:
         indent = self._indent if indent is None else indent
-        self.print("\n")
-        if print_message:
+        self._write("\n")
+        if print_message and self._next_line_callback:
             for callback in self._next_line_callback:
                 callback()
             self._next_line_callback = []
-        self.print(" " * indent * indentNumSpaces)
+        self._write(" " * indent * indentNumSpaces)
 
     def _get_new_valid_name_id(self) -> str:
         self._next_valid_name_id += 1
@@ -221,6 +294,11 @@ class Printer:
     def print_block(self, block: Block, print_block_name: bool = True) -> None:
         if not isinstance(block, Block):
             raise TypeError('Expected a Block; got %s' % type(block).__name__)
+        if not self._buffering:
+            self._print_buffered(
+                lambda block: self.print_block(block, print_block_name),
+                block)
+            return
 
         print_block_args = len(block.args) > 0
         if print_block_args or print_block_name:
@@ -237,6 +315,8 @@ class Printer:
         for op in block.ops:
             self._print_new_line()
             self.print_op(op)
+            if len(self._buffer) > _FLUSH_THRESHOLD:
+                self._flush()
         self._indent -= 1
 
     def _print_block_arg(self, arg: BlockArgument) -> None:
@@ -253,6 +333,9 @@ class Printer:
         if not isinstance(region, Region):
             raise TypeError('Expected a Region; got %s' %
                             type(region).__name__)
+        if not self._buffering:
+            self._print_buffered(self.print_region, region)
+            return
 
         print_block_name = len(region.blocks) != 1
 
@@ -262,7 +345,7 @@ class Printer:
         self._print_new_line()
         self.print("}")
 
-    def print_regions(self, regions: List[Region]) -> None:
+    def print_regions(self, regions: Sequence[Region]) -> None:
         if len(regions) == 0:
             return
 
@@ -288,7 +371,7 @@ class Printer:
 
     def print_paramattr_parameters(
             self,
-            params: list[Attribute],
+            params: Sequence[Attribute],
             always_print_brackets: bool = False) -> None:
         if len(params) == 0 and not always_print_brackets:
             return
@@ -300,243 +383,245 @@ class Printer:
         self.print(json.dumps(string))
 
     def print_attribute(self, attribute: Attribute) -> None:
-        if isinstance(attribute, UnitAttr):
+        key = (self.target, type(attribute))
+        if (print_fn := self._attribute_print_functions.get(key)) is None:
+            print_fn = self._get_attribute_print_function(type(attribute))
+        if not isinstance(attribute, MLIRType):
+            print_fn(self, attribute)
             return
 
-        if isinstance(attribute, IntegerType):
-            if self.target == self.Target.XDSL:
-                self.print("!")
-            if attribute.signedness.data == Signedness.SIGNLESS:
-                self.print("i")
-            elif attribute.signedness.data == Signedness.SIGNED:
-                self.print("si")
-            elif attribute.signedness.data == Signedness.UNSIGNED:
-                self.print("ui")
-            self.print(attribute.width.data)
+        # Types are few and printed often, so they are rendered once, and
+        # then printed from their text
+        cached = self._type_strings.get(id(attribute))
+        if cached is not None and cached[0] is attribute:
+            self._write(cached[1])
             return
+        buffering, write = self._buffering, self._write
+        self._buffering = True
+        self._write = self._buffer.append
+        start = len(self._buffer)
+        try:
+            print_fn(self, attribute)
+        finally:
+            self._buffering = buffering
+            self._write = write
+        text = "".join(self._buffer[start:])
+        del self._buffer[start:]
+        # The type is kept alive, so that its id is not reused
+        self._type_strings[id(attribute)] = (attribute, text)
+        self._write(text)
+
+    def _get_attribute_print_function(
+            self, attr_type: type[Attribute]) -> Callable[[Printer, Any], None]:
+        """Get the function printing an attribute class, and cache it."""
+        for rule_type, mlir_only, name in _attribute_print_rules:
+            if issubclass(attr_type, rule_type) and (
+                    not mlir_only or self.target == Printer.Target.MLIR):
+                break
+        else:
+            if self.target == Printer.Target.MLIR:
+                name = "_print_mlir_attribute"
+            elif issubclass(attr_type, Data):
+                name = "_print_data"
+            else:
+                name = "_print_parametrized_attribute"
+        print_fn = getattr(type(self), name)
+        self._attribute_print_functions[self.target, attr_type] = print_fn
+        return print_fn
 
-        if self.target == self.Target.MLIR:
-            if isinstance(attribute, Float16Type):
-                self.print('f16')
-                return
-            if isinstance(attribute, Float32Type):
-                self.print('f32')
-                return
-            if isinstance(attribute, Float64Type):
-                self.print('f64')
-                return
-
-        if isinstance(attribute, StringAttr):
-            self.print_string_literal(attribute.data)
-            return
-
-        if isinstance(attribute, SymbolRefAttr):
-            self.print(f'@{attribute.root_reference.data}')
-            for ref in attribute.nested_references.data:
-                self.print(f'::@{ref.data}')
-            return
-
-        if isinstance(attribute, IntegerAttr):
-            attribute = cast(AnyIntegerAttr, attribute)
-
-            # boolean shorthands
-            if (isinstance((typ := attribute.typ), IntegerType)
-                    and typ.width.data == 1):
-                self.print("false" if attribute.value.data == 0 else "true")
-                return
+    def _print_unit_attr(self, attribute: UnitAttr) -> None:
+        pass
 
-            width = attribute.parameters[0]
-            typ = attribute.parameters[1]
-            assert (isinstance(width, IntAttr))
-            self.print(width.data)
-            self.print(" : ")
-            self.print_attribute(typ)
-            return
+    def _print_type_name(self, attribute: Attribute) -> None:
+        self.print(attribute.name)
 
-        if isinstance(attribute, FloatAttr):
-            value = attribute.value
-            typ = cast(FloatAttr[Float16Type | Float32Type | Float64Type],
-                       attribute).type
-            self.print(value.data)
-            self.print(" : ")
-            self.print_attribute(typ)
-            return
+    def _print_string_attr(self, attribute: StringAttr) -> None:
+        self.print_string_literal(attribute.data)
 
-        if isinstance(attribute, ArrayAttr):
-            self.print_string("[")
-            self.print_list(
-                attribute.data,  # type: ignore
-                self.print_attribute)
-            self.print_string("]")
+    def _print_integer_type(self, attribute: IntegerType) -> None:
+        if self.target == self.Target.XDSL:
+            self.print("!")
+        if attribute.signedness.data == Signedness.SIGNLESS:
+            self.print("i")
+        elif attribute.signedness.data == Signedness.SIGNED:
+            self.print("si")
+        elif attribute.signedness.data == Signedness.UNSIGNED:
+            self.print("ui")
+        self.print(attribute.width.data)
+
+    def _print_symbol_ref_attr(self, attribute: SymbolRefAttr) -> None:
+        self.print(f'@{attribute.root_reference.data}')
+        for ref in attribute.nested_references.data:
+            self.print(f'::@{ref.data}')
+
+    def _print_integer_attr(self, attribute: AnyIntegerAttr) -> None:
+        # boolean shorthands
+        if (isinstance((typ := attribute.typ), IntegerType)
+                and typ.width.data == 1):
+            self.print("false" if attribute.value.data == 0 else "true")
             return
 
-        if isinstance(attribute, DenseArrayBase):
-            self.print("array<", attribute.elt_type)
-            data = cast(ArrayAttr[IntAttr | FloatData], attribute.data)
-            if len(data.data) == 0:
-                self.print(">")
-                return
-            self.print(": ")
-            self.print_list(data.data, lambda x: self.print(x.data))
+        width = attribute.parameters[0]
+        typ = attribute.parameters[1]
+        assert (isinstance(width, IntAttr))
+        self.print(width.data)
+        self.print(" : ")
+        self.print_attribute(typ)
+
+    def _print_float_attr(self, attribute: AnyFloatAttr) -> None:
+        value = attribute.value
+        typ = attribute.type
+        self.print(value.data)
+        self.print(" : ")
+        self.print_attribute(typ)
+
+    def _print_array_attr(self, attribute: ArrayAttr[Attribute]) -> None:
+        self.print_string("[")
+        self.print_list(
+            attribute.data,  # type: ignore
+            self.print_attribute)
+        self.print_string("]")
+
+    def _print_dense_array(self, attribute: DenseArrayBase) -> None:
+        self.print("array<", attribute.elt_type)
+        data = cast(ArrayAttr[IntAttr | FloatData], attribute.data)
+        if len(data.data) == 0:
             self.print(">")
             return
+        self.print(": ")
+        self.print_list(data.data, lambda x: self.print(x.data))
+        self.print(">")
 
-        if isinstance(attribute, DictionaryAttr):
-            self.print_string("{")
-            self.print_dictionary(attribute.data, self.print_string_literal,
-                                  self.print_attribute)
-            self.print_string("}")
-            return
+    def _print_dictionary_attr(self, attribute: DictionaryAttr) -> None:
+        self.print_string("{")
+        self.print_dictionary(attribute.data, self.print_string_literal,
+                              self.print_attribute)
+        self.print_string("}")
 
-        # Function types have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, FunctionType)
-                and self.target == self.Target.MLIR):
+    # Function types have an alias in MLIR, but not in xDSL
+    def _print_function_type(self, attribute: FunctionType) -> None:
+        self.print("(")
+        self.print_list(attribute.inputs.data, self.print_attribute)
+        self.print(") -> ")
+        outputs = attribute.outputs.data
+        if len(outputs) == 1 and not isinstance(outputs[0], FunctionType):
+            self.print_attribute(outputs[0])
+        else:
             self.print("(")
-            self.print_list(attribute.inputs.data, self.print_attribute)
-            self.print(") -> ")
-            outputs = attribute.outputs.data
-            if len(outputs) == 1 and not isinstance(outputs[0], FunctionType):
-                self.print_attribute(outputs[0])
-            else:
-                self.print("(")
-                self.print_list(outputs, self.print_attribute)
-                self.print(")")
-            return
-
-        # Dense element types have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, DenseIntOrFPElementsAttr)
-                and self.target == self.Target.MLIR):
-
-            def print_dense_list(array: Sequence[AnyIntegerAttr]
-                                 | Sequence[AnyFloatAttr], shape: List[int]):
-
-                def print_one_elem(val: Attribute):
-                    if isinstance(val, IntegerAttr):
-                        self.print(val.value.data)
-                    elif isinstance(val, FloatAttr):
-                        self.print(val.value.data)
-                    else:
-                        raise Exception("unexpected attribute type "
-                                        "in DenseIntOrFPElementsAttr: "
-                                        f"{type(val)}")
-
-                self.print('[')
-                if len(shape) > 1:
-                    k = len(array) // shape[0]
-                    self.print_list(
-                        (array[i:i + k] for i in range(0, len(array), k)),
-                        lambda subarray: print_dense_list(subarray, shape[1:]))
-                else:
-                    self.print_list(array, print_one_elem)
-                self.print(']')
-
-            self.print("dense<")
-            data = attribute.data.data
-            shape = attribute.shape if attribute.shape_is_complete else [
-                len(data)
-            ]
-            assert shape is not None, "If shape is complete, then it cannot be None"
-            print_dense_list(data, shape)
-            self.print("> : ")
-            self.print(attribute.type)
-            return
-
-        # Dense resources have an alias in MLIR, but not in xDSL
-        if isinstance(attribute, DenseResourceAttr):
-            handle = attribute.resource_handle.data
-            self.print(f"dense_resource<{handle}> : ", attribute.type)
-            return
-
-        # vector types have an alias in MLIR, but not in xDSL
-        if ((isinstance(attribute, VectorType)
-             or isinstance(attribute, TensorType))
-                and self.target == self.Target.MLIR):
-            attribute = cast(AnyVectorType, attribute)
-            self.print(
-                "vector<" if isinstance(attribute, VectorType) else "tensor<")
-            self.print_list(
-                attribute.shape.data, lambda x: self.print(x.value.data)
-                if x.value.data != -1 else self.print("?"), "x")
-            if len(attribute.shape.data) != 0:
-                self.print("x")
-            self.print(attribute.element_type)
-            self.print(">")
-            return
+            self.print_list(outputs, self.print_attribute)
+            self.print(")")
 
-        # Unranked tensors have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, UnrankedTensorType)
-                and self.target == self.Target.MLIR):
-            attribute = cast(AnyUnrankedTensorType, attribute)
-            self.print("tensor<*x")
-            self.print(attribute.element_type)
-            self.print(">")
-            return
+    # Dense element types have an alias in MLIR, but not in xDSL
+    def _print_dense_elements(self,
+                              attribute: DenseIntOrFPElementsAttr) -> None:
 
-        # memref types have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, MemRefType)
-                and self.target == self.Target.MLIR):
-            attribute = cast(MemRefType[Attribute], attribute)
-            self.print("memref<")
-            self.print_list(
-                attribute.shape.data, lambda x: self.print(x.value.data)
-                if x.value.data != -1 else self.print("?"), "x")
-            self.print("x", attribute.element_type)
-            self.print(">")
-            return
+        def print_dense_list(array: Sequence[AnyIntegerAttr]
+                             | Sequence[AnyFloatAttr], shape: List[int]):
 
-        # Unranked tensors have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, UnrankedMemrefType)
-                and self.target == self.Target.MLIR):
-            attribute = cast(AnyUnrankedMemrefType, attribute)
-            self.print("memref<*x")
-            self.print(attribute.element_type)
-            self.print(">")
-            return
+            def print_one_elem(val: Attribute):
+                if isinstance(val, IntegerAttr):
+                    self.print(val.value.data)
+                elif isinstance(val, FloatAttr):
+                    self.print(val.value.data)
+                else:
+                    raise Exception("unexpected attribute type "
+                                    "in DenseIntOrFPElementsAttr: "
+                                    f"{type(val)}")
 
-        # IndexType has an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, IndexType)
-                and self.target == self.Target.MLIR):
-            self.print("index")
-            return
+            self.print('[')
+            if len(shape) > 1:
+                k = len(array) // shape[0]
+                self.print_list(
+                    (array[i:i + k] for i in range(0, len(array), k)),
+                    lambda subarray: print_dense_list(subarray, shape[1:]))
+            else:
+                self.print_list(array, print_one_elem)
+            self.print(']')
+
+        self.print("dense<")
+        data = attribute.data.data
+        shape = attribute.shape if attribute.shape_is_complete else [
+            len(data)
+        ]
+        assert shape is not None, "If shape is complete, then it cannot be None"
+        print_dense_list(data, shape)
+        self.print("> : ")
+        self.print(attribute.type)
+
+    # Dense resources have an alias in MLIR, but not in xDSL
+    def _print_dense_resource(self, attribute: DenseResourceAttr) -> None:
+        handle = attribute.resource_handle.data
+        self.print(f"dense_resource<{handle}> : ", attribute.type)
+
+    # vector types have an alias in MLIR, but not in xDSL
+    def _print_vector_or_tensor_type(self, attribute: AnyVectorType) -> None:
+        self.print(
+            "vector<" if isinstance(attribute, VectorType) else "tensor<")
+        self.print_list(
+            attribute.shape.data, lambda x: self.print(x.value.data)
+            if x.value.data != -1 else self.print("?"), "x")
+        if len(attribute.shape.data) != 0:
+            self.print("x")
+        self.print(attribute.element_type)
+        self.print(">")
 
-        # opaque attributes have an alias in MLIR, but not in xDSL
-        if (isinstance(attribute, OpaqueAttr)
-                and self.target == self.Target.MLIR):
-            self.print("opaque<", attribute.ident, ", ", attribute.value, ">")
-            if not isinstance(attribute.type, NoneAttr):
-                self.print(" : ", attribute.type)
-            return
+    # Unranked tensors have an alias in MLIR, but not in xDSL
+    def _print_unranked_tensor_type(
+            self, attribute: AnyUnrankedTensorType) -> None:
+        self.print("tensor<*x")
+        self.print(attribute.element_type)
+        self.print(">")
 
-        if self.target == self.Target.MLIR:
-            # For the MLIR target, we may print differently some attributes
-            self.print("!" if isinstance(attribute, MLIRType) else "#")
-            self.print(attribute.name)
+    # memref types have an alias in MLIR, but not in xDSL
+    def _print_memref_type(self, attribute: MemRefType[Attribute]) -> None:
+        self.print("memref<")
+        self.print_list(
+            attribute.shape.data, lambda x: self.print(x.value.data)
+            if x.value.data != -1 else self.print("?"), "x")
+        self.print("x", attribute.element_type)
+        self.print(">")
 
-            if isinstance(attribute, Data):
-                self.print("<")
-                attribute = cast(Data[Any], attribute)
-                attribute.print_parameter(self)
-                self.print(">")
-                return
+    # Unranked memrefs have an alias in MLIR, but not in xDSL
+    def _print_unranked_memref_type(
+            self, attribute: AnyUnrankedMemrefType) -> None:
+        self.print("memref<*x")
+        self.print(attribute.element_type)
+        self.print(">")
 
-            assert isinstance(attribute, ParametrizedAttribute)
+    # opaque attributes have an alias in MLIR, but not in xDSL
+    def _print_opaque_attr(self, attribute: OpaqueAttr) -> None:
+        self.print("opaque<", attribute.ident, ", ", attribute.value, ">")
+        if not isinstance(attribute.type, NoneAttr):
+            self.print(" : ", attribute.type)
 
-            attribute.print_parameters(self)
-            return
+    def _print_mlir_attribute(self, attribute: Attribute) -> None:
+        # For the MLIR target, we may print differently some attributes
+        self.print("!" if isinstance(attribute, MLIRType) else "#")
+        self.print(attribute.name)
 
         if isinstance(attribute, Data):
-            self.print(f'!{attribute.name}<')
+            self.print("<")
             attribute = cast(Data[Any], attribute)
             attribute.print_parameter(self)
             self.print(">")
             return
 
+        assert isinstance(attribute, ParametrizedAttribute)
+
+        attribute.print_parameters(self)
+
+    def _print_data(self, attribute: Data[Any]) -> None:
+        self.print(f'!{attribute.name}<')
+        attribute.print_parameter(self)
+        self.print(">")
+
+    def _print_parametrized_attribute(self, attribute: Attribute) -> None:
         assert isinstance(
             attribute,
             ParametrizedAttribute), f'{attribute}: {type(attribute)}'
 
         # Print parametrized attribute with default formatting
-        if self.target == self.Target.XDSL and self.print_generic_format:
+        if self.print_generic_format:
             self.print(f'!"{attribute.name}"')
             self.print_paramattr_parameters(attribute.parameters,
                                             always_print_brackets=True)
@@ -545,7 +630,7 @@ class Printer:
         self.print(f'!{attribute.name}')
         attribute.print_parameters(self)
 
-    def print_successors(self, successors: List[Block]):
+    def print_successors(self, successors: Sequence[Block]):
         if len(successors) == 0:
             return
         self.print(" (" if self.target == self.Target.XDSL else " [")
@@ -609,7 +694,12 @@ class Printer:
         if not isinstance(op, Operation):
             raise TypeError('Expected an Operation; got %s' %
                             type(op).__name__)
-        begin_op_pos = self._current_column
+        if not self._buffering:
+            self._print_buffered(self.print_op, op)
+            return
+        messages = self.diagnostic.op_messages.get(op)
+        if messages:
+            begin_op_pos = self._current_column
         self._print_results(op)
         if isinstance(op, UnregisteredOp):
             self.print(f'"{op.op_name.data}"')
@@ -617,11 +707,13 @@ class Printer:
             self.print(f'"{op.name}"')
         else:
             self.print(op.name)
-        end_op_pos = self._current_column
-        if op in self.diagnostic.op_messages:
-            for message in self.diagnostic.op_messages[op]:
-                self._add_message_on_next_line(message, begin_op_pos,
-                                               end_op_pos)
+        if messages:
+            end_op_pos = self._current_column
+            for message in messages:
+                self._add_message_on_next_line(
+                    message,
+                    begin_op_pos,  # type: ignore
+                    end_op_pos)
         if isinstance(op, UnregisteredOp):
             op_name = op.op_name
             del op.attributes["op_name__"]
@@ -631,3 +723,56 @@ class Printer:
             self.print_op_with_default_format(op)
         else:
             op.print(self)
+
+
+_print_rules: tuple[tuple[type, str], ...] = (
+    (str, "print_string"),
+    (SSAValue, "print_ssa_value"),
+    (Attribute, "print_attribute"),
+    (Region, "print_region"),
+    (Block, "_print_block_and_new_line"),
+    (Operation, "_print_op_and_new_line"),
+)
+"""
+The argument types of `Printer.print`, in the order they are checked, and the
+name of the method printing them. Other arguments are printed as strings.
+"""
+
+_attribute_print_rules: tuple[tuple[type[Attribute], bool, str], ...] = (
+    (UnitAttr, False, "_print_unit_attr"),
+    (IntegerType, False, "_print_integer_type"),
+    (Float16Type, True, "_print_type_name"),
+    (Float32Type, True, "_print_type_name"),
+    (Float64Type, True, "_print_type_name"),
+    (StringAttr, False, "_print_string_attr"),
+    (SymbolRefAttr, False, "_print_symbol_ref_attr"),
+    (IntegerAttr, False, "_print_integer_attr"),
+    (FloatAttr, False, "_print_float_attr"),
+    (ArrayAttr, False, "_print_array_attr"),
+    (DenseArrayBase, False, "_print_dense_array"),
+    (DictionaryAttr, False, "_print_dictionary_attr"),
+    (FunctionType, True, "_print_function_type"),
+    (DenseIntOrFPElementsAttr, True, "_print_dense_elements"),
+    (DenseResourceAttr, False, "_print_dense_resource"),
+    (VectorType, True, "_print_vector_or_tensor_type"),
+    (TensorType, True, "_print_vector_or_tensor_type"),
+    (UnrankedTensorType, True, "_print_unranked_tensor_type"),
+    (MemRefType, True, "_print_memref_type"),
+    (UnrankedMemrefType, True, "_print_unranked_memref_type"),
+    (IndexType, True, "_print_type_name"),
+    (OpaqueAttr, True, "_print_opaque_attr"),
+)
+"""
+The attribute classes with a custom syntax, in the order they are checked,
+whether the syntax is only used for the MLIR target, and the name of the
+method printing them.
+"""
+
+_print_function_tables: dict[type[Printer], tuple[
+    dict[type, Callable[[Printer, Any], None]],
+    dict[tuple[Printer.Target, type[Attribute]],
+         Callable[[Printer, Any], None]]]] = {}
+"""
+The functions printing each argument type, and each attribute class for each
+target, by printer class.
+"""
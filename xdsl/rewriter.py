@@ -55,12 +55,12 @@ class Rewriter:
             else:
                 old_result.replace_by(new_result)
 
-        op_idx = block.get_operation_index(op)
-        block.erase_op(op_idx, safe_erase=safe_erase)
-        if len(op.results) == 0:
-            block.insert_op(new_ops, op_idx)
-            return
-        block.insert_op(new_ops, op_idx, op.results[0].name)
+        if len(op.results) != 0 and (name := op.results[0].name):
+            for new_op in new_ops:
+                for res in new_op.results:
+                    res.name = name
+        block.insert_ops_before(new_ops, op)
+        block.erase_op(op, safe_erase=safe_erase)
 
     @staticmethod
     def inline_block_at_pos(block: Block, target_block: Block, pos: int):
@@ -69,6 +69,16 @@ class Rewriter:
         This block should not be a parent of the block to move to.
         The block operations should not use the block arguments.
         """
+        ops = Rewriter._detach_ops_to_inline(block, target_block)
+        target_block.insert_op(ops, pos)
+
+    @staticmethod
+    def _detach_ops_to_inline(block: Block,
+                              target_block: Block) -> List[Operation]:
+        """
+        Check that the block operations can be inlined in the target block,
+        and detach them from the block.
+        """
         if block.is_ancestor(target_block):
             raise Exception("Cannot inline a block in a child block.")
         for op in block.ops:
@@ -81,7 +91,7 @@ class Rewriter:
         ops = block.ops.copy()
         for op in ops:
             op.detach()
-        target_block.insert_op(ops, pos)
+        return ops
 
     @staticmethod
     def inline_block_before(block: Block, op: Operation):
@@ -94,8 +104,8 @@ class Rewriter:
             raise Exception(
                 "Cannot inline a block before a toplevel operation")
         op_block = op.parent
-        op_pos = op_block.get_operation_index(op)
-        Rewriter.inline_block_at_pos(block, op_block, op_pos)
+        ops = Rewriter._detach_ops_to_inline(block, op_block)
+        op_block.insert_ops_before(ops, op)
 
     @staticmethod
     def inline_block_after(block: Block, op: Operation):
@@ -108,8 +118,8 @@ class Rewriter:
             raise Exception(
                 "Cannot inline a block before a toplevel operation")
         op_block = op.parent
-        op_pos = op_block.get_operation_index(op)
-        Rewriter.inline_block_at_pos(block, op_block, op_pos + 1)
+        ops = Rewriter._detach_ops_to_inline(block, op_block)
+        op_block.insert_ops_after(ops, op)
 
     @staticmethod
     def insert_block_after(block: Block | List[Block], target: Block):
@@ -145,8 +155,5 @@ class Rewriter:
     def move_region_contents_to_new_regions(region: Region) -> Region:
         """Move the region blocks to a new region."""
         new_region = Region()
-        for block in region.blocks:
-            block.parent = None
-            new_region.add_block(block)
-        region.blocks = []
+        region.move_blocks(new_region)
         return new_region
@@ -5,7 +5,7 @@ from warnings import warn
 from xdsl.pattern_rewriter import (PatternRewriter, PatternRewriteWalker,
                                    RewritePattern, GreedyRewritePatternApplier,
                                    op_type_rewrite_pattern)
-from xdsl.ir import Block, MLContext, Operation
+from xdsl.ir import Block, MLContext, OpIndex, Operation
 from xdsl.irdl import Attribute
 from xdsl.dialects.builtin import FunctionType, ModuleOp
 from xdsl.dialects.func import FuncOp
@@ -329,10 +329,7 @@ def ConvertStencilToGPU(ctx: MLContext, module: ModuleOp):
 
     return_target: dict[ReturnOp, CastOp | memref.Cast] = {}
 
-    def map_returns(op: Operation) -> None:
-        if not isinstance(op, ReturnOp):
-            return
-
+    def map_returns(op: ReturnOp) -> None:
         apply = op.parent_op()
         assert isinstance(apply, ApplyOp)
 
@@ -348,7 +345,9 @@ def ConvertStencilToGPU(ctx: MLContext, module: ModuleOp):
 
         return_target[op] = cast
 
-    module.walk(map_returns)
+    with OpIndex.scoped(module) as index:
+        for op in index.get(ReturnOp):
+            map_returns(op)
 
     the_one_pass = PatternRewriteWalker(GreedyRewritePatternApplier([
         ApplyOpToLaunch(),
@@ -368,10 +367,7 @@ def ConvertStencilToLLMLIR(ctx: MLContext, module: ModuleOp):
 
     return_target: dict[ReturnOp, CastOp | memref.Cast] = {}
 
-    def map_returns(op: Operation) -> None:
-        if not isinstance(op, ReturnOp):
-            return
-
+    def map_returns(op: ReturnOp) -> None:
         apply = op.parent_op()
         assert isinstance(apply, ApplyOp)
 
@@ -387,7 +383,9 @@ def ConvertStencilToLLMLIR(ctx: MLContext, module: ModuleOp):
 
         return_target[op] = cast
 
-    module.walk(map_returns)
+    with OpIndex.scoped(module) as index:
+        for op in index.get(ReturnOp):
+            map_returns(op)
 
     the_one_pass = PatternRewriteWalker(GreedyRewritePatternApplier([
         ApplyOpToParallel(),
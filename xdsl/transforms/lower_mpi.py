@@ -4,7 +4,8 @@ from dataclasses import dataclass
 
 from xdsl.dialects.builtin import Signedness, IntegerType, i32
 from xdsl.dialects.memref import MemRefType
-from xdsl.ir import Operation, SSAValue, OpResult, Attribute, MLContext
+from xdsl.ir import (Operation, SSAValue, OpResult, Attribute, MLContext,
+                     OpIndex)
 
 from xdsl.pattern_rewriter import (RewritePattern, PatternRewriter,
                                    op_type_rewrite_pattern,
@@ -526,17 +527,14 @@ class MpiAddExternalFuncDefs(RewritePattern):
         funcs_to_emit: dict[str, tuple[list[Attribute],
                                        list[Attribute]]] = dict()
 
-        def walker(op: Operation):
-            if not isinstance(op, func.Call):
-                return
-            if op.callee.string_value() not in self.mpi_func_call_names:
-                return
-            funcs_to_emit[op.callee.string_value()] = (
-                [arg.typ for arg in op.arguments],
-                [res.typ for res in op.results],
-            )
-
-        module.walk(walker)
+        with OpIndex.scoped(module) as index:
+            for op in index.get(func.Call):
+                if op.callee.string_value() not in self.mpi_func_call_names:
+                    continue
+                funcs_to_emit[op.callee.string_value()] = (
+                    [arg.typ for arg in op.arguments],
+                    [res.typ for res in op.results],
+                )
 
         # for each func found, add a FuncOp to the top of the module.
         for name, types in funcs_to_emit.items():
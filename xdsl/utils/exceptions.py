@@ -39,6 +39,10 @@ class InvalidIRException(Exception):
     pass
 
 
+class BytecodeError(Exception):
+    """Exception raised when a bytecode file cannot be read or written."""
+
+
 @dataclass
 class BuilderNotFoundException(Exception):
     """
@@ -1,59 +1,98 @@
 from inspect import isclass
 from types import UnionType
-from typing import (Annotated, Any, TypeGuard, TypeVar, Union, cast, get_args,
-                    get_origin)
+from typing import (Annotated, Any, Callable, TypeGuard, TypeVar, Union, cast,
+                    get_args, get_origin)
 from xdsl.ir import ParametrizedAttribute
 
-from xdsl.utils.exceptions import VerifyException
-
 _T = TypeVar("_T")
 
 
-def isa(arg: Any, hint: type[_T]) -> TypeGuard[_T]:
-    """
-    Check if `arg` is of the type described by `hint`.
-    For now, only lists, dictionaries, unions,
-    and non-generic classes are supported for type hints.
-    """
+_isa_checkers: dict[Any, Callable[[Any], bool]] = {}
+"""The checkers of the type hints already used with `isa`."""
+
+_MAX_ISA_CHECKERS = 512
+"""
+The maximal number of type hints whose checkers are cached. The oldest ones
+are evicted first, so that hints created at runtime are not all kept alive.
+"""
+
+
+def _get_isa_checker(hint: Any) -> Callable[[Any], bool]:
+    """Get a function checking if a value is of the type described by `hint`."""
+    try:
+        return _isa_checkers[hint]
+    except KeyError:
+        checker = _build_isa_checker(hint)
+        if len(_isa_checkers) >= _MAX_ISA_CHECKERS:
+            del _isa_checkers[next(iter(_isa_checkers))]
+        _isa_checkers[hint] = checker
+        return checker
+    except TypeError:
+        # The hint is not hashable
+        return _build_isa_checker(hint)
+
+
+def _build_isa_checker(hint: Any) -> Callable[[Any], bool]:
     if hint is Any:
-        return True
+        return lambda arg: True
 
     origin = get_origin(hint)
 
     # get_origin checks that hint is not a parametrized generic
     if isclass(hint) and (origin is None):
-        return isinstance(arg, hint)
+        return lambda arg: isinstance(arg, hint)
 
     if origin is list:
-        if not isinstance(arg, list):
-            return False
-        arg_list: list[Any] = cast(list[Any], arg)
-        elem_hint, = get_args(hint)
-        return all(isa(elem, elem_hint) for elem in arg_list)
+        elem_checker = _get_isa_checker(get_args(hint)[0])
+
+        def list_checker(arg: Any) -> bool:
+            if not isinstance(arg, list):
+                return False
+            return all(elem_checker(elem) for elem in cast(list[Any], arg))
+
+        return list_checker
 
     if origin is dict:
-        if not isinstance(arg, dict):
-            return False
-        arg_dict: dict[Any, Any] = cast(dict[Any, Any], arg)
         key_hint, value_hint = get_args(hint)
-        return all(
-            isa(key, key_hint) and isa(value, value_hint)
-            for key, value in arg_dict.items())
+        key_checker = _get_isa_checker(key_hint)
+        value_checker = _get_isa_checker(value_hint)
+
+        def dict_checker(arg: Any) -> bool:
+            if not isinstance(arg, dict):
+                return False
+            return all(
+                key_checker(key) and value_checker(value)
+                for key, value in cast(dict[Any, Any], arg).items())
+
+        return dict_checker
 
     if origin in [Union, UnionType]:
-        return any(isa(arg, union_arg) for union_arg in get_args(hint))
+        union_checkers = [
+            _get_isa_checker(union_arg) for union_arg in get_args(hint)
+        ]
+        return lambda arg: any(checker(arg) for checker in union_checkers)
 
     from xdsl.irdl import GenericData, irdl_to_attr_constraint
     if (origin is not None) and issubclass(
             origin, GenericData | ParametrizedAttribute):
-        constraint = irdl_to_attr_constraint(hint)
-        try:
-            constraint.verify(arg)
-            return True
-        except VerifyException:
-            return False
-
-    raise ValueError(f"isa: unsupported type hint '{hint}' {get_origin(hint)}")
+        return irdl_to_attr_constraint(hint).matches
+
+    def unsupported_checker(arg: Any) -> bool:
+        raise ValueError(
+            f"isa: unsupported type hint '{hint}' {get_origin(hint)}")
+
+    return unsupported_checker
+
+
+def isa(arg: Any, hint: type[_T]) -> TypeGuard[_T]:
+    """
+    Check if `arg` is of the type described by `hint`.
+    For now, only lists, dictionaries, unions,
+    and non-generic classes are supported for type hints.
+    The check for each type hint is built on its first use, and cached for
+    the most recently built hints.
+    """
+    return _get_isa_checker(hint)(arg)
 
 
 def assert_isa(arg: Any, hint: type[_T]) -> TypeGuard[_T]:
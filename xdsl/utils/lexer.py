@@ -1,7 +1,15 @@
 from __future__ import annotations
 
+import mmap
+import re
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass, field
+from enum import Enum
+from functools import cached_property
 from io import StringIO
+from typing import IO, Iterator
+
+from xdsl.utils.exceptions import ParseError
 
 
 @dataclass(frozen=True)
@@ -12,6 +20,26 @@ class Input:
     content: str = field(repr=False)
     name: str
 
+    @staticmethod
+    def from_file(file: IO[str], name: str) -> Input:
+        """
+        Create an input from the contents of a file.
+        Files on disk are memory-mapped and decoded in one step, instead of
+        being read into an intermediate buffer. Other streams, such as pipes,
+        are read.
+        """
+        try:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Streams without file descriptors, pipes, and empty files
+            return Input(file.read(), name)
+        with mapped:
+            content = str(mapped, getattr(file, "encoding", None) or "utf-8")
+        # Translate newlines, as files read in text mode do
+        if "\r" in content:
+            content = content.replace("\r\n", "\n").replace("\r", "\n")
+        return Input(content, name)
+
     @property
     def len(self):
         return len(self.content)
@@ -19,30 +47,39 @@ class Input:
     def __len__(self):
         return self.len
 
+    @cached_property
+    def line_starts(self) -> list[int]:
+        """
+        The offsets of the first character of each line, computed on first
+        use.
+        """
+        return [0, *(match.end() for match in re.finditer("\n", self.content))]
+
+    def get_line_col(self, offset: int) -> tuple[int, int]:
+        """
+        Get the line (starting from 1) and column (starting from 0) of an
+        offset, or (-1, -1) if it is past the end of the input.
+        """
+        if offset > len(self.content):
+            return -1, -1
+        line_starts = self.line_starts
+        line_no = bisect_right(line_starts, offset)
+        return line_no, offset - line_starts[line_no - 1]
+
     def get_lines_containing(self,
                              span: Span) -> tuple[list[str], int, int] | None:
-        # A pointer to the start of the first line
-        start = 0
-        line_no = 0
-        source = self.content
-        while True:
-            next_start = source.find('\n', start)
-            line_no += 1
-            # Handle eof
-            if next_start == -1:
-                if span.start > len(source):
-                    return None
-                return [source[start:]], start, line_no
-            # As long as the next newline comes before the spans start we can continue
-            if next_start < span.start:
-                start = next_start + 1
-                continue
-            # If the whole span is on one line, we are good as well
-            if next_start >= span.end:
-                return [source[start:next_start]], start, line_no
-            while next_start < span.end:
-                next_start = source.find('\n', next_start + 1)
-            return source[start:next_start].split('\n'), start, line_no
+        if span.start > len(self.content):
+            return None
+        line_starts = self.line_starts
+        line_no = bisect_right(line_starts, span.start)
+        start = line_starts[line_no - 1]
+        # The index of the line after the one containing the end of the span
+        end_idx = max(bisect_left(line_starts, span.end + 1), line_no)
+        if end_idx == len(line_starts):
+            lines = self.content[start:].split('\n')
+        else:
+            lines = self.content[start:line_starts[end_idx] - 1].split('\n')
+        return lines, start, line_no
 
     def at(self, i: int):
         if i >= self.len:
@@ -81,11 +118,7 @@ class Span:
         return self.input.content[self.start:self.end]
 
     def get_line_col(self) -> tuple[int, int]:
-        info = self.input.get_lines_containing(self)
-        if info is None:
-            return -1, -1
-        _lines, offset_of_first_line, line_no = info
-        return line_no, self.start - offset_of_first_line
+        return self.input.get_line_col(self.start)
 
     def print_with_context(self, msg: str | None = None) -> str:
         """
@@ -122,3 +155,101 @@ class Span:
     def __repr__(self):
         return "{}[{}:{}](text='{}')".format(self.__class__.__name__,
                                              self.start, self.end, self.text)
+
+
+class TokenKind(Enum):
+    """The kinds of tokens produced by the `Lexer`."""
+
+    BARE_IDENT = "bare identifier"
+    VALUE_ID = "SSA value identifier"
+    BLOCK_ID = "block identifier"
+    SYMBOL_REF = "symbol reference"
+    TYPE_ID = "type identifier"
+    ATTRIBUTE_ID = "attribute identifier"
+    FLOAT_LIT = "float literal"
+    INTEGER_LIT = "integer literal"
+    STRING_LIT = "string literal"
+    ARROW = "arrow"
+    PUNCTUATION = "punctuation"
+    EOF = "end of file"
+
+
+@dataclass(frozen=True)
+class Token:
+    """A typed token of an Input."""
+
+    kind: TokenKind
+    span: Span
+
+    @property
+    def text(self):
+        return self.span.text
+
+
+class Lexer:
+    """
+    Split an Input into typed tokens, in a single pass.
+
+    All token patterns are combined into a single precompiled regex, with a
+    named group per token kind, so that each token is recognized with a
+    single regex match.
+    Whitespaces and line comments are skipped between tokens.
+    """
+
+    _id_chars = r"[\w$.-]"
+    _suffix_id = rf"(?:[0-9]+|[A-Za-z_$.-]{_id_chars}*)"
+
+    whitespace = re.compile(r"(?:\s+|//[^\n]*)*")
+    """Whitespaces and line comments, skipped before each token."""
+
+    token = re.compile(whitespace.pattern + "(?:" + "|".join(
+        f"(?P<{kind.name}>{pattern})" for kind, pattern in (
+            (TokenKind.VALUE_ID, rf"%{_suffix_id}"),
+            (TokenKind.BLOCK_ID, rf"\^{_suffix_id}"),
+            (TokenKind.SYMBOL_REF, r'@(?:[A-Za-z_][\w$.]*|"[^"\n]*")'),
+            (TokenKind.TYPE_ID, rf"!{_suffix_id}"),
+            (TokenKind.ATTRIBUTE_ID, rf"#{_suffix_id}"),
+            (TokenKind.FLOAT_LIT, r"[0-9]+\.[0-9]*(?:[eE][-+]?[0-9]+)?"),
+            (TokenKind.INTEGER_LIT, r"0x[0-9A-Fa-f]+|[0-9]+"),
+            (TokenKind.STRING_LIT, r'"(?:\\[nfvtr"\\]|[^\n\f\v\r"\\])*"'),
+            (TokenKind.BARE_IDENT, r"[A-Za-z_][\w$.]*"),
+            (TokenKind.ARROW, r"->"),
+            (TokenKind.PUNCTUATION, r"::|[-+*/?<>()\[\]{}:;=,.|!#%@^]"),
+        )) + ")?")
+    """
+    The token patterns, matched in order after the skipped whitespaces.
+    No group matches at the end of the input, or on an unexpected character.
+    """
+
+    input: Input
+
+    pos: int
+    """The position of the first character that was not lexed yet."""
+
+    def __init__(self, input: Input, pos: int = 0):
+        self.input = input
+        self.pos = pos
+
+    def lex(self) -> Token:
+        """
+        Get the next token, and advance past it.
+        An EOF token is returned once the end of the input is reached.
+        """
+        match = self.token.match(self.input.content, self.pos)
+        assert match is not None
+        kind = match.lastgroup
+        if kind is None:
+            start = match.end()
+            if start < len(self.input.content):
+                raise ParseError(Span(start, start + 1, self.input),
+                                 "Unexpected character")
+            self.pos = start
+            return Token(TokenKind.EOF, Span(start, start, self.input))
+        self.pos = match.end()
+        return Token(TokenKind[kind],
+                     Span(match.start(kind), self.pos, self.input))
+
+    def __iter__(self) -> Iterator[Token]:
+        """Iterate over the remaining tokens, until the end of the input."""
+        while (token := self.lex()).kind != TokenKind.EOF:
+            yield token
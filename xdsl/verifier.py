@@ -0,0 +1,119 @@
+"""
+Verification of operations, with isolated functions verified in parallel.
+
+The functions nested in the verified operation are independent units, as
+they are isolated from above: their verification only depends on their own
+body. They are verified across a pool of worker processes, forked from the
+current process so that the IR does not need to be serialized. The workers
+therefore see the IR as it was when they were forked, so they are forked
+again for each verification. On platforms that cannot fork, operations are
+verified serially.
+
+Workers only report which units failed to verify. The verification of the
+operation is then resumed in program order, verifying the remaining
+operations and reverifying the failing units serially, so that the raised
+exception is the one a serial verification would raise.
+"""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Sequence
+
+from xdsl.dialects.func import FuncOp
+from xdsl.ir import Operation
+
+_forked_units: Sequence[Operation] = ()
+"""The units verified by the forked worker processes."""
+
+
+def _get_failing_forked_units(start: int, stop: int) -> list[int]:
+    """Get the indices of the units in the given range that do not verify."""
+    failing: list[int] = []
+    for idx in range(start, stop):
+        try:
+            _forked_units[idx].verify()
+        except Exception:
+            failing.append(idx)
+    return failing
+
+
+def _collect_units(op: Operation,
+                   unit_types: tuple[type[Operation], ...]) -> list[Operation]:
+    """Get the units directly nested in the regions of an operation."""
+    return [
+        nested_op for region in op.regions for block in region.blocks
+        for nested_op in block.ops if isinstance(nested_op, unit_types)
+    ]
+
+
+class ParallelVerifier:
+    """
+    Verify operations, with the operations of type `unit_types` directly
+    nested in them verified in parallel, using `num_workers` worker
+    processes (by default, the number of CPUs).
+    """
+
+    num_workers: int
+    unit_types: tuple[type[Operation], ...]
+
+    def __init__(self,
+                 num_workers: int | None = None,
+                 unit_types: tuple[type[Operation], ...] = (FuncOp, )):
+        if "fork" not in multiprocessing.get_all_start_methods():
+            num_workers = 1
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.unit_types = unit_types
+
+    def _get_failing_units(self, units: Sequence[Operation]) -> set[int]:
+        """Verify units in parallel, and get the indices of the failing ones."""
+        global _forked_units
+
+        num_chunks = min(len(units), self.num_workers * 4)
+        bounds = [len(units) * i // num_chunks for i in range(num_chunks + 1)]
+        _forked_units = units
+        executor = ProcessPoolExecutor(
+            self.num_workers, mp_context=multiprocessing.get_context("fork"))
+        try:
+            with executor:
+                results = executor.map(_get_failing_forked_units,
+                                       bounds[:-1], bounds[1:])
+                return {idx for failing in results for idx in failing}
+        finally:
+            _forked_units = ()
+
+    def verify(self, op: Operation) -> None:
+        """
+        Verify an operation, and raise the same exception as `op.verify()`
+        if it is invalid.
+        """
+        units = _collect_units(op, self.unit_types)
+        if self.num_workers <= 1 or len(units) <= 1:
+            op.verify()
+            return
+
+        failing = self._get_failing_units(units)
+
+        # Verify the remaining operations in the same order as `op.verify()`
+        op.verify(verify_nested_ops=False)
+        verified_ops = {
+            unit
+            for idx, unit in enumerate(units) if idx not in failing
+        }
+        for region in op.regions:
+            region.verify(verified_ops)
+
+
+def verify_parallel(op: Operation,
+                    num_workers: int | None = None,
+                    unit_types: tuple[type[Operation], ...] = (FuncOp, )
+                    ) -> None:
+    """
+    Verify an operation, and verify the operations of type `unit_types`
+    directly nested in it in parallel, using `num_workers` workers
+    (by default, the number of CPUs).
+    Raise the same exception as `op.verify()` if the operation is invalid.
+    """
+    ParallelVerifier(num_workers, unit_types).verify(op)
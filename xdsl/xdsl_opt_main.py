@@ -1,35 +1,44 @@
 import argparse
+import hashlib
+import mmap
 import sys
 import os
-from io import StringIO
+from importlib import import_module
+from io import BytesIO, StringIO
 
-from xdsl.ir import MLContext
-from xdsl.parser import XDSLParser, MLIRParser, ParseError
+from xdsl.ir import Dialect, MLContext, OpIndex
+from xdsl.parser import BaseParser, XDSLParser, MLIRParser, ParseError
 from xdsl.printer import Printer
-from xdsl.dialects.func import Func
-from xdsl.dialects.scf import Scf
-from xdsl.dialects.affine import Affine
-from xdsl.dialects.arith import Arith
 from xdsl.dialects.builtin import ModuleOp, Builtin
-from xdsl.dialects.cmath import CMath
-from xdsl.dialects.cf import Cf
-from xdsl.dialects.vector import Vector
-from xdsl.dialects.memref import MemRef
-from xdsl.dialects.llvm import LLVM
-from xdsl.dialects.irdl import IRDL
-from xdsl.dialects.mpi import MPI
-from xdsl.transforms.lower_mpi import lower_mpi
-from xdsl.dialects.gpu import GPU
-from xdsl.dialects.pdl import PDL
-
-from xdsl.dialects.experimental.stencil import Stencil
-
-from xdsl.transforms.experimental.ConvertStencilToLLMLIR import ConvertStencilToLLMLIR, ConvertStencilToGPU
-
-from xdsl.irdl_mlir_printer import IRDLPrinter
 from xdsl.utils.exceptions import DiagnosticException
+from xdsl.utils.lexer import Input
 
-from typing import IO, Dict, Callable, List, Sequence
+from typing import (IO, TYPE_CHECKING, Dict, Callable, List, Sequence,
+                    TextIO, cast)
+
+if TYPE_CHECKING:
+    from xdsl.module_cache import ModuleCache
+    from xdsl.verifier import ParallelVerifier
+
+
+def _dialect_loader(module_name: str,
+                    dialect_name: str) -> Callable[[], Dialect]:
+    """Get a function importing a dialect from its module."""
+
+    def load() -> Dialect:
+        return getattr(import_module(module_name), dialect_name)
+
+    return load
+
+
+def _pass_loader(module_name: str,
+                 pass_name: str) -> Callable[[MLContext, ModuleOp], None]:
+    """Get a pass that imports its implementation when it is first applied."""
+
+    def apply(ctx: MLContext, module: ModuleOp) -> None:
+        getattr(import_module(module_name), pass_name)(ctx, module)
+
+    return apply
 
 
 class xDSLOptMain:
@@ -57,15 +66,36 @@ class xDSLOptMain:
     stream.
     """
 
+    available_binary_targets: Dict[str, Callable[[ModuleOp, IO[bytes]], None]]
+    """
+    A mapping from target names to functions that serialize a ModuleOp into a
+    binary stream.
+    """
+
     pipeline: List[tuple[str, Callable[[ModuleOp], None]]]
     """ The pass-pipeline to be applied. """
 
+    cache: 'ModuleCache | None'
+    """The cache of modules set by `--cache-dir`, if any."""
+
+    cache_key_parts: List[str]
+    """
+    What the cached modules depend on, other than the passes applied to them.
+    """
+
+    parallel_verifier: 'ParallelVerifier | None'
+    """The verifier set by `--parallel-verify`, if any."""
+
     def __init__(self,
                  description: str = 'xDSL modular optimizer driver',
                  args: Sequence[str] | None = None):
         self.available_frontends = {}
         self.available_passes = {}
         self.available_targets = {}
+        self.available_binary_targets = {}
+        self.cache = None
+        self.cache_key_parts = []
+        self.parallel_verifier = None
 
         self.ctx = MLContext()
         self.register_all_dialects()
@@ -84,7 +114,11 @@ class xDSLOptMain:
         """
         Executes the different steps.
         """
-        if not self.args.parsing_diagnostics:
+        self.setup_cache()
+        num_cached_passes = None
+        if (cached := self.load_from_cache()) is not None:
+            module, num_cached_passes = cached
+        elif not self.args.parsing_diagnostics:
             module = self.parse_input()
         else:
             try:
@@ -94,10 +128,10 @@ class xDSLOptMain:
                 exit(0)
 
         if not self.args.verify_diagnostics:
-            self.apply_passes(module)
+            self.apply_passes(module, num_cached_passes)
         else:
             try:
-                self.apply_passes(module)
+                self.apply_passes(module, num_cached_passes)
             except DiagnosticException as e:
                 print(e)
                 exit(0)
@@ -117,6 +151,7 @@ class xDSLOptMain:
                                 help="path to input file")
 
         targets = [name for name in self.available_targets]
+        targets += [name for name in self.available_binary_targets]
         arg_parser.add_argument("-t",
                                 "--target",
                                 type=str,
@@ -139,6 +174,38 @@ class xDSLOptMain:
         arg_parser.add_argument("--disable-verify",
                                 default=False,
                                 action='store_true')
+        arg_parser.add_argument(
+            "--parallel-verify",
+            type=int,
+            nargs="?",
+            const=0,
+            default=None,
+            metavar="NUM_WORKERS",
+            help="Verify the functions of the module in parallel, using "
+            "NUM_WORKERS workers (by default, the number of CPUs)")
+        arg_parser.add_argument(
+            "--parallel-parse",
+            type=int,
+            nargs="?",
+            const=0,
+            default=None,
+            metavar="NUM_WORKERS",
+            help="Parse the top-level operations of the module in parallel, "
+            "using NUM_WORKERS workers (by default, the number of CPUs)")
+        arg_parser.add_argument(
+            "--cache-dir",
+            type=str,
+            required=False,
+            help="Cache the module after parsing and after each prefix of "
+            "the pass pipeline in this directory, and reuse them when the "
+            "same input file is processed again")
+        arg_parser.add_argument(
+            "--cache-size",
+            type=int,
+            default=256,
+            metavar="MIB",
+            help="Maximal size of the cache in MiB, the least recently used "
+            "modules are removed beyond it")
         arg_parser.add_argument("-o",
                                 "--output-file",
                                 type=str,
@@ -184,20 +251,25 @@ class xDSLOptMain:
         Add other/additional dialects by overloading this function.
         """
         self.ctx.register_dialect(Builtin)
-        self.ctx.register_dialect(Func)
-        self.ctx.register_dialect(Arith)
-        self.ctx.register_dialect(MemRef)
-        self.ctx.register_dialect(Affine)
-        self.ctx.register_dialect(Scf)
-        self.ctx.register_dialect(Cf)
-        self.ctx.register_dialect(CMath)
-        self.ctx.register_dialect(IRDL)
-        self.ctx.register_dialect(LLVM)
-        self.ctx.register_dialect(Vector)
-        self.ctx.register_dialect(MPI)
-        self.ctx.register_dialect(GPU)
-        self.ctx.register_dialect(Stencil)
-        self.ctx.register_dialect(PDL)
+        dialects = {
+            "func": ("xdsl.dialects.func", "Func"),
+            "arith": ("xdsl.dialects.arith", "Arith"),
+            "memref": ("xdsl.dialects.memref", "MemRef"),
+            "affine": ("xdsl.dialects.affine", "Affine"),
+            "scf": ("xdsl.dialects.scf", "Scf"),
+            "cf": ("xdsl.dialects.cf", "Cf"),
+            "cmath": ("xdsl.dialects.cmath", "CMath"),
+            "irdl": ("xdsl.dialects.irdl", "IRDL"),
+            "llvm": ("xdsl.dialects.llvm", "LLVM"),
+            "vector": ("xdsl.dialects.vector", "Vector"),
+            "mpi": ("xdsl.dialects.mpi", "MPI"),
+            "gpu": ("xdsl.dialects.gpu", "GPU"),
+            "stencil": ("xdsl.dialects.experimental.stencil", "Stencil"),
+            "pdl": ("xdsl.dialects.pdl", "PDL"),
+        }
+        for name, (module_name, dialect_name) in dialects.items():
+            self.ctx.register_lazy_dialect(
+                name, _dialect_loader(module_name, dialect_name))
 
     def register_all_frontends(self):
         """
@@ -207,15 +279,32 @@ class xDSLOptMain:
         """
 
         def parse_xdsl(io: IO[str]):
-            return XDSLParser(self.ctx, io.read(), self.get_input_name(),
+            input = Input.from_file(io, self.get_input_name())
+            if self.args.parallel_parse is not None:
+                return self.parse_parallel(input, XDSLParser)
+            return XDSLParser(self.ctx, input, self.get_input_name(),
                               self.args.allow_unregistered_ops).parse_module()
 
         def parse_mlir(io: IO[str]):
-            return MLIRParser(self.ctx, io.read(), self.get_input_name(),
+            input = Input.from_file(io, self.get_input_name())
+            if self.args.parallel_parse is not None:
+                return self.parse_parallel(input, MLIRParser)
+            return MLIRParser(self.ctx, input, self.get_input_name(),
                               self.args.allow_unregistered_ops).parse_module()
 
+        def parse_bytecode(io: IO[str]):
+            from xdsl.bytecode import read_bytecode
+            try:
+                # Function bodies are read from the mapped file when loaded
+                data = mmap.mmap(io.fileno(), 0, access=mmap.ACCESS_READ)
+            except (OSError, ValueError):
+                data = cast(TextIO, io).buffer.read()
+            return read_bytecode(self.ctx, data,
+                                 self.args.allow_unregistered_ops)
+
         self.available_frontends['xdsl'] = parse_xdsl
         self.available_frontends['mlir'] = parse_mlir
+        self.available_frontends['xdslbc'] = parse_bytecode
 
     def register_all_passes(self):
         """
@@ -223,10 +312,13 @@ class xDSLOptMain:
 
         Add other/additional passes by overloading this function.
         """
-        self.available_passes['lower-mpi'] = lower_mpi
-        self.available_passes[
-            'convert-stencil-to-ll-mlir'] = ConvertStencilToLLMLIR
-        self.available_passes['convert-stencil-to-gpu'] = ConvertStencilToGPU
+        stencil_module = "xdsl.transforms.experimental.ConvertStencilToLLMLIR"
+        self.available_passes['lower-mpi'] = _pass_loader(
+            "xdsl.transforms.lower_mpi", "lower_mpi")
+        self.available_passes['convert-stencil-to-ll-mlir'] = _pass_loader(
+            stencil_module, "ConvertStencilToLLMLIR")
+        self.available_passes['convert-stencil-to-gpu'] = _pass_loader(
+            stencil_module, "ConvertStencilToGPU")
 
     def register_all_targets(self):
         """
@@ -246,12 +338,18 @@ class xDSLOptMain:
             print("\n", file=output)
 
         def _output_irdl(prog: ModuleOp, output: IO[str]):
+            from xdsl.irdl_mlir_printer import IRDLPrinter
             irdl_to_mlir = IRDLPrinter(stream=output)
             irdl_to_mlir.print_module(prog)
 
+        def _output_bytecode(prog: ModuleOp, output: IO[bytes]):
+            from xdsl.bytecode import write_bytecode
+            write_bytecode(prog, output)
+
         self.available_targets['xdsl'] = _output_xdsl
         self.available_targets['irdl'] = _output_irdl
         self.available_targets['mlir'] = _output_mlir
+        self.available_binary_targets['bytecode'] = _output_bytecode
 
     def setup_pipeline(self):
         """
@@ -304,24 +402,128 @@ class xDSLOptMain:
 
         return module
 
-    def apply_passes(self, prog: ModuleOp):
-        """Apply passes in order."""
+    def setup_cache(self):
+        """
+        Open the cache set by `--cache-dir`, and get what the cached modules
+        depend on. The standard input is never cached.
+        """
+        if self.args.cache_dir is None or self.args.input_file is None:
+            return
+        from xdsl._version import get_versions
+        from xdsl.module_cache import ModuleCache
+
+        digest = hashlib.sha256()
+        with open(self.args.input_file, 'rb') as f:
+            while chunk := f.read(1 << 20):
+                digest.update(chunk)
+        _, file_extension = os.path.splitext(self.args.input_file)
+        version = cast(str, get_versions()["version"])
+        self.cache = ModuleCache(self.args.cache_dir,
+                                 self.args.cache_size << 20)
+        self.cache_key_parts = [
+            digest.hexdigest(),
+            str(self.args.frontend or file_extension),
+            version,
+            str(self.args.allow_unregistered_ops),
+            str(self.args.disable_verify),
+            *self.ctx.get_registered_names(),
+        ]
+
+    def get_cache_key(self, num_passes: int) -> str:
+        """Get the key of the module after the first passes."""
+        assert self.cache is not None
+        passes = [name for name, _ in self.pipeline[:num_passes]]
+        return self.cache.get_key(*self.cache_key_parts, "passes", *passes)
+
+    def load_from_cache(self) -> tuple[ModuleOp, int] | None:
+        """
+        Get the module cached after the longest prefix of the pipeline, and
+        the number of passes in this prefix, if any.
+        """
+        # Passes restored from the cache would not be printed
+        if self.cache is None or self.args.print_between_passes:
+            return None
+        for num_passes in range(len(self.pipeline), -1, -1):
+            module = self.cache.load(self.ctx, self.get_cache_key(num_passes),
+                                     self.args.allow_unregistered_ops)
+            if module is not None:
+                return module, num_passes
+        return None
+
+    def parse_parallel(self, input: Input,
+                       parser_type: type[BaseParser]) -> ModuleOp:
+        """
+        Parse the input with its top-level operations parsed in parallel, as
+        set by `--parallel-parse`.
+        """
+        from xdsl.parallel_parser import parse_module_parallel
+        return parse_module_parallel(self.ctx, input, parser_type,
+                                     self.args.parallel_parse or None,
+                                     self.args.allow_unregistered_ops)
+
+    def apply_passes(self,
+                     prog: ModuleOp,
+                     num_cached_passes: int | None = None):
+        """
+        Apply passes in order. If the program was restored from the cache
+        after its first `num_cached_passes` passes, these passes and its
+        verification are skipped. The program is stored in the cache after
+        being verified and after each pass.
+        When several passes are applied, an operation index is kept on the
+        program between them, so that the passes looking up operations by
+        type with `OpIndex.scoped` share it instead of walking the program.
+        """
         assert isinstance(prog, ModuleOp)
-        if not self.args.disable_verify:
-            prog.verify()
-        for pass_name, p in self.pipeline:
+        if num_cached_passes is None:
+            if not self.args.disable_verify:
+                self.verify(prog)
+            if self.cache is not None:
+                self.cache.store(self.get_cache_key(0), prog)
+        num_passes = num_cached_passes or 0
+        if len(self.pipeline) - num_passes < 2:
+            self._apply_pipeline(prog, num_passes)
+            return
+        with OpIndex.scoped(prog):
+            self._apply_pipeline(prog, num_passes)
+
+    def _apply_pipeline(self, prog: ModuleOp, num_passes: int):
+        """Apply the passes of the pipeline following the first `num_passes`."""
+        for pass_name, p in self.pipeline[num_passes:]:
             p(prog)
+            num_passes += 1
             assert isinstance(prog, ModuleOp)
             if not self.args.disable_verify:
-                prog.verify()
+                self.verify(prog)
+            if self.cache is not None:
+                self.cache.store(self.get_cache_key(num_passes), prog)
             if self.args.print_between_passes:
                 print(f"IR after {pass_name}:")
                 printer = Printer(stream=sys.stdout)
                 printer.print_op(prog)
                 print("\n\n\n")
 
-    def output_resulting_program(self, prog: ModuleOp) -> str:
+    def verify(self, prog: ModuleOp):
+        """
+        Verify the program, with its functions verified in parallel if
+        `--parallel-verify` is set.
+        """
+        if self.args.parallel_verify is None:
+            prog.verify()
+            return
+        if self.parallel_verifier is None:
+            from xdsl.verifier import ParallelVerifier
+            self.parallel_verifier = ParallelVerifier(
+                self.args.parallel_verify or None)
+        self.parallel_verifier.verify(prog)
+
+    def output_resulting_program(self, prog: ModuleOp) -> str | bytes:
         """Get the resulting program."""
+        if self.args.target in self.available_binary_targets:
+            binary_output = BytesIO()
+            self.available_binary_targets[self.args.target](prog,
+                                                            binary_output)
+            return binary_output.getvalue()
+
         output = StringIO()
         if self.args.target not in self.available_targets:
             raise Exception(f"Unknown target {self.args.target}")
@@ -329,9 +531,17 @@ class xDSLOptMain:
         self.available_targets[self.args.target](prog, output)
         return output.getvalue()
 
-    def print_to_output_stream(self, contents: str):
+    def print_to_output_stream(self, contents: str | bytes):
         """Print the contents in the expected stream."""
-        if self.args.output_file is None:
+        if isinstance(contents, bytes):
+            if self.args.output_file is None:
+                sys.stdout.flush()
+                sys.stdout.buffer.write(contents)
+                sys.stdout.buffer.flush()
+            else:
+                with open(self.args.output_file, 'wb') as output_stream:
+                    output_stream.write(contents)
+        elif self.args.output_file is None:
             print(contents)
         else:
             with open(self.args.output_file, 'w') as output_stream: